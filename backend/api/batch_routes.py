@@ -0,0 +1,19 @@
+from flask import Blueprint, request
+from backend.controllers.batch_controller import BatchController
+from backend.utils.idempotency import idempotent
+
+batch_bp = Blueprint('batches', __name__)
+
+@batch_bp.route('', methods=['POST'])
+@idempotent
+def create_batch():
+    return BatchController.create_batch(request)
+
+@batch_bp.route('/<batch_id>', methods=['GET'])
+def get_batch(batch_id):
+    return BatchController.get_batch(batch_id)
+
+@batch_bp.route('/<batch_id>/items', methods=['POST'])
+@idempotent
+def add_items(batch_id):
+    return BatchController.add_items(batch_id, request)
@@ -1,9 +1,11 @@
 from flask import Blueprint, request
 from backend.controllers.export_controller import ExportController
+from backend.utils.idempotency import idempotent
 
 export_bp = Blueprint('exports', __name__)
 
 @export_bp.route('/<project_id>/generate', methods=['POST'])
+@idempotent
 def generate_model(project_id):
     return ExportController.generate_model(project_id, request)
 
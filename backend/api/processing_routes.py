@@ -1,16 +1,18 @@
 from flask import Blueprint, request
 from backend.services.processing_service import ProcessingService
-from backend.utils.response import success_response, error_response
+from backend.utils.response import job_accepted_response, error_response
+from backend.utils.idempotency import idempotent
 
 processing_bp = Blueprint('processing', __name__)
 
 @processing_bp.route('/<project_id>/process', methods=['POST'])
+@idempotent
 def process_project(project_id):
     config = request.get_json() or {}
     
     try:
-        result = ProcessingService.start_processing(project_id, config)
-        return success_response(data=result)
+        job = ProcessingService.submit_processing(project_id, config)
+        return job_accepted_response(project_id, job)
     except ValueError as e:
         if "not found" in str(e).lower():
             return error_response("NOT_FOUND", str(e), status_code=404)
@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
 from backend.controllers.project_controller import ProjectController
+from backend.utils.idempotency import idempotent
 
 project_bp = Blueprint('projects', __name__)
 
 @project_bp.route('', methods=['POST'])
+@idempotent
 def create_project():
     return ProjectController.create_project(request)
 
@@ -20,6 +22,7 @@ def delete_project(project_id):
     return ProjectController.delete_project(project_id)
 
 @project_bp.route('/<project_id>/blueprint', methods=['POST'])
+@idempotent
 def upload_blueprint(project_id):
     return ProjectController.upload_blueprint(project_id, request)
 
@@ -35,6 +38,14 @@ def get_rooms(project_id):
 def get_jobs(project_id):
     return ProjectController.get_jobs(project_id)
 
+@project_bp.route('/<project_id>/jobs/<int:job_id>', methods=['GET'])
+def get_job(project_id, job_id):
+    return ProjectController.get_job(project_id, job_id)
+
+@project_bp.route('/<project_id>/jobs/<int:job_id>/events', methods=['GET'])
+def get_job_events(project_id, job_id):
+    return ProjectController.get_job_events(project_id, job_id)
+
 @project_bp.route('/<project_id>/ocr', methods=['GET'])
 def get_ocr(project_id):
-    return ProjectController.get_ocr(project_id)
+    return ProjectController.get_ocr(project_id, request)
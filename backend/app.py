@@ -1,7 +1,7 @@
 import os
 from flask import Flask, jsonify
 from backend.config import config_by_name
-from backend.extensions import db, migrate
+from backend.extensions import db, migrate, image_cache, preprocess_cache, ocr_pool, room_vocabulary, stage_executor, job_runner
 
 def create_app(config_name="development"):
     app = Flask(__name__)
@@ -14,17 +14,25 @@ def create_app(config_name="development"):
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
+    image_cache.init_app(app)
+    preprocess_cache.init_app(app)
+    ocr_pool.init_app(app)
+    room_vocabulary.init_app(app)
+    stage_executor.init_app(app)
+    job_runner.init_app(app)
 
     # Register blueprints (to be done soon)
     from backend.api.health_routes import health_bp
     from backend.api.project_routes import project_bp
     from backend.api.processing_routes import processing_bp
     from backend.api.export_routes import export_bp
+    from backend.api.batch_routes import batch_bp
     
     app.register_blueprint(health_bp, url_prefix='/api/v1')
     app.register_blueprint(project_bp, url_prefix='/api/v1/projects')
     app.register_blueprint(processing_bp, url_prefix='/api/v1/projects')
     app.register_blueprint(export_bp, url_prefix='/api/v1/projects')
+    app.register_blueprint(batch_bp, url_prefix='/api/v1/batches')
 
     # Register global error handlers
     @app.errorhandler(404)
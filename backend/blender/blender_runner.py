@@ -2,6 +2,7 @@ import os
 import json
 import subprocess
 from flask import current_app
+from backend.utils.stage_metrics import stage
 
 class BlenderRunner:
     @staticmethod
@@ -23,8 +24,10 @@ class BlenderRunner:
             "rooms": []
         }
         
-        with open(temp_input, 'w') as f:
-            json.dump(data, f)
+        with stage("blender_input") as counts:
+            with open(temp_input, 'w') as f:
+                json.dump(data, f)
+            counts["bytes"] = os.path.getsize(temp_input)
             
         script_path = os.path.join(os.path.dirname(__file__), 'scripts', 'generate_scene.py')
         blender_executable = current_app.config.get('BLENDER_EXECUTABLE', 'blender')
@@ -41,7 +44,8 @@ class BlenderRunner:
         ]
         
         try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            with stage("blender_run"):
+                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
             # Log output if needed: current_app.logger.info(result.stdout)
         except subprocess.CalledProcessError as e:
             # We must handle the error properly, but for now we raise it
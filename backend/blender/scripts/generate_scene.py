@@ -27,7 +27,7 @@ def build_wall(wall, config):
     obj.scale = (length / 2, config['wall_thickness'] / 2, config['wall_height'] / 2)
     obj.rotation_euler[2] = angle
     
-def build_door(door, config):
+def build_door(door, config, walls_by_id):
     cx = door['center_x'] * config['scale_factor']
     cy = -door['center_y'] * config['scale_factor']
     cz = config['door_height'] / 2
@@ -39,7 +39,13 @@ def build_door(door, config):
     obj.name = f"Door_{door.get('id', 'unknown')}"
     # Make door blocks slightly thinner than walls for visibility
     obj.scale = (width / 2, config['wall_thickness'] / 4, config['door_height'] / 2)
-    # If orientation is known, rotate. For now, simple box.
+
+    # Doors run along their host wall
+    wall = walls_by_id.get(door.get('parent_wall_id'))
+    if wall:
+        obj.rotation_euler[2] = math.atan2(-(wall['end_y'] - wall['start_y']), wall['end_x'] - wall['start_x'])
+    elif door.get('orientation') == 'VERTICAL':
+        obj.rotation_euler[2] = math.pi / 2
 
 def export_scene(output_path, format="glb"):
     if format.lower() == "glb":
@@ -79,8 +85,9 @@ def main():
     for wall in data.get('walls', []):
         build_wall(wall, config)
         
+    walls_by_id = {wall.get('id'): wall for wall in data.get('walls', [])}
     for door in data.get('doors', []):
-        build_door(door, config)
+        build_door(door, config, walls_by_id)
         
     # We could add floor builder from rooms here
     
@@ -12,6 +12,22 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_UPLOAD_MB", 20)) * 1024 * 1024
     
     TESSERACT_CMD = os.getenv("TESSERACT_CMD", "")
+    # Long-lived OCR engines per server process (each gunicorn worker has
+    # its own pool); libtesseract is found automatically unless set
+    OCR_POOL_SIZE = int(os.getenv("OCR_POOL_SIZE", 2))
+    OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "eng")
+    OCR_TESSDATA_PATH = os.getenv("OCR_TESSDATA_PATH", "")
+    TESSERACT_LIBRARY = os.getenv("TESSERACT_LIBRARY", "")
+    # OCR only text-like regions, rescaled to OCR_TEXT_HEIGHT pixels, in
+    # sparse text mode instead of reading the whole page
+    OCR_REGION_PROPOSALS = os.getenv("OCR_REGION_PROPOSALS", "true").lower() == "true"
+    OCR_TEXT_HEIGHT = int(os.getenv("OCR_TEXT_HEIGHT", 32))
+    OCR_REGION_PSM = int(os.getenv("OCR_REGION_PSM", 11))
+    # Extra room names on top of the built-in ones: a comma-separated list
+    # and/or a file with one name (or `alias = canonical`) per line
+    ROOM_NAMES = os.getenv("ROOM_NAMES", "")
+    ROOM_NAMES_FILE = os.getenv("ROOM_NAMES_FILE", "")
+    ROOM_NAME_MAX_EDITS = int(os.getenv("ROOM_NAME_MAX_EDITS", 2))
     BLENDER_EXECUTABLE = os.getenv("BLENDER_EXECUTABLE", "blender")
     UNITY_EXECUTABLE = os.getenv("UNITY_EXECUTABLE", "unity")
     
@@ -19,12 +35,107 @@ class Config:
     DEFAULT_WALL_HEIGHT = float(os.getenv("DEFAULT_WALL_HEIGHT", 3.0))
     DEFAULT_WALL_THICKNESS = float(os.getenv("DEFAULT_WALL_THICKNESS", 0.15))
 
+    # Scans at or above this many pixels are detected in parallel tiles (0 disables)
+    TILED_DETECTION_MIN_PIXELS = int(os.getenv("TILED_DETECTION_MIN_PIXELS", 25_000_000))
+    DETECTION_TILE_SIZE = int(os.getenv("DETECTION_TILE_SIZE", 2048))
+    # Raised to the preprocessing reach (PREPROCESS_*) plus the seam margin
+    # when smaller, so tiled and single-pass masks stay identical
+    DETECTION_TILE_OVERLAP = int(os.getenv("DETECTION_TILE_OVERLAP", 64))
+    DETECTION_WORKERS = int(os.getenv("DETECTION_WORKERS", 0)) # 0 = one per CPU core
+
+    # Scans at or above this many pixels are detected coarse-to-fine (0 disables)
+    PYRAMID_DETECTION_MIN_PIXELS = int(os.getenv("PYRAMID_DETECTION_MIN_PIXELS", 0))
+    PYRAMID_FACTOR = int(os.getenv("PYRAMID_FACTOR", 4))
+
+    # Join collinear Hough fragments into one wall per physical wall (line mode)
+    MERGE_COLLINEAR_SEGMENTS = os.getenv("MERGE_COLLINEAR_SEGMENTS", "true").lower() == "true"
+    MERGE_ANGLE_TOLERANCE_DEG = float(os.getenv("MERGE_ANGLE_TOLERANCE_DEG", 2.0))
+    MERGE_OFFSET_TOLERANCE = float(os.getenv("MERGE_OFFSET_TOLERANCE", 6.0))
+    MERGE_GAP_TOLERANCE = float(os.getenv("MERGE_GAP_TOLERANCE", 12.0))
+
+    # Revised blueprints are re-detected only where they differ from the
+    # previous revision, unless too much of the sheet changed
+    INCREMENTAL_DETECTION = os.getenv("INCREMENTAL_DETECTION", "true").lower() == "true"
+    INCREMENTAL_DIFF_THRESHOLD = int(os.getenv("INCREMENTAL_DIFF_THRESHOLD", 32))
+    INCREMENTAL_BLOCK_SIZE = int(os.getenv("INCREMENTAL_BLOCK_SIZE", 64))
+    INCREMENTAL_MAX_CHANGED_FRACTION = float(os.getenv("INCREMENTAL_MAX_CHANGED_FRACTION", 0.3))
+
+    # Rooms are the enclosed free space of the wall mask; openings up to
+    # ROOM_GAP_CLOSE pixels wide (doorways) are sealed first
+    ROOM_GAP_CLOSE = int(os.getenv("ROOM_GAP_CLOSE", 15))
+    ROOM_MIN_AREA_FRACTION = float(os.getenv("ROOM_MIN_AREA_FRACTION", 0.0005))
+
+    # OCR runs in a background thread while CV detection runs on the request
+    # thread; at most this many background stages per server process (0 runs
+    # them one after the other)
+    PROCESSING_CONCURRENCY = int(os.getenv("PROCESSING_CONCURRENCY", 2))
+
+    # /process and /generate queue a ProcessingJob and return 202; each server
+    # process runs queued jobs on this many background threads (0 leaves
+    # them to `python -m backend.worker`), polling every JOB_POLL_INTERVAL s
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 1))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1.0))
+    # A running job's worker renews its lease every JOB_LEASE_SECONDS / 3;
+    # a job whose lease ran out (its worker was killed) is run again, up to
+    # JOB_MAX_ATTEMPTS claims in all, and then marked FAILED
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 2))
+
+    # GET /jobs/<id>/events re-reads the job this often and closes the stream
+    # after JOB_EVENTS_TIMEOUT s (clients reconnect). Each open stream holds
+    # a server worker; run gunicorn with -k gthread to serve many
+    JOB_EVENTS_POLL_INTERVAL = float(os.getenv("JOB_EVENTS_POLL_INTERVAL", 0.5))
+    JOB_EVENTS_TIMEOUT = float(os.getenv("JOB_EVENTS_TIMEOUT", 300))
+
+    # POST /batches: items per batch and uncompressed size of one .zip; each
+    # request is still capped by MAX_UPLOAD_MB (add more with /items)
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 1000))
+    BATCH_MAX_ARCHIVE_MB = int(os.getenv("BATCH_MAX_ARCHIVE_MB", 2048))
+
+    # POST requests with an Idempotency-Key header replay the stored response
+    # of the first request with that key for this many hours
+    IDEMPOTENCY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_TTL_HOURS", 24))
+    # A key still in progress after this many seconds belongs to a request
+    # that died; a retry with the same payload runs in its place
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", 120))
+
+    # Jobs record wall/CPU time and memory per stage in ProcessingJob.metrics;
+    # memory is "rss" (sampled peak RSS), "tracemalloc" (exact Python/NumPy
+    # allocation, noticeably slower) or "off"
+    STAGE_METRICS_MEMORY = os.getenv("STAGE_METRICS_MEMORY", "rss")
+
+    # "rows" stores every detection as a row; "blob" stores a run as one
+    # packed float32 array per project, read directly by /detections and exports
+    GEOMETRY_STORAGE = os.getenv("GEOMETRY_STORAGE", "rows")
+
+    # /detections and /ocr return keyset pages of this many items (?limit=
+    # up to API_MAX_PAGE_SIZE); ?format=ndjson streams everything instead
+    API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 1000))
+    API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 10000))
+
+    # Doors and windows are attached to the nearest wall within this distance
+    OPENING_MAX_WALL_DISTANCE = float(os.getenv("OPENING_MAX_WALL_DISTANCE", 64))
+    SPATIAL_INDEX_CELL_SIZE = float(os.getenv("SPATIAL_INDEX_CELL_SIZE", 64))
+
+    # Decoded blueprints shared between upload validation, CV and OCR
+    DECODED_IMAGE_CACHE_MB = int(os.getenv("DECODED_IMAGE_CACHE_MB", 512))
+
+    # Blurred/morphed arrays reused across /process calls (0 disables)
+    PREPROCESS_CACHE_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), os.getenv("PREPROCESS_CACHE_FOLDER", "cache/preprocess"))
+    PREPROCESS_CACHE_MB = int(os.getenv("PREPROCESS_CACHE_MB", 2048))
+    PREPROCESS_BLUR_KERNEL = int(os.getenv("PREPROCESS_BLUR_KERNEL", 5))
+    PREPROCESS_BLOCK_SIZE = int(os.getenv("PREPROCESS_BLOCK_SIZE", 11))
+    PREPROCESS_KERNEL_SIZE = int(os.getenv("PREPROCESS_KERNEL_SIZE", 5))
+
 class DevelopmentConfig(Config):
     DEBUG = True
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    PREPROCESS_CACHE_MB = 0
+    # Tests run queued jobs explicitly with job_runner.run_pending()
+    JOB_WORKERS = 0
 
 class ProductionConfig(Config):
     DEBUG = False
@@ -0,0 +1,57 @@
+import json
+from backend.services.batch_service import BatchService
+from backend.utils.response import success_response, error_response
+
+class BatchController:
+    @staticmethod
+    def _uploads(request):
+        # Any file field; .zip files are expanded into their images
+        return [f for name in request.files for f in request.files.getlist(name)]
+
+    @staticmethod
+    def _json_field(request, name):
+        value = request.form.get(name)
+        if not value:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise ValueError(f"Field '{name}' must be JSON")
+
+    @staticmethod
+    def create_batch(request):
+        try:
+            result = BatchService.create_batch(
+                BatchController._uploads(request),
+                BatchController._json_field(request, 'config'),
+                BatchController._json_field(request, 'generate')
+            )
+            response, status_code = success_response(data=result, status_code=202)
+            response.headers["Location"] = f"/api/v1/batches/{result['batch_id']}"
+            return response, status_code
+        except ValueError as e:
+            return error_response("VALIDATION_ERROR", str(e))
+        except Exception as e:
+            return error_response("INTERNAL_ERROR", "Failed to create batch", details={"error": str(e)}, status_code=500)
+
+    @staticmethod
+    def add_items(batch_id, request):
+        try:
+            result = BatchService.add_items(batch_id, BatchController._uploads(request))
+            return success_response(data=result, status_code=202)
+        except ValueError as e:
+            if "not found" in str(e).lower():
+                return error_response("NOT_FOUND", str(e), status_code=404)
+            return error_response("VALIDATION_ERROR", str(e))
+        except Exception as e:
+            return error_response("INTERNAL_ERROR", "Failed to add batch items", details={"error": str(e)}, status_code=500)
+
+    @staticmethod
+    def get_batch(batch_id):
+        try:
+            batch = BatchService.get_batch(batch_id)
+            if batch is None:
+                return error_response("NOT_FOUND", "Batch not found", status_code=404)
+            return success_response(data=batch)
+        except Exception as e:
+            return error_response("INTERNAL_ERROR", "Failed to get batch", details={"error": str(e)}, status_code=500)
@@ -1,5 +1,5 @@
 from backend.services.export_service import ExportService
-from backend.utils.response import success_response, error_response
+from backend.utils.response import job_accepted_response, error_response
 from flask import send_file
 import os
 
@@ -8,9 +8,11 @@ class ExportController:
     def generate_model(project_id, request):
         config = request.get_json() or {}
         try:
-            result = ExportService.generate_model(project_id, config)
-            return success_response(data=result, status_code=201)
+            job = ExportService.submit_generation(project_id, config)
+            return job_accepted_response(project_id, job)
         except ValueError as e:
+            if "not found" in str(e).lower():
+                return error_response("NOT_FOUND", str(e), status_code=404)
             return error_response("VALIDATION_ERROR", str(e))
         except Exception as e:
             return error_response("INTERNAL_ERROR", "Failed to generate 3D model", details={"error": str(e)}, status_code=500)
@@ -1,5 +1,6 @@
 from backend.services.project_service import ProjectService
-from backend.utils.response import success_response, error_response
+from flask import current_app
+from backend.utils.response import success_response, error_response, ndjson_response, event_stream_response
 
 class ProjectController:
     @staticmethod
@@ -73,61 +74,85 @@ class ProjectController:
             return error_response("INTERNAL_ERROR", "Failed to upload blueprint", details={"error": str(e)}, status_code=500)
 
     @staticmethod
-    def get_detections(project_id, request):
+    def _list_items(list_items, project_id, request, what):
+        """
+        Shared handler for the per-item endpoints: ?fields=a,b selects keys,
+        ?cursor= and ?limit= page through the items and ?format=ndjson
+        streams all of them (after ?cursor=) as newline-delimited JSON.
+        """
         try:
-            from backend.models.detected_object import DetectedObject
-            from backend.extensions import db
-            # In a real app, this should be in a service layer
-            detections = DetectedObject.query.filter_by(project_id=project_id).all()
-            
-            data = []
-            for d in detections:
-                data.append({
-                    "id": d.id,
-                    "object_type": d.object_type,
-                    "x": d.x, "y": d.y, "width": d.width, "height": d.height,
-                    "x1": d.x1, "y1": d.y1, "x2": d.x2, "y2": d.y2,
-                    "confidence": d.confidence
-                })
-            return success_response(data=data)
+            fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()] or None
+            cursor = request.args.get('cursor') or None
+            stream = request.args.get('format') == 'ndjson'
+            try:
+                limit = int(request.args.get('limit', current_app.config['API_PAGE_SIZE']))
+            except ValueError:
+                return error_response("VALIDATION_ERROR", "Invalid limit")
+            if not 1 <= limit <= current_app.config['API_MAX_PAGE_SIZE']:
+                return error_response("VALIDATION_ERROR", f"limit must be between 1 and {current_app.config['API_MAX_PAGE_SIZE']}")
+
+            result = list_items(project_id, fields=fields, cursor=cursor, limit=limit, stream=stream)
+            if result is None:
+                return error_response("NOT_FOUND", "Project not found", status_code=404)
+            items, next_cursor = result
+            if stream:
+                return ndjson_response(items)
+            return success_response(data=items, meta={"next_cursor": next_cursor, "limit": limit})
+        except ValueError as e:
+            return error_response("VALIDATION_ERROR", str(e))
         except Exception as e:
-            return error_response("INTERNAL_ERROR", "Failed to get detections", details={"error": str(e)}, status_code=500)
+            return error_response("INTERNAL_ERROR", f"Failed to get {what}", details={"error": str(e)}, status_code=500)
+
+    @staticmethod
+    def get_detections(project_id, request):
+        return ProjectController._list_items(ProjectService.list_detections, project_id, request, "detections")
 
     @staticmethod
     def get_rooms(project_id):
         try:
-            from backend.models.room import Room
-            rooms = Room.query.filter_by(project_id=project_id).all()
-            # Serialize logic here
-            return success_response(data=[])
+            rooms = ProjectService.get_rooms(project_id)
+            if rooms is None:
+                return error_response("NOT_FOUND", "Project not found", status_code=404)
+            return success_response(data=rooms)
         except Exception as e:
             return error_response("INTERNAL_ERROR", "Failed to get rooms", details={"error": str(e)}, status_code=500)
 
     @staticmethod
     def get_jobs(project_id):
         try:
-            from backend.models.processing_job import ProcessingJob
-            jobs = ProcessingJob.query.filter_by(project_id=project_id).all()
-            return success_response(data=[])
+            jobs = ProjectService.get_jobs(project_id)
+            if jobs is None:
+                return error_response("NOT_FOUND", "Project not found", status_code=404)
+            return success_response(data=jobs)
         except Exception as e:
             return error_response("INTERNAL_ERROR", "Failed to get jobs", details={"error": str(e)}, status_code=500)
 
     @staticmethod
-    def get_ocr(project_id):
+    def get_job(project_id, job_id):
+        try:
+            from backend.services.job_service import JobService
+            job = JobService.get_job(project_id, job_id)
+            if job is None:
+                return error_response("NOT_FOUND", "Job not found", status_code=404)
+            return success_response(data=job)
+        except Exception as e:
+            return error_response("INTERNAL_ERROR", "Failed to get job", details={"error": str(e)}, status_code=500)
+
+    @staticmethod
+    def get_job_events(project_id, job_id):
         try:
-            from backend.models.ocr_text import OCRText
-            ocr_records = OCRText.query.filter_by(project_id=project_id).all()
-            data = []
-            for r in ocr_records:
-                data.append({
-                    "id": r.id,
-                    "text": r.text,
-                    "normalized_text": r.normalized_text,
-                    "text_type": r.text_type,
-                    "x": r.x, "y": r.y, "width": r.width, "height": r.height,
-                    "confidence": r.confidence,
-                    "parsed_value": r.parsed_value
-                })
-            return success_response(data=data)
+            from backend.services.job_service import JobService
+            events = JobService.job_events(
+                project_id, job_id,
+                poll_interval=current_app.config['JOB_EVENTS_POLL_INTERVAL'],
+                timeout=current_app.config['JOB_EVENTS_TIMEOUT']
+            )
+            if events is None:
+                return error_response("NOT_FOUND", "Job not found", status_code=404)
+            return event_stream_response(events)
         except Exception as e:
-            return error_response("INTERNAL_ERROR", "Failed to get OCR records", details={"error": str(e)}, status_code=500)
+            return error_response("INTERNAL_ERROR", "Failed to stream job events", details={"error": str(e)}, status_code=500)
+
+    @staticmethod
+    def get_ocr(project_id, request):
+        return ProjectController._list_items(ProjectService.list_ocr, project_id, request, "OCR records")
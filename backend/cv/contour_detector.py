@@ -1,31 +1,81 @@
 import cv2
+import numpy as np
 
-def detect_contours(morphed_image):
-    contours, _ = cv2.findContours(morphed_image, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+def contour_boxes(contours):
+    """
+    Bounding boxes of all contours as an (N, 4) array of x, y, w, h,
+    computed in one pass over the concatenated points instead of one
+    cv2.boundingRect call per contour.
+    """
+    if not contours:
+        return np.empty((0, 4), dtype=np.int64)
+    lengths = np.fromiter((len(c) for c in contours), dtype=np.int64, count=len(contours))
+    points = np.concatenate(contours).reshape(-1, 2)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    low = np.minimum.reduceat(points, starts, axis=0).astype(np.int64)
+    high = np.maximum.reduceat(points, starts, axis=0).astype(np.int64)
+    return np.hstack([low, high - low + 1])
+
+def inner_duplicates(boxes, hierarchy, inset):
+    """
+    Flags hole contours that only trace the inside of their parent's
+    stroke: every side of the hole's box lies within `inset` pixels of the
+    parent's box. These describe the same object as the parent.
+    """
+    duplicate = np.zeros(len(boxes), dtype=bool)
+    if hierarchy is None or not len(boxes):
+        return duplicate
+    parent = hierarchy.reshape(-1, 4)[:, 3]
+    holes = np.flatnonzero(parent >= 0)
+    if not len(holes):
+        return duplicate
+
+    inner, outer = boxes[holes], boxes[parent[holes]]
+    near = (
+        (inner[:, 0] - outer[:, 0] <= inset) &
+        (inner[:, 1] - outer[:, 1] <= inset) &
+        ((outer[:, 0] + outer[:, 2]) - (inner[:, 0] + inner[:, 2]) <= inset) &
+        ((outer[:, 1] + outer[:, 3]) - (inner[:, 1] + inner[:, 3]) <= inset)
+    )
+    duplicate[holes[near]] = True
+    return duplicate
+
+def detect_contours(morphed_image, min_size=10, min_door_size=20, duplicate_inset=12):
+    # Only outer boundaries and their holes are needed, not the full tree
+    contours, hierarchy = cv2.findContours(morphed_image, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
     detected_objects = []
 
-    for contour in contours:
+    # The simplified polygon's box never exceeds the contour's, so contours
+    # too small for either class can be dropped before any polygon work
+    boxes = contour_boxes(contours)
+    w, h = boxes[:, 2], boxes[:, 3]
+    candidates = (w >= min_size) & (h >= min_size)
+    if duplicate_inset is not None:
+        candidates &= ~inner_duplicates(boxes, hierarchy, duplicate_inset)
+
+    for index in np.flatnonzero(candidates).tolist():
+        contour = contours[index]
         epsilon = 0.02 * cv2.arcLength(contour, True)
         approx = cv2.approxPolyDP(contour, epsilon, True)
         x, y, w, h = cv2.boundingRect(approx)
 
         # Avoid processing extremely small noise contours
-        if w < 10 or h < 10:
+        if w < min_size or h < min_size:
             continue
 
         # Classify walls vs doors based on bounding box aspect ratio and geometry
         aspect_ratio_wall = (w / h > 3.0) or (h / w > 3.0)
-        
+
         obj_data = {
-            "x": int(x), "y": int(y), 
+            "x": int(x), "y": int(y),
             "width": int(w), "height": int(h),
             "confidence": 0.8 # Placeholder confidence
         }
-        
+
         if len(approx) >= 4 and aspect_ratio_wall:
             obj_data["object_type"] = "WALL"
             detected_objects.append(obj_data)
-        elif w >= 20 and h >= 20:
+        elif w >= min_door_size and h >= min_door_size:
             obj_data["object_type"] = "DOOR"
             detected_objects.append(obj_data)
 
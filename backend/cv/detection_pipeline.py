@@ -1,21 +1,251 @@
-from backend.cv.preprocessing import preprocess_image
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from backend.cv.preprocessing import preprocess_gray
 from backend.cv.contour_detector import detect_contours
 from backend.cv.line_detector import detect_lines
+from backend.cv.tiling import preprocess_tiled, detect_lines_tiled
+from backend.cv.pyramid import coarse_preprocess, detect_pyramid
+from backend.cv.segment_merger import merge_collinear_segments
+from backend.cv.mode_selector import image_features, choose_mode, score_detections
+from backend.cv.incremental import detect_in_windows, paste_regions
+from backend.utils.image_cache import load_gray
 
 class DetectionPipeline:
     @staticmethod
-    def process(image_path, mode="auto"):
-        # Auto-selection logic could be added here. For now, default to contour
-        if mode == "auto":
-            mode = "contour"
-            
-        original, gray, blurred, morphed = preprocess_image(image_path)
-        
+    def preprocess(gray, app_config=None):
+        """
+        Returns (blurred, morphed) for a grayscale page, served from the
+        on-disk preprocess cache when the same pixels were seen before with
+        the same parameters.
+        """
+        from backend.utils.stage_metrics import stage
+
+        with stage("preprocess") as counts:
+            blurred, morphed, counts["cache_hits"] = DetectionPipeline._preprocess(gray, app_config)
+        return blurred, morphed
+
+    @staticmethod
+    def preprocess_params(app_config):
+        """preprocess_gray() keyword arguments from the PREPROCESS_* settings."""
+        blur = app_config.get('PREPROCESS_BLUR_KERNEL', 5)
+        return {
+            "blur_kernel": (blur, blur),
+            "block_size": app_config.get('PREPROCESS_BLOCK_SIZE', 11),
+            "kernel_size": app_config.get('PREPROCESS_KERNEL_SIZE', 5)
+        }
+
+    @staticmethod
+    def _preprocess(gray, app_config):
+        from backend.extensions import preprocess_cache
+
+        app_config = app_config or {}
+        params = DetectionPipeline.preprocess_params(app_config)
+
+        key = None
+        if preprocess_cache.enabled:
+            key = preprocess_cache.make_key(gray, **params)
+            cached = preprocess_cache.load(key, ("blurred", "morphed"))
+            if cached is not None:
+                return cached[0], cached[1], 1
+
+        # Large scans are split into overlapping tiles and run in parallel
+        if DetectionPipeline._is_large(gray, app_config):
+            blurred, morphed = preprocess_tiled(
+                gray,
+                tile_size=app_config.get('DETECTION_TILE_SIZE', 2048),
+                overlap=app_config.get('DETECTION_TILE_OVERLAP', 64),
+                workers=app_config.get('DETECTION_WORKERS', 0),
+                **params
+            )
+        else:
+            blurred, morphed = preprocess_gray(gray, **params)
+
+        if key is not None:
+            preprocess_cache.store(key, {"blurred": blurred, "morphed": morphed})
+        return blurred, morphed, 0
+
+    @staticmethod
+    def cached_masks(gray, app_config):
+        """
+        Writable copies of the (blurred, morphed) pair the preprocess cache
+        holds for `gray`, or None when it is not cached.
+        """
+        from backend.extensions import preprocess_cache
+
+        if not preprocess_cache.enabled:
+            return None
+        key = preprocess_cache.make_key(gray, **DetectionPipeline.preprocess_params(app_config or {}))
+        cached = preprocess_cache.load(key, ("blurred", "morphed"))
+        if cached is None:
+            return None
+        return np.array(cached[0]), np.array(cached[1])
+
+    @staticmethod
+    def store_masks(gray, app_config, masks):
+        """Caches a (blurred, morphed) pair built for `gray` outside preprocess(), e.g. patched by run_windows."""
+        from backend.extensions import preprocess_cache
+
+        if preprocess_cache.enabled:
+            key = preprocess_cache.make_key(gray, **DetectionPipeline.preprocess_params(app_config or {}))
+            preprocess_cache.store(key, {"blurred": masks[0], "morphed": masks[1]})
+
+    @staticmethod
+    def prepare(image, app_config=None):
+        """
+        Preprocesses a page once for detection, OCR region proposals and
+        room segmentation. Returns {"factor", "blurred", "morphed"}: the
+        full-resolution arrays (factor 1), or the coarse level of a page
+        above PYRAMID_DETECTION_MIN_PIXELS, downscaled by PYRAMID_FACTOR.
+        """
+        app_config = app_config or {}
+        gray = load_gray(image)
+        if DetectionPipeline._use_pyramid(gray, app_config):
+            factor = app_config.get('PYRAMID_FACTOR', 4)
+            blurred, morphed = coarse_preprocess(gray, factor, DetectionPipeline.preprocess_params(app_config))
+        else:
+            factor = 1
+            blurred, morphed = DetectionPipeline.preprocess(gray, app_config)
+        return {"factor": factor, "blurred": blurred, "morphed": morphed}
+
+    @staticmethod
+    def wall_mask(prepared, shape):
+        """The wall mask of a prepare()d page at full resolution; a coarse level is scaled up."""
+        if prepared["factor"] == 1:
+            return prepared["morphed"]
+        return cv2.resize(prepared["morphed"], (shape[1], shape[0]), interpolation=cv2.INTER_NEAREST)
+
+    @staticmethod
+    def coarse_wall_mask(image, app_config=None):
+        """A cheap full-size wall mask thresholded at PYRAMID_FACTOR, for room segmentation."""
+        app_config = app_config or {}
+        gray = load_gray(image)
+        factor = app_config.get('PYRAMID_FACTOR', 4)
+        _, morphed = coarse_preprocess(gray, factor, DetectionPipeline.preprocess_params(app_config))
+        return DetectionPipeline.wall_mask({"factor": factor, "morphed": morphed}, gray.shape)
+
+    @staticmethod
+    def _is_large(gray, app_config):
+        min_pixels = app_config.get('TILED_DETECTION_MIN_PIXELS', 0)
+        return bool(min_pixels) and gray.shape[0] * gray.shape[1] >= min_pixels
+
+    @staticmethod
+    def _use_pyramid(gray, app_config):
+        min_pixels = app_config.get('PYRAMID_DETECTION_MIN_PIXELS', 0)
+        return bool(min_pixels) and gray.shape[0] * gray.shape[1] >= min_pixels
+
+    @staticmethod
+    def _detect(mode, gray, blurred, morphed, app_config):
         if mode == "contour":
-            objects = detect_contours(morphed)
-        elif mode == "line":
-            objects = detect_lines(blurred)
+            return detect_contours(morphed)
+        if DetectionPipeline._is_large(gray, app_config):
+            return detect_lines_tiled(
+                blurred,
+                tile_size=app_config.get('DETECTION_TILE_SIZE', 2048),
+                overlap=app_config.get('DETECTION_TILE_OVERLAP', 64),
+                workers=app_config.get('DETECTION_WORKERS', 0),
+                **DetectionPipeline.preprocess_params(app_config)
+            )
+        return detect_lines(blurred)
+
+    @staticmethod
+    def _postprocess(mode, objects, app_config, stats):
+        # Hough splits every wall into overlapping fragments; join them so
+        # one physical wall becomes one record
+        if mode == "line" and app_config.get('MERGE_COLLINEAR_SEGMENTS', True):
+            objects, stats["merge"] = merge_collinear_segments(
+                objects,
+                angle_tolerance_deg=app_config.get('MERGE_ANGLE_TOLERANCE_DEG', 2.0),
+                offset_tolerance=app_config.get('MERGE_OFFSET_TOLERANCE', 6.0),
+                gap_tolerance=app_config.get('MERGE_GAP_TOLERANCE', 12.0)
+            )
+        return objects
+
+    @staticmethod
+    def run(image, mode="auto", app_config=None, prepared=None):
+        """
+        Detects walls and doors and returns (resolved_mode, objects, stats).
+
+        "auto" picks a detector from cheap statistics of a thumbnail;
+        "race" runs both detectors concurrently (OpenCV releases the GIL)
+        and keeps the result that best explains the wall mask. Pages above
+        PYRAMID_DETECTION_MIN_PIXELS are detected coarse-to-fine.
+        `prepared` is the page's prepare() result when the caller already
+        has it.
+        """
+        if mode not in ("auto", "race", "contour", "line"):
+            raise ValueError(f"Unknown detection mode: {mode}")
+
+        app_config = app_config or {}
+        gray = load_gray(image)
+        stats = {}
+
+        if mode == "auto":
+            mode = choose_mode(image_features(gray))
+
+        prepared = prepared or DetectionPipeline.prepare(gray, app_config)
+        if prepared["factor"] > 1:
+            factor = prepared["factor"]
+            coarse = (prepared["blurred"], prepared["morphed"])
+            # Candidates are scored against the coarse wall mask
+            mask, page_width = coarse[1], gray.shape[1]
+            detect = lambda candidate: detect_pyramid(
+                gray, candidate, factor=factor, coarse=coarse,
+                params=DetectionPipeline.preprocess_params(app_config),
+                workers=app_config.get('DETECTION_WORKERS', 0)
+            )
         else:
+            blurred, morphed = prepared["blurred"], prepared["morphed"]
+            mask, page_width = morphed, None
+            detect = lambda candidate: DetectionPipeline._detect(candidate, gray, blurred, morphed, app_config)
+
+        if mode == "race":
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = {candidate: pool.submit(detect, candidate) for candidate in ("contour", "line")}
+                results = {
+                    candidate: DetectionPipeline._postprocess(candidate, future.result(), app_config, stats)
+                    for candidate, future in futures.items()
+                }
+            mode = max(results, key=lambda candidate: score_detections(results[candidate], mask, page_width))
+            return mode, results[mode], stats
+
+        return mode, DetectionPipeline._postprocess(mode, detect(mode), app_config, stats), stats
+
+    @staticmethod
+    def run_windows(image, mode, windows, regions, app_config=None, masks=None):
+        """
+        Re-detects only inside `windows` of a revised page and returns
+        (objects, stats) for the objects touching the changed `regions`.
+        `mode` must be the resolved mode of the previous revision. `masks`,
+        the previous revision's full-page (blurred, morphed), are updated
+        in place with the changed regions.
+        """
+        if mode not in ("contour", "line"):
             raise ValueError(f"Unknown detection mode: {mode}")
-            
-        return objects
+
+        app_config = app_config or {}
+        gray = load_gray(image)
+        params = DetectionPipeline.preprocess_params(app_config)
+
+        prepared = []
+        for window in windows:
+            x0, y0, x1, y1 = window
+            prepared.append(preprocess_gray(gray[y0:y1, x0:x1], **params))
+            if masks is not None:
+                for target, source in zip(masks, prepared[-1]):
+                    paste_regions(target, source, window, regions)
+
+        # detect_in_windows visits the windows in order
+        crops = iter(prepared)
+
+        def detect(crop):
+            blurred, morphed = next(crops)
+            return DetectionPipeline._detect(mode, crop, blurred, morphed, app_config)
+
+        stats = {}
+        objects = detect_in_windows(gray, windows, regions, detect)
+        return DetectionPipeline._postprocess(mode, objects, app_config, stats), stats
+
+    @staticmethod
+    def process(image, mode="auto", app_config=None):
+        return DetectionPipeline.run(image, mode, app_config)[1]
@@ -0,0 +1,166 @@
+import cv2
+import numpy as np
+
+def changed_regions(previous, current, threshold=32, block_size=64, margin=16):
+    """
+    Pixel diff of two revisions of the same sheet. Returns the boxes
+    (x0, y0, x1, y1) of connected groups of `block_size` blocks that hold a
+    pixel differing by more than `threshold`, grown by `margin` pixels.
+    Returns None when the pages differ in size and cannot be compared.
+    """
+    if previous.shape != current.shape:
+        return None
+
+    changed = cv2.absdiff(previous, current) > threshold
+    height, width = changed.shape[:2]
+    rows = -(-height // block_size)
+    cols = -(-width // block_size)
+    padded = np.zeros((rows * block_size, cols * block_size), bool)
+    padded[:height, :width] = changed
+    active = padded.reshape(rows, block_size, cols, block_size).any(axis=(1, 3))
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(active.astype(np.uint8), connectivity=8)
+    regions = []
+    for left, top, w, h, _ in stats[1:].tolist():
+        regions.append((
+            max(left * block_size - margin, 0), max(top * block_size - margin, 0),
+            min((left + w) * block_size + margin, width), min((top + h) * block_size + margin, height)
+        ))
+    return regions
+
+def region_area(regions):
+    covered = 0
+    for x0, y0, x1, y1 in regions:
+        covered += (x1 - x0) * (y1 - y0)
+    return covered
+
+def object_boxes(objects):
+    """(N, 4) array of x0, y0, x1, y1 boxes for detection or OCR records."""
+    boxes = np.array([
+        (o.get("x") or 0, o.get("y") or 0,
+         (o.get("x") or 0) + (o.get("width") or 0), (o.get("y") or 0) + (o.get("height") or 0))
+        for o in objects
+    ], dtype=np.float64)
+    return boxes.reshape(-1, 4)
+
+def overlaps(boxes, regions):
+    """Boolean mask of the boxes that touch any of the regions."""
+    hit = np.zeros(len(boxes), dtype=bool)
+    for x0, y0, x1, y1 in regions:
+        hit |= (boxes[:, 0] <= x1) & (boxes[:, 2] >= x0) & (boxes[:, 1] <= y1) & (boxes[:, 3] >= y0)
+    return hit
+
+def _segments_touch(segments, region):
+    """Liang-Barsky clip of (N, 4) segments against one region."""
+    x0, y0, x1, y1 = region
+    start, delta = segments[:, 0:2], segments[:, 2:4] - segments[:, 0:2]
+    t_low = np.zeros(len(segments))
+    t_high = np.ones(len(segments))
+    inside = np.ones(len(segments), dtype=bool)
+    for axis, low, high in ((0, x0, x1), (1, y0, y1)):
+        d, p = delta[:, axis], start[:, axis]
+        flat = d == 0
+        inside &= ~flat | ((p >= low) & (p <= high))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ta, tb = (low - p) / d, (high - p) / d
+        t_low = np.where(flat, t_low, np.maximum(t_low, np.minimum(ta, tb)))
+        t_high = np.where(flat, t_high, np.minimum(t_high, np.maximum(ta, tb)))
+    return inside & (t_low <= t_high)
+
+def touches(objects, regions, band=4):
+    """
+    Boolean mask of the records whose geometry touches any of the regions.
+    Segments are clipped exactly. Detection boxes trace hollow outlines, so
+    a region more than `band` pixels inside a box leaves it untouched; pass
+    `band=None` for solid boxes such as OCR words.
+    """
+    boxes = object_boxes(objects)
+    hit = overlaps(boxes, regions)
+    if not len(objects) or not hit.any():
+        return hit
+
+    segment = np.array(["x1" in o and o["x1"] is not None for o in objects])
+    if segment.any():
+        lines = np.array([(o["x1"], o["y1"], o["x2"], o["y2"]) for o, s in zip(objects, segment) if s],
+                         dtype=np.float64)
+        crossed = np.zeros(len(lines), dtype=bool)
+        for region in regions:
+            crossed |= _segments_touch(lines, region)
+        hit[segment] = crossed
+
+    if band is not None:
+        enclosed = np.zeros(len(boxes), dtype=bool)
+        for x0, y0, x1, y1 in regions:
+            enclosed |= ((boxes[:, 0] + band < x0) & (boxes[:, 1] + band < y0) &
+                         (boxes[:, 2] - band > x1) & (boxes[:, 3] - band > y1))
+        hit &= segment | ~enclosed
+    return hit
+
+def detection_windows(regions, stale_boxes, shape, margin=32):
+    """
+    Windows to re-run detection in: every changed region grown to cover the
+    previous objects it touches, so a wall that was edited is traced whole,
+    plus `margin` pixels of context. Overlapping windows are merged so no
+    object is reported twice.
+    """
+    height, width = shape[:2]
+    windows = []
+    for region in regions:
+        x0, y0, x1, y1 = region
+        touched = stale_boxes[overlaps(stale_boxes, [region])] if len(stale_boxes) else stale_boxes
+        if len(touched):
+            x0, y0 = min(x0, touched[:, 0].min()), min(y0, touched[:, 1].min())
+            x1, y1 = max(x1, touched[:, 2].max()), max(y1, touched[:, 3].max())
+        windows.append([int(max(x0 - margin, 0)), int(max(y0 - margin, 0)),
+                        int(min(x1 + margin, width)), int(min(y1 + margin, height))])
+
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(windows)):
+            for j in range(i + 1, len(windows)):
+                a, b = windows[i], windows[j]
+                if a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]:
+                    windows[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del windows[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return [tuple(w) for w in windows]
+
+def paste_regions(target, source, window, regions):
+    """
+    Copies the parts of `regions` inside `window` from `source`, an array
+    computed on the window's crop, into the full-page `target`.
+    """
+    wx0, wy0, wx1, wy1 = window
+    for x0, y0, x1, y1 in regions:
+        x0, y0, x1, y1 = max(x0, wx0), max(y0, wy0), min(x1, wx1), min(y1, wy1)
+        if x0 < x1 and y0 < y1:
+            target[y0:y1, x0:x1] = source[y0 - wy0:y1 - wy0, x0 - wx0:x1 - wx0]
+
+def detect_in_windows(image, windows, regions, detect, band=4):
+    """
+    Runs `detect` on each window crop, shifts the results back to page
+    coordinates and keeps those touching a changed region; everything else
+    in the window is unchanged and already known from the previous
+    revision.
+    """
+    results = []
+    for x0, y0, x1, y1 in windows:
+        for item in detect(image[y0:y1, x0:x1]):
+            item = dict(item)
+            item["x"] += x0
+            item["y"] += y0
+            if "x1" in item:
+                item["x1"] += x0
+                item["x2"] += x0
+                item["y1"] += y0
+                item["y2"] += y0
+            results.append(item)
+
+    if not results:
+        return results
+    keep = touches(results, regions, band)
+    return [item for item, kept in zip(results, keep.tolist()) if kept]
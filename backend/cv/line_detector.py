@@ -5,58 +5,128 @@ import math
 def distance(p1, p2):
     return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
-def detect_lines(blurred_image, min_distance=15.0):
+# Relative cell offsets covering every neighbour within one grid cell
+_NEIGHBOUR_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+def _candidate_pairs(cells, order, sorted_keys, key_scale):
+    """
+    For every segment i, yields (i, j) index pairs for all segments j whose
+    start point falls in one of the 3x3 grid cells around the start of i.
+    """
+    pairs_i = []
+    pairs_j = []
+    for dx, dy in _NEIGHBOUR_OFFSETS:
+        keys = (cells[:, 0] + dx) * key_scale + (cells[:, 1] + dy)
+        lo = np.searchsorted(sorted_keys, keys, side='left')
+        hi = np.searchsorted(sorted_keys, keys, side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            continue
+
+        # Expand each [lo, hi) range into explicit positions in `order`
+        owners = np.repeat(np.arange(len(cells)), counts)
+        starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+        positions = starts + np.arange(total)
+        pairs_i.append(owners)
+        pairs_j.append(order[positions])
+
+    if not pairs_i:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+def filter_duplicate_segments(segments, min_distance=15.0, max_sine=0.05):
+    """
+    Greedy duplicate filter over an (N, 4) array of x1, y1, x2, y2 segments.
+
+    A segment is dropped when an earlier *kept* segment is near-parallel
+    (sine of the angle between them below ``max_sine``) and both matching
+    endpoints lie within ``min_distance``. Start points are bucketed on a
+    grid of ``min_distance`` cells so each segment is only compared with
+    segments in the neighbouring cells, and the geometric tests run in
+    batch. Returns a boolean keep-mask in input order.
+    """
+    segments = np.asarray(segments, dtype=np.int64).reshape(-1, 4)
+    n = len(segments)
+    keep = np.ones(n, dtype=bool)
+    if n < 2:
+        return keep
+
+    p1 = segments[:, 0:2]
+    p2 = segments[:, 2:4]
+
+    cells = np.floor_divide(p1, max(min_distance, 1.0)).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    key_scale = int(cells[:, 1].max()) + 2
+    cell_keys = cells[:, 0] * key_scale + cells[:, 1]
+    order = np.argsort(cell_keys, kind='stable')
+    sorted_keys = cell_keys[order]
+
+    pi, pj = _candidate_pairs(cells, order, sorted_keys, key_scale)
+
+    # Only earlier segments can make a later one a duplicate
+    earlier = pj < pi
+    pi, pj = pi[earlier], pj[earlier]
+
+    d1 = np.sqrt(((p1[pi] - p1[pj]) ** 2).sum(axis=1).astype(np.float64))
+    d2 = np.sqrt(((p2[pi] - p2[pj]) ** 2).sum(axis=1).astype(np.float64))
+    close = (d1 < min_distance) & (d2 < min_distance)
+    pi, pj = pi[close], pj[close]
+
+    vec = (p2 - p1).astype(np.float64)
+    mag = np.sqrt((vec ** 2).sum(axis=1))
+    cross = np.abs(vec[pi, 0] * vec[pj, 1] - vec[pi, 1] * vec[pj, 0])
+    denom = mag[pi] * mag[pj]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        parallel = (denom > 0) & (cross / denom < max_sine)
+    pi, pj = pi[parallel], pj[parallel]
+
+    if len(pi) == 0:
+        return keep
+
+    # Resolve the greedy order: a segment survives only if none of its
+    # candidate originals survived. Pairs are sparse, so this touches
+    # only segments that actually have a near-duplicate.
+    by_i = np.lexsort((pj, pi))
+    pi, pj = pi[by_i], pj[by_i]
+    bounds = np.flatnonzero(np.diff(pi)) + 1
+    for group_i, group_j in zip(np.split(pi, bounds), np.split(pj, bounds)):
+        if keep[group_j].any():
+            keep[group_i[0]] = False
+
+    return keep
+
+def detect_lines(blurred_image, min_distance=15.0, hough_threshold=50, min_line_length=50, max_line_gap=10):
     edges = cv2.Canny(blurred_image, 50, 150)
-    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, threshold=50, minLineLength=50, maxLineGap=10)
-    
+    return detect_lines_from_edges(edges, min_distance, hough_threshold, min_line_length, max_line_gap)
+
+def detect_lines_from_edges(edges, min_distance=15.0, hough_threshold=50, min_line_length=50, max_line_gap=10):
+    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, threshold=hough_threshold,
+                            minLineLength=min_line_length, maxLineGap=max_line_gap)
+
     detected_objects = []
-    
+
     if lines is not None:
-        raw_coords = []
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            raw_coords.append(((int(x1), int(y1)), (int(x2), int(y2))))
-        
-        filtered_lines = []
-        for (p1, p2) in raw_coords:
-            x1, y1 = p1
-            x2, y2 = p2
-            
-            duplicate = False
-            for (fp1, fp2) in filtered_lines:
-                fx1, fy1 = fp1
-                fx2, fy2 = fp2
-                
-                line1_vec = (x2 - x1, y2 - y1)
-                line2_vec = (fx2 - fx1, fy2 - fy1)
-                
-                mag1 = math.sqrt(line1_vec[0]**2 + line1_vec[1]**2)
-                mag2 = math.sqrt(line2_vec[0]**2 + line2_vec[1]**2)
-                
-                if mag1 > 0 and mag2 > 0:
-                    cross_product = abs(line1_vec[0]*line2_vec[1] - line1_vec[1]*line2_vec[0])
-                    sine_angle = cross_product / (mag1 * mag2)
-                    
-                    if sine_angle < 0.05: 
-                        if distance(p1, fp1) < min_distance and distance(p2, fp2) < min_distance:
-                            duplicate = True
-                            break
-            
-            if not duplicate:
-                filtered_lines.append((p1, p2))
-                
-                angle = math.atan2(y2 - y1, x2 - x1)
-                length = distance(p1, p2)
-                
-                detected_objects.append({
-                    "object_type": "WALL", # Lines are assumed to be walls
-                    "x1": x1, "y1": y1,
-                    "x2": x2, "y2": y2,
-                    "x": min(x1, x2), "y": min(y1, y2),
-                    "width": abs(x2 - x1), "height": abs(y2 - y1),
-                    "angle": angle,
-                    "length": length,
-                    "confidence": 0.9 # Placeholder
-                })
-                
+        segments = lines.reshape(-1, 4)
+        keep = filter_duplicate_segments(segments, min_distance=min_distance)
+
+        for x1, y1, x2, y2 in segments[keep].tolist():
+            p1 = (x1, y1)
+            p2 = (x2, y2)
+
+            angle = math.atan2(y2 - y1, x2 - x1)
+            length = distance(p1, p2)
+
+            detected_objects.append({
+                "object_type": "WALL", # Lines are assumed to be walls
+                "x1": x1, "y1": y1,
+                "x2": x2, "y2": y2,
+                "x": min(x1, x2), "y": min(y1, y2),
+                "width": abs(x2 - x1), "height": abs(y2 - y1),
+                "angle": angle,
+                "length": length,
+                "confidence": 0.9 # Placeholder
+            })
+
     return detected_objects
@@ -0,0 +1,130 @@
+import cv2
+import numpy as np
+
+# Longest side of the thumbnail the features are computed on
+FEATURE_SIZE = 512
+
+def _thumbnail(gray, max_side=FEATURE_SIZE):
+    height, width = gray.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1.0:
+        return gray
+    size = (max(int(width * scale), 1), max(int(height * scale), 1))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+def image_features(gray):
+    """
+    Cheap statistics of a downsampled page used to pick a detector:
+    edge density, how much gradient energy lies on the two dominant axes,
+    mean stroke thickness and connected-component statistics.
+    """
+    small = _thumbnail(gray)
+    blurred = cv2.GaussianBlur(small, (3, 3), 0)
+    edges = cv2.Canny(blurred, 50, 150)
+    ink = cv2.adaptiveThreshold(blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                cv2.THRESH_BINARY_INV, 11, 2)
+
+    edge_pixels = int(np.count_nonzero(edges))
+    ink_pixels = int(np.count_nonzero(ink))
+    area = float(small.shape[0] * small.shape[1])
+
+    # Orientation histogram of strong gradients, folded to [0, 180)
+    gx = cv2.Sobel(blurred, cv2.CV_32F, 1, 0, ksize=3)
+    gy = cv2.Sobel(blurred, cv2.CV_32F, 0, 1, ksize=3)
+    magnitude, angle = cv2.cartToPolar(gx, gy, angleInDegrees=True)
+    strong = edges > 0
+    hist, _ = np.histogram(np.mod(angle[strong], 180.0), bins=36, range=(0.0, 180.0),
+                           weights=magnitude[strong])
+    total = hist.sum()
+    if total > 0:
+        # Energy in the strongest bin and the bin perpendicular to it
+        peak = int(np.argmax(hist))
+        window = lambda b: hist[[(b - 1) % 36, b, (b + 1) % 36]].sum()
+        dominant = (window(peak) + window((peak + 18) % 36)) / total
+    else:
+        dominant = 0.0
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    stats = stats[1:]
+    if len(stats):
+        boxes = stats[:, cv2.CC_STAT_WIDTH] * stats[:, cv2.CC_STAT_HEIGHT]
+        fill = stats[:, cv2.CC_STAT_AREA] / np.maximum(boxes, 1)
+        large = stats[:, cv2.CC_STAT_AREA] >= 0.001 * area
+        large_fraction = float(stats[large, cv2.CC_STAT_AREA].sum()) / max(ink_pixels, 1)
+        mean_fill = float(fill[large].mean()) if large.any() else float(fill.mean())
+    else:
+        large_fraction = 0.0
+        mean_fill = 0.0
+
+    return {
+        "edge_density": edge_pixels / area,
+        "ink_density": ink_pixels / area,
+        "dominant_orientation": float(dominant),
+        # Ink area per unit of outline length approximates stroke width
+        "stroke_width": 2.0 * ink_pixels / max(edge_pixels, 1),
+        "components": int(count - 1),
+        "large_component_fraction": large_fraction,
+        "component_fill": mean_fill
+    }
+
+def choose_mode(features):
+    """
+    Picks "line" for connected drawings made of thin, hollow strokes or
+    with many off-axis walls, where Hough recovers walls as segments, and
+    "contour" for solid or thick walls and noisy scans, where bounding boxes
+    of the closed wall mask are more reliable.
+    """
+    if features["edge_density"] == 0:
+        return "contour"
+
+    noisy = features["components"] > 2000 or features["large_component_fraction"] < 0.5
+    if noisy:
+        return "contour"
+
+    thin_strokes = features["stroke_width"] < 4.5 and features["component_fill"] < 0.4
+    off_axis = features["dominant_orientation"] < 0.5
+    if thin_strokes or off_axis:
+        return "line"
+    return "contour"
+
+def _render(objects, shape, scale):
+    canvas = np.zeros(shape, np.uint8)
+    for obj in objects:
+        if "x1" in obj:
+            p1 = (int(obj["x1"] * scale), int(obj["y1"] * scale))
+            p2 = (int(obj["x2"] * scale), int(obj["y2"] * scale))
+            cv2.line(canvas, p1, p2, 255, 2)
+        else:
+            p1 = (int(obj["x"] * scale), int(obj["y"] * scale))
+            p2 = (int((obj["x"] + obj["width"]) * scale), int((obj["y"] + obj["height"]) * scale))
+            thickness = -1 if obj.get("object_type") == "WALL" else 2
+            cv2.rectangle(canvas, p1, p2, 255, thickness)
+    return canvas > 0
+
+def score_detections(objects, morphed, page_width=None):
+    """
+    F1 agreement between the rendered detections and the wall mask, on a
+    thumbnail and with a few pixels of tolerance. Used to compare the
+    output of different detectors on the same page. `page_width` is the
+    width of the page the objects were detected on, when `morphed` is a
+    downscaled mask.
+    """
+    if not objects:
+        return 0.0
+
+    small = _thumbnail(morphed)
+    scale = small.shape[1] / (page_width or morphed.shape[1])
+    ink = small > 0
+    drawn = _render(objects, small.shape, scale)
+    if not ink.any() or not drawn.any():
+        return 0.0
+
+    kernel = np.ones((5, 5), np.uint8)
+    near_ink = cv2.dilate(ink.astype(np.uint8), kernel) > 0
+    near_drawn = cv2.dilate(drawn.astype(np.uint8), kernel) > 0
+
+    precision = np.count_nonzero(drawn & near_ink) / np.count_nonzero(drawn)
+    recall = np.count_nonzero(ink & near_drawn) / np.count_nonzero(ink)
+    if precision + recall == 0:
+        return 0.0
+    return float(2 * precision * recall / (precision + recall))
@@ -0,0 +1,124 @@
+import os
+import hashlib
+import threading
+import numpy as np
+
+class PreprocessCache:
+    """
+    Content-addressed on-disk cache of preprocessing intermediates.
+
+    Each entry is a directory named after a hash of the grayscale pixels and
+    the preprocessing parameters, holding one `.npy` file per array so hits
+    can be memory-mapped instead of read. Entry mtimes are bumped on every
+    hit and the least recently used entries are removed once the cache
+    grows past `max_bytes`. Disabled until a directory is configured.
+    """
+
+    def __init__(self, directory=None, max_bytes=2 * 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get('PREPROCESS_CACHE_MB', 2048) * 1024 * 1024
+        self.directory = app.config.get('PREPROCESS_CACHE_FOLDER') if self.max_bytes > 0 else None
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return bool(self.directory)
+
+    @staticmethod
+    def make_key(gray, **params):
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((gray.shape, str(gray.dtype), sorted(params.items()))).encode())
+        digest.update(np.ascontiguousarray(gray).data)
+        return digest.hexdigest()
+
+    def load(self, key, names):
+        """Returns memory-mapped arrays for `names`, or None on a miss."""
+        if not self.enabled:
+            return None
+        entry = os.path.join(self.directory, key)
+        # FileNotFoundError also covers an entry evicted by another process
+        # between files, or before its mtime is bumped; that is a miss
+        try:
+            arrays = tuple(np.load(os.path.join(entry, f"{name}.npy"), mmap_mode='r') for name in names)
+            os.utime(entry)
+        except (FileNotFoundError, ValueError):
+            return None
+        return arrays
+
+    def store(self, key, arrays):
+        if not self.enabled:
+            return
+
+        entry = os.path.join(self.directory, key)
+        staging = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(staging, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), array)
+
+        # Publish atomically so concurrent readers never see a partial entry
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            # Another worker stored the same content first
+            _remove_entry(staging)
+            return
+        self.evict()
+
+    def evict(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if name.endswith('.tmp') or not os.path.isdir(path):
+                    continue
+                # Another process may evict the entry while it is being listed
+                try:
+                    mtime = os.stat(path).st_mtime
+                except FileNotFoundError:
+                    continue
+                size = _entry_size(path)
+                entries.append((mtime, size, path))
+                total += size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                _remove_entry(path)
+                total -= size
+
+def _entry_size(path):
+    # The lock only covers this process; files may vanish under other workers
+    size = 0
+    try:
+        names = os.listdir(path)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        try:
+            size += os.path.getsize(os.path.join(path, name))
+        except FileNotFoundError:
+            pass
+    return size
+
+def _remove_entry(path):
+    try:
+        names = os.listdir(path)
+    except FileNotFoundError:
+        return
+    for name in names:
+        try:
+            os.remove(os.path.join(path, name))
+        except FileNotFoundError:
+            pass
+    try:
+        os.rmdir(path)
+    except FileNotFoundError:
+        pass
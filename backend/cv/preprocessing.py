@@ -1,20 +1,26 @@
 import cv2
 import numpy as np
+from backend.extensions import image_cache
 
-def preprocess_image(image_path, blur_kernel=(5, 5)):
-    image = cv2.imread(image_path)
-    if image is None:
-        raise FileNotFoundError(f"Could not load image at {image_path}")
-    
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(gray, blur_kernel, 0)
+def preprocess_gray(gray, blur_kernel=(5, 5), block_size=11, kernel_size=5):
+    blurred = cv2.GaussianBlur(gray, tuple(blur_kernel), 0)
     
     # Adaptive thresholding to handle uneven lighting and clear lines
     thresh = cv2.adaptiveThreshold(blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                   cv2.THRESH_BINARY_INV, 11, 2)
+                                   cv2.THRESH_BINARY_INV, block_size, 2)
     
     # Morphological close to bridge small gaps
-    kernel = np.ones((5, 5), np.uint8)
+    kernel = np.ones((kernel_size, kernel_size), np.uint8)
     morphed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
     
+    return blurred, morphed
+
+def preprocess_image(image_path, blur_kernel=(5, 5)):
+    image = image_cache.get_color(image_path)
+    if image is None:
+        raise FileNotFoundError(f"Could not load image at {image_path}")
+    
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    blurred, morphed = preprocess_gray(gray, blur_kernel)
+    
     return image, gray, blurred, morphed
@@ -0,0 +1,126 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from backend.cv.preprocessing import preprocess_gray
+from backend.cv.contour_detector import detect_contours
+from backend.cv.line_detector import detect_lines, detect_lines_from_edges
+
+# Context added around each region before full-resolution preprocessing so
+# the blur, threshold and morphology see the same neighbourhood as a
+# full-page pass
+CONTEXT = 16
+
+def _odd(size, minimum):
+    size = max(int(round(size)), minimum)
+    return size if size % 2 else size + 1
+
+def coarse_params(params, factor):
+    """
+    Preprocessing parameters for a page downscaled by `factor`: the blur,
+    threshold block and morphology kernel cover the same page area as the
+    full-resolution ones. They never go below preprocess_gray()'s defaults,
+    which thumbnails need to join thin walls into candidates.
+    """
+    params = params or {}
+    blur = params.get("blur_kernel", (5, 5))
+    return {
+        "blur_kernel": tuple(_odd(k / factor, 5) for k in blur),
+        "block_size": _odd(params.get("block_size", 11) / factor, 11),
+        "kernel_size": _odd(params.get("kernel_size", 5) / factor, 5)
+    }
+
+def coarse_preprocess(gray, factor=4, params=None):
+    """Downscales the page by `factor` and preprocesses the thumbnail."""
+    height, width = gray.shape[:2]
+    size = (max(width // factor, 1), max(height // factor, 1))
+    small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    return preprocess_gray(small, **coarse_params(params, factor))
+
+def _coarse_candidates(mode, coarse, factor):
+    blurred, morphed = coarse
+    if mode == "contour":
+        return detect_contours(morphed, min_size=max(10 // factor, 2), min_door_size=max(20 // factor, 2),
+                               duplicate_inset=max(12 // factor, 1))
+    return detect_lines(blurred, hough_threshold=max(50 // factor, 10),
+                        min_line_length=max(50 // factor, 6), max_line_gap=max(10 // factor, 2))
+
+def regions_of_interest(candidates, coarse_shape, factor, margin=24, block_size=256):
+    """
+    Renders the coarse candidates, grows them by `margin` full-resolution
+    pixels and returns the rows of `block_size` blocks they touch as
+    (x0, y0, x1, y1) boxes in page coordinates.
+    """
+    canvas = np.zeros(coarse_shape, np.uint8)
+    for obj in candidates:
+        if "x1" in obj:
+            cv2.line(canvas, (obj["x1"], obj["y1"]), (obj["x2"], obj["y2"]), 255, 1)
+        else:
+            cv2.rectangle(canvas, (obj["x"], obj["y"]),
+                          (obj["x"] + obj["width"], obj["y"] + obj["height"]), 255, 1)
+
+    grow = 2 * (margin // factor) + 3
+    canvas = cv2.dilate(canvas, np.ones((grow, grow), np.uint8))
+
+    # Reduce the coarse mask to one flag per block
+    cell = max(block_size // factor, 1)
+    rows = -(-canvas.shape[0] // cell)
+    cols = -(-canvas.shape[1] // cell)
+    padded = np.zeros((rows * cell, cols * cell), np.uint8)
+    padded[:canvas.shape[0], :canvas.shape[1]] = canvas
+    active = padded.reshape(rows, cell, cols, cell).max(axis=(1, 3)) > 0
+
+    # Merge horizontal runs of active blocks to cut per-region overhead
+    step = cell * factor
+    regions = []
+    for r in range(rows):
+        flags = np.concatenate(([False], active[r], [False]))
+        edges = np.flatnonzero(flags[1:] != flags[:-1])
+        for start, stop in zip(edges[::2], edges[1::2]):
+            regions.append((int(start * step), int(r * step), int(stop * step), int((r + 1) * step)))
+    return regions
+
+def _window(region, shape):
+    height, width = shape[:2]
+    x0, y0, x1, y1 = region
+    x1, y1 = min(x1, width), min(y1, height)
+    wx0, wy0 = max(x0 - CONTEXT, 0), max(y0 - CONTEXT, 0)
+    wx1, wy1 = min(x1 + CONTEXT, width), min(y1 + CONTEXT, height)
+    return (x0, y0, x1, y1), (wx0, wy0, wx1, wy1)
+
+def _refine_region(gray, canvas, region, mode, params):
+    (x0, y0, x1, y1), (wx0, wy0, wx1, wy1) = _window(region, gray.shape)
+    blurred, morphed = preprocess_gray(gray[wy0:wy1, wx0:wx1], **params)
+    if mode == "contour":
+        result = morphed
+    else:
+        result = cv2.Canny(blurred, 50, 150)
+    canvas[y0:y1, x0:x1] = result[y0 - wy0:y1 - wy0, x0 - wx0:x1 - wx0]
+
+def detect_pyramid(gray, mode, factor=4, margin=24, block_size=256, workers=0, coarse=None, params=None):
+    """
+    Coarse-to-fine detection. The detector first runs on a page downscaled
+    by `factor` to find candidate walls; only the blocks around them are
+    then preprocessed at full resolution and the rest of the page is treated
+    as blank paper. Contour mode traces the sparse wall mask and line mode
+    runs Hough over the sparse edge map, so walls crossing block borders
+    are never split. `params` are the preprocess_gray() parameters of the
+    full-resolution blocks; the coarse pass uses them scaled by `factor`.
+    """
+    params = params or {}
+    if coarse is None:
+        coarse = coarse_preprocess(gray, factor, params)
+
+    candidates = _coarse_candidates(mode, coarse, factor)
+    regions = regions_of_interest(candidates, coarse[1].shape, factor, margin, block_size)
+    if not regions:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(regions))
+
+    canvas = np.zeros_like(gray)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda r: _refine_region(gray, canvas, r, mode, params), regions))
+
+    if mode == "contour":
+        return detect_contours(canvas)
+    return detect_lines_from_edges(canvas)
@@ -0,0 +1,108 @@
+import cv2
+import numpy as np
+
+def segment_rooms(morphed_image, gap_close=15, min_area_fraction=0.0005, min_area=400, epsilon=3.0):
+    """
+    Extracts rooms as the enclosed free space of the wall mask.
+
+    Openings narrower than `gap_close` pixels (doorways, small breaks in
+    the scan) are sealed with a morphological close, free space is labelled
+    with 4-connected components, and components touching the page border
+    (the outside) or smaller than the area limits are dropped. Area, bounding
+    box and centroid of every label come from a single labelling pass; only
+    the outline of each kept room is traced and simplified to `epsilon`
+    pixels.
+
+    Returns (rooms, labels): room dicts with a "label" key and the label
+    image, which doubles as an O(1) point-in-polygon index.
+    """
+    walls = morphed_image > 0
+    if gap_close and gap_close > 1:
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (gap_close, gap_close))
+        walls = cv2.morphologyEx(walls.astype(np.uint8), cv2.MORPH_CLOSE, kernel) > 0
+    free = (~walls).astype(np.uint8)
+
+    count, labels, stats, centroids = cv2.connectedComponentsWithStats(free, connectivity=4)
+    height, width = free.shape[:2]
+
+    left, top = stats[:, cv2.CC_STAT_LEFT], stats[:, cv2.CC_STAT_TOP]
+    w, h = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT]
+    area = stats[:, cv2.CC_STAT_AREA]
+    outside = (left == 0) | (top == 0) | (left + w == width) | (top + h == height)
+    keep = ~outside & (area >= max(min_area_fraction * width * height, min_area))
+    keep[0] = False # Walls
+
+    kept_labels = np.flatnonzero(keep)
+    if not len(kept_labels):
+        return [], labels
+
+    # Trace only the kept rooms; each outer contour belongs to one label
+    lookup = np.zeros(count, np.uint8)
+    lookup[kept_labels] = 255
+    contours, _ = cv2.findContours(lookup[labels], cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    outlines = {}
+    for contour in contours:
+        x, y = contour[0, 0]
+        label = int(labels[y, x])
+        # Diagonally touching rooms can share a contour; keep the longest
+        if label not in outlines or len(contour) > len(outlines[label]):
+            outlines[label] = contour
+
+    rooms = []
+    for label in kept_labels.tolist():
+        contour = outlines.get(label)
+        if contour is None:
+            continue
+        polygon = cv2.approxPolyDP(contour, epsilon, True).reshape(-1, 2)
+        rooms.append({
+            "label": label,
+            "polygon": polygon.tolist(),
+            "center_x": float(centroids[label, 0]),
+            "center_y": float(centroids[label, 1]),
+            "area_pixels": float(area[label]),
+            "width": float(w[label]),
+            "length": float(h[label]),
+            # Share of the bounding box the room fills; rooms are mostly rectangular
+            "confidence": float(area[label]) / float(w[label] * h[label])
+        })
+    return rooms, labels
+
+def name_rooms(rooms, labels, texts):
+    """
+    Assigns each room the ROOM_NAME text inside it closest to its centroid.
+    Text boxes are located by looking up their centre, then their corners,
+    in the label image, so a label whose centre falls on ink still finds its
+    room. `texts` are dicts with x, y, width, height and normalized_text.
+    """
+    if not rooms or not texts:
+        return rooms
+
+    boxes = np.array([(t["x"], t["y"], t["width"], t["height"]) for t in texts], dtype=np.float64)
+    x, y, w, h = boxes.T
+    probes = np.stack([
+        (x + w / 2, y + h / 2), (x, y), (x + w, y), (x, y + h), (x + w, y + h)
+    ])  # (5, 2, N)
+    height, width = labels.shape[:2]
+    px = np.clip(probes[:, 0].round().astype(np.int64), 0, width - 1)
+    py = np.clip(probes[:, 1].round().astype(np.int64), 0, height - 1)
+    hits = labels[py, px]  # (5, N)
+
+    # First non-zero label along the probe order
+    first = np.argmax(hits > 0, axis=0)
+    found = hits[first, np.arange(len(texts))]
+
+    by_label = {room["label"]: room for room in rooms}
+    best = {}
+    for index, label in enumerate(found.tolist()):
+        room = by_label.get(label)
+        if room is None:
+            continue
+        cx, cy = x[index] + w[index] / 2, y[index] + h[index] / 2
+        distance = (cx - room["center_x"]) ** 2 + (cy - room["center_y"]) ** 2
+        if label not in best or distance < best[label][0]:
+            best[label] = (distance, texts[index]["normalized_text"])
+
+    for label, (_, name) in best.items():
+        by_label[label]["name"] = name
+    return rooms
@@ -0,0 +1,207 @@
+import math
+import numpy as np
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+    def groups(self):
+        grouped = {}
+        for i in range(len(self.parent)):
+            grouped.setdefault(self.find(i), []).append(i)
+        return list(grouped.values())
+
+# Narrowest line-offset bucket in pixels; buckets are never narrower than
+# the offset tolerance either
+OFFSET_BUCKET = 64.0
+
+def _bucket_pairs(segments, theta, angle_tolerance, offset_tolerance, gap_tolerance):
+    """
+    Buckets segments by (undirected angle, line offset) and returns (i, j)
+    index pairs, i < j, for every pair in the same or an adjacent angle
+    bucket whose offsets are close enough for _mergeable to accept it.
+    Buckets at the angle wrap-around (close to 0 and close to pi) are
+    adjacent to each other; across it a segment's offset changes sign.
+    """
+    # Buckets at least as wide as the tolerance, so neighbours cover it
+    n_angles = max(int(math.pi / angle_tolerance), 1)
+    width = math.pi / n_angles
+    a = np.minimum((theta / width).astype(np.int64), n_angles - 1)
+
+    # Offset of each segment's own line, about the middle of the drawing
+    mid = (segments[:, 0:2] + segments[:, 2:4]) / 2.0
+    mid = mid - (mid.min(axis=0) + mid.max(axis=0)) / 2.0
+    rho = -mid[:, 0] * np.sin(theta) + mid[:, 1] * np.cos(theta)
+
+    # Offsets of two mergeable segments differ by at most the offset
+    # tolerance plus the angle between them times the distance between
+    # their midpoints (up to the longest segment plus the gap) and the
+    # midpoints' distance from the origin
+    vec = segments[:, 2:4] - segments[:, 0:2]
+    longest = float(np.hypot(vec[:, 0], vec[:, 1]).max())
+    radius = float(np.hypot(mid[:, 0], mid[:, 1]).max())
+    reach = offset_tolerance + angle_tolerance * (longest + gap_tolerance + radius) + 1.0
+    bucket = max(OFFSET_BUCKET, offset_tolerance)
+    o = np.floor(rho / bucket).astype(np.int64)
+
+    queries = []
+    for da in (-1, 0, 1):
+        wrapped = (a + da < 0) | (a + da >= n_angles)
+        qrho = np.where(wrapped, -rho, rho)
+        queries.append((np.mod(a + da, n_angles),
+                        np.floor((qrho - reach) / bucket).astype(np.int64),
+                        np.floor((qrho + reach) / bucket).astype(np.int64)))
+
+    o_min = min(o.min(), min(q[1].min() for q in queries))
+    o_span = max(o.max(), max(q[2].max() for q in queries)) - o_min + 1
+    keys = a * o_span + (o - o_min)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    index = np.arange(len(theta))
+
+    pairs_i = []
+    pairs_j = []
+    for qa, first, last in queries:
+        # Offsets within one angle bucket are contiguous keys
+        lo = np.searchsorted(sorted_keys, qa * o_span + (first - o_min), side='left')
+        hi = np.searchsorted(sorted_keys, qa * o_span + (last - o_min), side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        owners = np.repeat(index, counts)
+        starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+        pairs_i.append(owners)
+        pairs_j.append(order[starts + np.arange(total)])
+
+    if not pairs_i:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    pi, pj = np.concatenate(pairs_i), np.concatenate(pairs_j)
+    later = pi < pj
+    pi, pj = pi[later], pj[later]
+    if n_angles < 3:
+        # The neighbouring angle buckets are the same bucket twice
+        pairs = np.unique(np.stack([pi, pj], axis=1), axis=0)
+        pi, pj = pairs[:, 0], pairs[:, 1]
+    return pi, pj
+
+def _mergeable(segments, theta, pi, pj, angle_tolerance, offset_tolerance, gap_tolerance):
+    d = np.abs(theta[pi] - theta[pj])
+    d = np.minimum(d, np.pi - d)
+    ok = d < angle_tolerance
+    pi, pj = pi[ok], pj[ok]
+
+    p1 = segments[:, 0:2]
+    vec = segments[:, 2:4] - p1
+    length = np.hypot(vec[:, 0], vec[:, 1])
+    direction = vec / np.maximum(length, 1e-9)[:, None]
+    normal = np.stack([-direction[:, 1], direction[:, 0]], axis=1)
+
+    # Test the shorter segment of each pair against the longer one's line,
+    # so a small angle difference is not amplified over a long wall
+    swap = length[pi] < length[pj]
+    base = np.where(swap, pj, pi)
+    other = np.where(swap, pi, pj)
+
+    rel1 = segments[other, 0:2] - p1[base]
+    rel2 = segments[other, 2:4] - p1[base]
+    perp = np.maximum(np.abs((rel1 * normal[base]).sum(axis=1)),
+                      np.abs((rel2 * normal[base]).sum(axis=1)))
+    t1 = (rel1 * direction[base]).sum(axis=1)
+    t2 = (rel2 * direction[base]).sum(axis=1)
+    gap = np.maximum(np.maximum(np.minimum(t1, t2) - length[base], -np.maximum(t1, t2)), 0.0)
+
+    ok = (perp < offset_tolerance) & (gap <= gap_tolerance)
+    return pi[ok], pj[ok]
+
+def _merge_group(objects, segments, members):
+    group = segments[members]
+    vec = group[:, 2:4] - group[:, 0:2]
+    length = np.hypot(vec[:, 0], vec[:, 1])
+    base = members[int(np.argmax(length))]
+
+    # Length-weighted mean direction, with every piece flipped to agree
+    # with the longest one
+    ref = segments[base, 2:4] - segments[base, 0:2]
+    signs = np.where((vec @ ref) < 0, -1.0, 1.0)
+    direction = (vec * signs[:, None]).sum(axis=0)
+    norm = np.hypot(*direction)
+    direction = direction / norm if norm > 0 else ref / max(np.hypot(*ref), 1e-9)
+
+    points = np.concatenate([group[:, 0:2], group[:, 2:4]])
+    weights = np.concatenate([length, length]) + 1e-9
+    centroid = (points * weights[:, None]).sum(axis=0) / weights.sum()
+    t = (points - centroid) @ direction
+
+    start = centroid + t.min() * direction
+    end = centroid + t.max() * direction
+    x1, y1 = int(round(start[0])), int(round(start[1]))
+    x2, y2 = int(round(end[0])), int(round(end[1]))
+
+    merged = dict(objects[base])
+    merged.update({
+        "x1": x1, "y1": y1,
+        "x2": x2, "y2": y2,
+        "x": min(x1, x2), "y": min(y1, y2),
+        "width": abs(x2 - x1), "height": abs(y2 - y1),
+        "angle": math.atan2(y2 - y1, x2 - x1),
+        "length": math.hypot(x2 - x1, y2 - y1),
+        "confidence": max(objects[m].get("confidence") or 0 for m in members)
+    })
+    return merged
+
+def merge_collinear_segments(objects, angle_tolerance_deg=2.0, offset_tolerance=6.0, gap_tolerance=12.0):
+    """
+    Joins collinear segments that overlap or nearly touch into maximal wall
+    segments.
+
+    Segments are bucketed by undirected angle and line offset so only pairs
+    in neighbouring buckets are tested; pairs that are parallel within
+    `angle_tolerance_deg`, lie within `offset_tolerance` pixels of each
+    other's line and leave a gap of at most `gap_tolerance` pixels are
+    joined with union-find. Each group becomes one segment spanning the
+    extreme projections of its members.
+
+    Returns (merged_objects, stats). Raises ValueError for a non-positive
+    angle tolerance.
+    """
+    if not angle_tolerance_deg > 0:
+        raise ValueError(f"angle_tolerance_deg must be positive, got {angle_tolerance_deg}")
+    stats = {"input_segments": len(objects), "output_segments": len(objects), "merged_groups": 0}
+    if len(objects) < 2:
+        return list(objects), stats
+
+    segments = np.array([(o["x1"], o["y1"], o["x2"], o["y2"]) for o in objects], dtype=np.float64)
+    vec = segments[:, 2:4] - segments[:, 0:2]
+    theta = np.mod(np.arctan2(vec[:, 1], vec[:, 0]), np.pi)
+    angle_tolerance = math.radians(angle_tolerance_deg)
+
+    pi, pj = _bucket_pairs(segments, theta, angle_tolerance, offset_tolerance, gap_tolerance)
+    pi, pj = _mergeable(segments, theta, pi, pj, angle_tolerance, offset_tolerance, gap_tolerance)
+
+    uf = UnionFind(len(objects))
+    for i, j in zip(pi.tolist(), pj.tolist()):
+        uf.union(i, j)
+
+    merged = []
+    for members in sorted(uf.groups(), key=lambda g: g[0]):
+        if len(members) == 1:
+            merged.append(objects[members[0]])
+        else:
+            merged.append(_merge_group(objects, segments, members))
+            stats["merged_groups"] += 1
+
+    stats["output_segments"] = len(merged)
+    return merged, stats
@@ -0,0 +1,160 @@
+import math
+import numpy as np
+
+def point_segment_distance(points, segments):
+    """Row-wise distance from (N, 2) points to (N, 4) segments."""
+    start = segments[:, 0:2]
+    delta = segments[:, 2:4] - start
+    length_sq = (delta ** 2).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(length_sq > 0, ((points - start) * delta).sum(axis=1) / length_sq, 0.0)
+    closest = start + np.clip(t, 0.0, 1.0)[:, None] * delta
+    return np.sqrt(((points - closest) ** 2).sum(axis=1))
+
+class SegmentGrid:
+    """
+    Uniform grid over line segments for nearest-segment and box queries.
+
+    Every segment is registered in the cells it passes through, so
+    building is linear in total segment length / `cell_size` and a query
+    only inspects the segments in the cells around it. Cell membership is
+    stored as sorted cell keys with a parallel array of segment indices,
+    and all queries run in batch.
+    """
+
+    def __init__(self, segments, cell_size=64.0):
+        self.segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        self.cell_size = float(cell_size)
+
+        n = len(self.segments)
+        if n == 0:
+            self._keys = np.empty(0, dtype=np.int64)
+            self._members = np.empty(0, dtype=np.int64)
+            self._origin = np.zeros(2, dtype=np.int64)
+            self._span = 1
+            return
+
+        # Sample each segment every half cell so no crossed cell is skipped
+        # except corner clips, which the one-ring query margin covers
+        start = self.segments[:, 0:2]
+        delta = self.segments[:, 2:4] - start
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        samples = np.ceil(length / (self.cell_size / 2)).astype(np.int64) + 1
+        owner = np.repeat(np.arange(n), samples)
+        step = np.arange(len(owner)) - np.repeat(np.cumsum(samples) - samples, samples)
+        t = step / np.maximum(np.repeat(samples - 1, samples), 1)
+        points = start[owner] + t[:, None] * delta[owner]
+
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        all_cells = np.floor(self.segments.reshape(-1, 2) / self.cell_size).astype(np.int64)
+        # Leave room for query rings around the occupied area; cells further
+        # out wrap onto other keys, which only adds candidates that the
+        # distance check rejects
+        self._origin = all_cells.min(axis=0) - 64
+        self._span = int(all_cells[:, 1].max() - self._origin[1]) + 128
+        keys = self._key(cells)
+
+        pairs = np.unique(keys * n + owner)
+        self._keys = pairs // n
+        self._members = pairs % n
+
+    def __len__(self):
+        return len(self.segments)
+
+    def _key(self, cells):
+        shifted = cells - self._origin
+        return shifted[..., 0] * self._span + shifted[..., 1]
+
+    def _candidates(self, cells, radius):
+        """(query index, segment index) pairs for all cells within `radius` rings."""
+        pairs_q = []
+        pairs_s = []
+        queries = np.arange(len(cells))
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                keys = self._key(cells + np.array([dx, dy]))
+                lo = np.searchsorted(self._keys, keys, side='left')
+                hi = np.searchsorted(self._keys, keys, side='right')
+                counts = hi - lo
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+                pairs_q.append(np.repeat(queries, counts))
+                pairs_s.append(self._members[starts + np.arange(total)])
+
+        if not pairs_q:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(pairs_q), np.concatenate(pairs_s)
+
+    def nearest(self, points, max_distance):
+        """
+        Nearest segment to each of the (N, 2) points within `max_distance`.
+        Returns (indices, distances) with index -1 and distance inf where no
+        segment is close enough.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        indices = np.full(len(points), -1, dtype=np.int64)
+        distances = np.full(len(points), np.inf)
+        if not len(points) or not len(self.segments):
+            return indices, distances
+
+        radius = int(math.ceil(max_distance / self.cell_size)) + 1
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        pq, ps = self._candidates(cells, radius)
+        if not len(pq):
+            return indices, distances
+
+        # A long segment sits in several cells; measure each pair once
+        n = len(self.segments)
+        pairs = np.unique(pq * n + ps)
+        pq, ps = pairs // n, pairs % n
+        d = point_segment_distance(points[pq], self.segments[ps])
+        close = d <= max_distance
+        pq, ps, d = pq[close], ps[close], d[close]
+
+        # Closest per query; ties go to the lower segment index
+        order = np.lexsort((ps, d, pq))
+        pq, ps, d = pq[order], ps[order], d[order]
+        first = np.concatenate(([True], pq[1:] != pq[:-1])) if len(pq) else np.empty(0, dtype=bool)
+        indices[pq[first]] = ps[first]
+        distances[pq[first]] = d[first]
+        return indices, distances
+
+    def query_box(self, box):
+        """Indices of segments registered in the cells overlapping box (x0, y0, x1, y1)."""
+        if not len(self.segments):
+            return np.empty(0, dtype=np.int64)
+        x0, y0, x1, y1 = box
+        low = np.floor(np.array([x0, y0]) / self.cell_size).astype(np.int64) - 1
+        high = np.floor(np.array([x1, y1]) / self.cell_size).astype(np.int64) + 1
+        gx, gy = np.meshgrid(np.arange(low[0], high[0] + 1), np.arange(low[1], high[1] + 1), indexing='ij')
+        keys = self._key(np.stack([gx.ravel(), gy.ravel()], axis=1))
+        lo = np.searchsorted(self._keys, keys, side='left')
+        hi = np.searchsorted(self._keys, keys, side='right')
+        found = [self._members[a:b] for a, b in zip(lo.tolist(), hi.tolist()) if b > a]
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+def wall_orientation(angle):
+    """Classifies a wall angle in radians as HORIZONTAL, VERTICAL or DIAGONAL."""
+    folded = math.degrees(angle) % 180.0
+    if folded < 10.0 or folded > 170.0:
+        return "HORIZONTAL"
+    if 80.0 < folded < 100.0:
+        return "VERTICAL"
+    return "DIAGONAL"
+
+def assign_openings(wall_segments, centers, max_distance=64.0, cell_size=64.0):
+    """
+    Assigns each door or window centre to its nearest wall segment within
+    `max_distance`. Returns (wall indices, orientations) with index -1 and
+    orientation None for openings that are not near any wall.
+    """
+    grid = SegmentGrid(wall_segments, cell_size=cell_size)
+    indices, _ = grid.nearest(centers, max_distance)
+
+    segments = grid.segments
+    angles = np.arctan2(segments[:, 3] - segments[:, 1], segments[:, 2] - segments[:, 0])
+    orientations = [wall_orientation(angles[i]) if i >= 0 else None for i in indices.tolist()]
+    return indices, orientations
@@ -0,0 +1,222 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from backend.cv.preprocessing import preprocess_gray
+from backend.cv.contour_detector import detect_contours
+from backend.cv.line_detector import detect_lines, filter_duplicate_segments
+from backend.cv.segment_merger import UnionFind
+
+# Segments closer than this to an interior tile edge are treated as cut by
+# the seam. Covers the Canny neighbourhood around the tile border.
+EDGE_MARGIN = 8
+
+def preprocess_reach(blur_kernel=(5, 5), block_size=11, kernel_size=5):
+    """
+    How far, in pixels, a preprocess_gray output pixel depends on its
+    input: the blur, the adaptive threshold's block and the two passes of
+    the closing kernel.
+    """
+    return max(blur_kernel) // 2 + block_size // 2 + 2 * (kernel_size // 2)
+
+def min_overlap(**params):
+    """
+    Smallest tile overlap for preprocess_gray(**params): tile cores then
+    match a full-page pass and the seam margins lie inside the overlap.
+    """
+    return preprocess_reach(**params) + EDGE_MARGIN
+
+def tile_grid(width, height, tile_size, overlap):
+    """
+    Splits the page into tile_size cores, each grown by `overlap` pixels on
+    every side and clipped to the image. Returns (core, window) pairs of
+    (x0, y0, x1, y1) boxes.
+    """
+    tiles = []
+    for cy in range(0, height, tile_size):
+        for cx in range(0, width, tile_size):
+            core = (cx, cy, min(cx + tile_size, width), min(cy + tile_size, height))
+            window = (
+                max(cx - overlap, 0), max(cy - overlap, 0),
+                min(cx + tile_size + overlap, width), min(cy + tile_size + overlap, height)
+            )
+            tiles.append((core, window))
+    return tiles
+
+def _interior(window, width, height):
+    # Region of a tile where detections are unaffected by its seams
+    x0, y0, x1, y1 = window
+    return (
+        x0 + EDGE_MARGIN if x0 > 0 else 0,
+        y0 + EDGE_MARGIN if y0 > 0 else 0,
+        x1 - EDGE_MARGIN if x1 < width else width,
+        y1 - EDGE_MARGIN if y1 < height else height
+    )
+
+def _box(obj):
+    return (obj["x"], obj["y"], obj["x"] + obj["width"], obj["y"] + obj["height"])
+
+def _inside(box, region):
+    return box[0] >= region[0] and box[1] >= region[1] and box[2] <= region[2] and box[3] <= region[3]
+
+def _touches(box, region):
+    return box[0] <= region[2] and box[2] >= region[0] and box[1] <= region[3] and box[3] >= region[1]
+
+def _preprocess_tile(gray, blurred, morphed, core, window, params):
+    # Every op in preprocess_gray is local, so the core of a tile grown by
+    # at least preprocess_reach is pixel-identical to the same area of a
+    # full-page pass
+    x0, y0, x1, y1 = window
+    tile_blurred, tile_morphed = preprocess_gray(gray[y0:y1, x0:x1], **params)
+    cx0, cy0, cx1, cy1 = core
+    blurred[cy0:cy1, cx0:cx1] = tile_blurred[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+    morphed[cy0:cy1, cx0:cx1] = tile_morphed[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+
+def _detect_window_lines(blurred, window):
+    x0, y0, x1, y1 = window
+    objects = detect_lines(blurred[y0:y1, x0:x1])
+
+    for obj in objects:
+        obj["x"] += x0
+        obj["y"] += y0
+        obj["x1"] += x0
+        obj["x2"] += x0
+        obj["y1"] += y0
+        obj["y2"] += y0
+    return objects
+
+def _same_segment_object(a, b, tolerance=4.0):
+    pa1, pa2 = np.array([a["x1"], a["y1"]], float), np.array([a["x2"], a["y2"]], float)
+    pb1, pb2 = np.array([b["x1"], b["y1"]], float), np.array([b["x2"], b["y2"]], float)
+    va, vb = pa2 - pa1, pb2 - pb1
+    la, lb = np.hypot(*va), np.hypot(*vb)
+    if la == 0 or lb == 0:
+        return False
+    if abs(va[0] * vb[1] - va[1] * vb[0]) / (la * lb) >= 0.05:
+        return False
+
+    direction = va / la
+    normal = np.array([-direction[1], direction[0]])
+    if abs(np.dot(pb1 - pa1, normal)) > tolerance or abs(np.dot(pb2 - pa1, normal)) > tolerance:
+        return False
+
+    tb = sorted((np.dot(pb1 - pa1, direction), np.dot(pb2 - pa1, direction)))
+    return tb[0] <= la + tolerance and tb[1] >= -tolerance
+
+def _merge_segments(members):
+    base = max(members, key=lambda m: m["length"])
+    origin = np.array([base["x1"], base["y1"]], float)
+    direction = np.array([base["x2"] - base["x1"], base["y2"] - base["y1"]], float) / base["length"]
+
+    points = []
+    for m in members:
+        points.append((m["x1"], m["y1"]))
+        points.append((m["x2"], m["y2"]))
+    projections = [np.dot(np.array(p, float) - origin, direction) for p in points]
+    (x1, y1) = points[int(np.argmin(projections))]
+    (x2, y2) = points[int(np.argmax(projections))]
+
+    merged = dict(base)
+    merged.update({
+        "x1": x1, "y1": y1, "x2": x2, "y2": y2,
+        "x": min(x1, x2), "y": min(y1, y2),
+        "width": abs(x2 - x1), "height": abs(y2 - y1),
+        "angle": float(np.arctan2(y2 - y1, x2 - x1)),
+        "length": float(np.hypot(x2 - x1, y2 - y1))
+    })
+    return merged
+
+def stitch_segments(tile_results, windows, width, height):
+    """
+    Combines per-tile line detections (already in page coordinates) into a
+    single list. Segments away from the seams are de-duplicated; segments
+    cut by a seam are dropped when another tile saw the same area in full,
+    and otherwise joined with collinear counterparts from neighbouring tiles.
+    """
+    interiors = [_interior(w, width, height) for w in windows]
+
+    complete = []
+    cut = []
+    for tile, objects in enumerate(tile_results):
+        for obj in objects:
+            box = _box(obj)
+            if _inside(box, interiors[tile]):
+                complete.append(obj)
+            elif not any(_inside(box, interiors[other]) for other in range(len(windows)) if other != tile):
+                cut.append((tile, obj))
+
+    # Join seam-cut pieces across neighbouring tiles
+    by_tile = {}
+    for index, (tile, _) in enumerate(cut):
+        by_tile.setdefault(tile, []).append(index)
+
+    uf = UnionFind(len(cut))
+    tiles = sorted(by_tile)
+    for pos, ti in enumerate(tiles):
+        for tj in tiles[pos + 1:]:
+            wa, wb = windows[ti], windows[tj]
+            shared = (max(wa[0], wb[0]), max(wa[1], wb[1]), min(wa[2], wb[2]), min(wa[3], wb[3]))
+            if shared[0] >= shared[2] or shared[1] >= shared[3]:
+                continue
+            left = [i for i in by_tile[ti] if _touches(_box(cut[i][1]), shared)]
+            right = [j for j in by_tile[tj] if _touches(_box(cut[j][1]), shared)]
+            for i in left:
+                for j in right:
+                    if _same_segment_object(cut[i][1], cut[j][1]):
+                        uf.union(i, j)
+
+    stitched = [_merge_segments([cut[i][1] for i in group]) for group in uf.groups()]
+
+    objects = complete + stitched
+    if not objects:
+        return objects
+    segments = [(o["x1"], o["y1"], o["x2"], o["y2"]) for o in objects]
+    keep = filter_duplicate_segments(segments)
+    return [o for o, k in zip(objects, keep) if k]
+
+def _pool_size(workers, tiles):
+    return min(workers or os.cpu_count() or 1, len(tiles))
+
+def preprocess_tiled(gray, tile_size=2048, overlap=64, workers=0, **params):
+    """
+    Runs preprocess_gray per overlapping tile in a thread pool (OpenCV
+    releases the GIL) and assembles the tile cores into full-page blurred
+    and morphed arrays identical to a single-pass run. `overlap` is raised
+    to min_overlap(**params) when smaller.
+    """
+    overlap = max(overlap, min_overlap(**params))
+    height, width = gray.shape[:2]
+    tiles = tile_grid(width, height, tile_size, overlap)
+    blurred = np.empty_like(gray)
+    morphed = np.empty_like(gray)
+
+    with ThreadPoolExecutor(max_workers=_pool_size(workers, tiles)) as pool:
+        list(pool.map(lambda t: _preprocess_tile(gray, blurred, morphed, t[0], t[1], params), tiles))
+
+    return blurred, morphed
+
+def detect_lines_tiled(blurred, tile_size=2048, overlap=64, workers=0, **params):
+    """
+    Runs Canny/Hough per overlapping tile of the blurred page in a thread
+    pool and stitches the segments back together. `params` are those
+    `blurred` was preprocessed with; the tiles are the same as
+    preprocess_tiled's.
+    """
+    overlap = max(overlap, min_overlap(**params))
+    height, width = blurred.shape[:2]
+    windows = [window for _, window in tile_grid(width, height, tile_size, overlap)]
+
+    with ThreadPoolExecutor(max_workers=_pool_size(workers, windows)) as pool:
+        tile_results = list(pool.map(lambda w: _detect_window_lines(blurred, w), windows))
+
+    return stitch_segments(tile_results, windows, width, height)
+
+def detect_tiled(gray, mode, tile_size=2048, overlap=64, workers=0, **params):
+    """
+    Tiled equivalent of preprocess_gray followed by detection. Contour mode
+    traces the assembled page mask, so outlines spanning several tiles stay
+    closed; line mode runs Hough per tile and stitches the segments.
+    """
+    blurred, morphed = preprocess_tiled(gray, tile_size, overlap, workers, **params)
+    if mode == "contour":
+        return detect_contours(morphed)
+    return detect_lines_tiled(blurred, tile_size, overlap, workers, **params)
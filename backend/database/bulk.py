@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from sqlalchemy import inspect
+from backend.extensions import db
+
+# Below this many rows the COPY set-up costs more than it saves
+COPY_MIN_ROWS = 2000
+
+def _with_defaults(model, rows):
+    """Fills Python-side column defaults (e.g. created_at) that COPY would not apply."""
+    mapper = inspect(model)
+    defaults = []
+    for attr in mapper.column_attrs:
+        column = attr.columns[0]
+        default = column.default
+        if default is None or column.primary_key:
+            continue
+        if default.is_callable:
+            defaults.append((attr.key, default.arg(None)))
+        elif default.is_scalar:
+            defaults.append((attr.key, default.arg))
+    if not defaults:
+        return rows
+    return [{**dict(defaults), **row} for row in rows]
+
+def _copy(model, rows):
+    """Streams `rows` into the model's table with PostgreSQL COPY."""
+    mapper = inspect(model)
+    keys = [key for key in rows[0]]
+    columns = [mapper.column_attrs[key].columns[0] for key in keys]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        values = []
+        for key, column in zip(keys, columns):
+            value = row.get(key)
+            if value is None:
+                value = "\\N"
+            elif isinstance(column.type, db.JSON):
+                value = json.dumps(value)
+            values.append(value)
+        writer.writerow(values)
+    buffer.seek(0)
+
+    column_list = ", ".join(f'"{column.name}"' for column in columns)
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f'COPY "{mapper.local_table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')',
+            buffer
+        )
+    finally:
+        cursor.close()
+
+def _allocate_ids(model, count):
+    """Reserves `count` primary keys from the table's sequence in one round trip."""
+    table = inspect(model).local_table
+    result = db.session.execute(
+        db.text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+        {"table": table.name, "count": count}
+    )
+    return [row[0] for row in result]
+
+def _insert(model):
+    # Send None as NULL instead of splitting the batch by which keys are None
+    return db.insert(model).execution_options(render_nulls=True)
+
+def _sqlite_ids(model, count):
+    """
+    Ids of the last `count` rows inserted in this transaction. SQLite gives
+    each new row max(rowid) + 1 and the transaction holds the write lock,
+    so a batch gets a consecutive range.
+    """
+    table = inspect(model).local_table
+    last = db.session.execute(db.select(db.func.max(table.c.id))).scalar()
+    return list(range(last - count + 1, last + 1))
+
+def bulk_insert(model, rows, return_ids=False):
+    """
+    Inserts a list of attribute dicts into `model`'s table in bulk and
+    returns their primary keys in input order when `return_ids` is set.
+    All rows must have the same keys. Does not commit.
+
+    On PostgreSQL ids are reserved from the sequence in one query and the
+    rows are streamed with COPY (COPY_MIN_ROWS rows or more) or sent as
+    multi-row INSERTs. On SQLite the rows go through one executemany and
+    the ids are read back as a range. Other databases use batched
+    INSERT ... RETURNING.
+    """
+    if not rows:
+        return [] if return_ids else None
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        ids = None
+        if return_ids:
+            ids = _allocate_ids(model, len(rows))
+            rows = [{**row, "id": row_id} for row, row_id in zip(rows, ids)]
+        if len(rows) >= COPY_MIN_ROWS:
+            _copy(model, _with_defaults(model, rows))
+        else:
+            db.session.execute(_insert(model), rows)
+        return ids
+
+    if return_ids and dialect != "sqlite":
+        statement = _insert(model).returning(inspect(model).primary_key[0], sort_by_parameter_order=True)
+        return list(db.session.scalars(statement, rows))
+
+    db.session.execute(_insert(model), rows)
+    return _sqlite_ids(model, len(rows)) if return_ids else None
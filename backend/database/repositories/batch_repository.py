@@ -0,0 +1,30 @@
+from backend.models.batch import Batch
+from backend.models.processing_job import ProcessingJob
+from backend.models.project import Project
+from backend.extensions import db
+
+class BatchRepository:
+    @staticmethod
+    def create(config, generate_config=None):
+        batch = Batch(config=config, generate_config=generate_config)
+        db.session.add(batch)
+        db.session.commit()
+        return batch
+
+    @staticmethod
+    def get(batch_id):
+        return db.session.get(Batch, batch_id)
+
+    @staticmethod
+    def get_by_public_id(public_id):
+        return Batch.query.filter_by(public_id=public_id).first()
+
+    @staticmethod
+    def get_items(batch_id):
+        """(project public id, project name, job) rows of a batch in job order, in one query."""
+        return db.session.execute(
+            db.select(Project.public_id, Project.name, ProcessingJob)
+            .join(Project, ProcessingJob.project_id == Project.id)
+            .where(ProcessingJob.batch_id == batch_id)
+            .order_by(ProcessingJob.id)
+        ).all()
@@ -3,7 +3,7 @@ from backend.extensions import db
 
 class BlueprintRepository:
     @staticmethod
-    def create(project_id, file_data):
+    def create(project_id, file_data, previous=None):
         blueprint = Blueprint(
             project_id=project_id,
             original_filename=file_data['original_filename'],
@@ -12,12 +12,15 @@ class BlueprintRepository:
             mime_type=file_data['mime_type'],
             file_size=file_data['file_size'],
             image_width=file_data['image_width'],
-            image_height=file_data['image_height']
+            image_height=file_data['image_height'],
+            revision=previous.revision + 1 if previous else 1,
+            previous_blueprint_id=previous.id if previous else None
         )
         db.session.add(blueprint)
         db.session.commit()
         return blueprint
 
     @staticmethod
-    def get_by_project_id(project_id):
-        return Blueprint.query.filter_by(project_id=project_id).first()
+    def latest(project_id):
+        """The project's current blueprint revision, or None."""
+        return Blueprint.query.filter_by(project_id=project_id).order_by(Blueprint.id.desc()).first()
@@ -0,0 +1,63 @@
+import numpy as np
+from backend.models.detection_geometry import DetectionGeometry
+from backend.utils.geometry_blob import FORMAT_VERSION, pack, unpack, to_dicts
+from backend.extensions import db
+
+class GeometryRepository:
+    @staticmethod
+    def save(project_id, objects, commit=True):
+        """Replaces the project's geometry blob with `objects` (detection dicts)."""
+        geometry = DetectionGeometry.query.filter_by(project_id=project_id).first()
+        if geometry is None:
+            geometry = DetectionGeometry(project_id=project_id)
+            db.session.add(geometry)
+        geometry.format_version = FORMAT_VERSION
+        geometry.object_count = len(objects)
+        geometry.data = pack(objects)
+        if commit:
+            db.session.commit()
+        return len(objects)
+
+    @staticmethod
+    def load(project_id):
+        """The project's geometry as a read-only structured array, or None."""
+        geometry = DetectionGeometry.query.filter_by(project_id=project_id).first()
+        if geometry is None or geometry.format_version != FORMAT_VERSION:
+            return None
+        return unpack(geometry.data)
+
+    @staticmethod
+    def delete(project_id, commit=True):
+        DetectionGeometry.query.filter_by(project_id=project_id).delete()
+        if commit:
+            db.session.commit()
+
+    @staticmethod
+    def materialize(project_id, indices):
+        """
+        Turns the blob objects at `indices` into DetectedObject/Wall/Door
+        rows, e.g. before a user edits them, and marks them as moved out of
+        the blob. Returns the new DetectedObject ids.
+        """
+        from backend.database.repositories.object_repository import ObjectRepository
+
+        array = GeometryRepository.load(project_id)
+        if array is None or not len(indices):
+            return []
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        if indices.min() < 0 or indices.max() >= len(array) or np.isnan(array["type"][indices]).any():
+            raise ValueError("Geometry index out of range or already materialized")
+
+        objects = [
+            {key: value for key, value in record.items() if key != "id" and value is not None}
+            for record in to_dicts(array, indices)
+        ]
+        ids = ObjectRepository.save_detected_objects(project_id, objects)
+
+        # Keep the records in place so the other blob ids stay stable
+        updated = array.copy()
+        updated["type"][indices] = np.nan
+        geometry = DetectionGeometry.query.filter_by(project_id=project_id).first()
+        geometry.data = updated.tobytes()
+        db.session.commit()
+        return ids
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from backend.models.idempotency_key import IdempotencyKey
+from backend.extensions import db
+
+class IdempotencyRepository:
+    @staticmethod
+    def begin(key, endpoint, fingerprint, ttl_hours, lock_timeout):
+        """
+        Claims `key` for a request to `endpoint`. Returns (record, True) when
+        this request is the first, or (record, False) with the record of the
+        earlier request. Records older than `ttl_hours` are dropped first. A
+        key left in progress for `lock_timeout` seconds (its request died
+        without releasing it) is taken over by a request with the same payload.
+        """
+        now = datetime.utcnow()
+        IdempotencyKey.query.filter(IdempotencyKey.created_at < now - timedelta(hours=ttl_hours)).delete(
+            synchronize_session=False
+        )
+        record = IdempotencyKey(key=key, endpoint=endpoint, fingerprint=fingerprint, locked_at=now)
+        db.session.add(record)
+        try:
+            db.session.commit()
+            return record, True
+        except IntegrityError:
+            db.session.rollback()
+
+        record = IdempotencyKey.query.filter_by(key=key, endpoint=endpoint).first()
+        if record is None or record.status_code is not None or record.fingerprint != fingerprint:
+            return record, False
+        # Conditional, so only one of several concurrent retries takes it over
+        taken = IdempotencyKey.query.filter(
+            IdempotencyKey.id == record.id,
+            IdempotencyKey.status_code.is_(None),
+            IdempotencyKey.locked_at < now - timedelta(seconds=lock_timeout)
+        ).update({"locked_at": now}, synchronize_session=False)
+        db.session.commit()
+        db.session.refresh(record)
+        return record, taken == 1
+
+    @staticmethod
+    def complete(record_id, status_code, body, location=None):
+        record = db.session.get(IdempotencyKey, record_id)
+        if record is not None:
+            record.status_code = status_code
+            record.body = body
+            record.location = location
+            db.session.commit()
+
+    @staticmethod
+    def discard(record_id):
+        """Frees the key so that a retry runs the request again."""
+        db.session.rollback()
+        IdempotencyKey.query.filter_by(id=record_id).delete(synchronize_session=False)
+        db.session.commit()
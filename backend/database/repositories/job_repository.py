@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.models.processing_job import ProcessingJob
+from backend.extensions import db
+
+class JobRepository:
+    @staticmethod
+    def create(project_id, job_type, config, batch_id=None, dedup_key=None, max_attempts=2):
+        """
+        Queues a job. With `dedup_key`, an identical job that is still in
+        flight is returned instead, as (job, False); a new one as (job, True).
+        An identical job whose worker died is recovered first (see
+        recover_expired), so requests never attach to a dead job.
+        """
+        # Retried when the in-flight job finishes between the two statements
+        for _ in range(3):
+            job = ProcessingJob(project_id=project_id, job_type=job_type, status='PENDING', config=config,
+                                progress=0, batch_id=batch_id, dedup_key=dedup_key)
+            db.session.add(job)
+            try:
+                db.session.commit()
+                return job, True
+            except IntegrityError:
+                db.session.rollback()
+            running = ProcessingJob.query.filter_by(dedup_key=dedup_key).first()
+            if running is not None:
+                running = JobRepository.check_lease(running, max_attempts)
+                # Unless it failed for good, which freed the key
+                if running.dedup_key == dedup_key:
+                    return running, False
+        raise RuntimeError(f"Could not queue {job_type} job for project {project_id}")
+
+    @staticmethod
+    def get_scoped(public_id, job_id):
+        """
+        The job of the project with `public_id`, loaded with the project in
+        one query. Returns None when either does not exist.
+        """
+        scoped = ProjectRepository.get_scoped(public_id, ProcessingJob, ProcessingJob.id == job_id)
+        return scoped[1][0] if scoped and scoped[1] else None
+
+    @staticmethod
+    def get_state(job_id, max_attempts=None):
+        """
+        (status, progress, stage, message) of a job, read in a transaction of
+        its own. With `max_attempts`, a RUNNING job whose lease expired is
+        recovered first (see recover_expired), so pollers see it move on.
+        """
+        row = db.session.execute(
+            db.select(ProcessingJob.status, ProcessingJob.progress, ProcessingJob.stage, ProcessingJob.message,
+                      ProcessingJob.lease_expires_at)
+            .where(ProcessingJob.id == job_id)
+        ).one_or_none()
+        # Do not hold a snapshot open between polls
+        db.session.rollback()
+        if row is None:
+            return None
+        if max_attempts is not None and JobRepository._expired(row.status, row.lease_expires_at):
+            JobRepository.recover_expired(max_attempts, job_id=job_id)
+            return JobRepository.get_state(job_id)
+        return tuple(row)[:4]
+
+    @staticmethod
+    def check_lease(job, max_attempts):
+        """Recovers `job` when it is RUNNING on an expired lease; returns the job as it is now."""
+        if JobRepository._expired(job.status, job.lease_expires_at):
+            JobRepository.recover_expired(max_attempts, job_id=job.id)
+            db.session.refresh(job)
+        return job
+
+    @staticmethod
+    def _expired(status, lease_expires_at):
+        return status == 'RUNNING' and lease_expires_at is not None and lease_expires_at < datetime.utcnow()
+
+    @staticmethod
+    def update_progress(job_id, progress, stage):
+        """
+        Writes a running job's progress on a connection of its own, so it is
+        visible right away without committing the job's unit of work.
+        """
+        with db.engine.begin() as connection:
+            connection.execute(
+                db.update(ProcessingJob)
+                .where(ProcessingJob.id == job_id, ProcessingJob.status == 'RUNNING')
+                .values(progress=progress, stage=stage)
+            )
+
+    @staticmethod
+    def renew_lease(job_id, attempt, lease_seconds):
+        """
+        Extends the lease of a running job by `lease_seconds`, on a
+        connection of its own. Returns False when the job is no longer run
+        by this `attempt` (it finished, or was recovered after all).
+        """
+        now = datetime.utcnow()
+        with db.engine.begin() as connection:
+            return connection.execute(
+                db.update(ProcessingJob)
+                .where(ProcessingJob.id == job_id, ProcessingJob.status == 'RUNNING',
+                       ProcessingJob.attempts == attempt)
+                .values(heartbeat_at=now, lease_expires_at=now + timedelta(seconds=lease_seconds))
+            ).rowcount == 1
+
+    @staticmethod
+    def recover_expired(max_attempts, job_id=None):
+        """
+        Handles RUNNING jobs whose lease expired, i.e. whose worker was
+        killed: they are queued again, or marked FAILED once they were
+        claimed `max_attempts` times. Returns the number of jobs recovered.
+        Any process may call this; the conditional UPDATEs move each job once.
+        """
+        now = datetime.utcnow()
+        expired = [ProcessingJob.status == 'RUNNING', ProcessingJob.lease_expires_at < now]
+        if job_id is not None:
+            expired.append(ProcessingJob.id == job_id)
+        requeued = db.session.execute(
+            db.update(ProcessingJob)
+            .where(*expired, ProcessingJob.attempts < max_attempts)
+            .values(status='PENDING', progress=0, stage=None, heartbeat_at=None, lease_expires_at=None,
+                    message="Queued again after its worker stopped")
+        ).rowcount
+        failed = db.session.execute(
+            db.update(ProcessingJob)
+            .where(*expired)
+            .values(status='FAILED', stage=None, dedup_key=None, lease_expires_at=None, completed_at=now,
+                    message="Job failed",
+                    error_details=f"The worker running the job stopped on each of {max_attempts} attempts")
+        ).rowcount
+        db.session.commit()
+        return requeued + failed
+
+    @staticmethod
+    def claim_next(lease_seconds=60, max_attempts=2):
+        """
+        Marks the oldest PENDING job RUNNING with a lease of `lease_seconds`
+        and returns it, or None when the queue is empty. Jobs of dead
+        workers are recovered first. The conditional UPDATE makes the claim
+        atomic, so several worker threads or processes can poll the same table.
+        """
+        JobRepository.recover_expired(max_attempts)
+        while True:
+            job_id = db.session.execute(
+                db.select(ProcessingJob.id).where(ProcessingJob.status == 'PENDING').order_by(ProcessingJob.id).limit(1)
+            ).scalar()
+            if job_id is None:
+                db.session.commit()
+                return None
+            now = datetime.utcnow()
+            claimed = db.session.execute(
+                db.update(ProcessingJob)
+                .where(ProcessingJob.id == job_id, ProcessingJob.status == 'PENDING')
+                .values(status='RUNNING', started_at=now, attempts=ProcessingJob.attempts + 1,
+                        heartbeat_at=now, lease_expires_at=now + timedelta(seconds=lease_seconds))
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.get(ProcessingJob, job_id)
+
+    @staticmethod
+    def finish(job, status, result=None, message=None, error_details=None, metrics=None):
+        """
+        Records the outcome of the claim `job` came from. A job recovered
+        from this claim meanwhile (its lease expired) is left as it is.
+        """
+        completed_at = datetime.utcnow()
+        values = dict(status=status, result=result, metrics=metrics, message=message, error_details=error_details,
+                      completed_at=completed_at, stage=None, dedup_key=None, lease_expires_at=None)
+        if status == 'COMPLETED':
+            values["progress"] = 100
+        if job.started_at:
+            values["processing_time_ms"] = int((completed_at - job.started_at).total_seconds() * 1000)
+        db.session.execute(
+            db.update(ProcessingJob)
+            .where(ProcessingJob.id == job.id, ProcessingJob.status == 'RUNNING',
+                   ProcessingJob.attempts == job.attempts)
+            .values(**values)
+        )
+        db.session.commit()
+        return job
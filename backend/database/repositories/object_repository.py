@@ -3,57 +3,111 @@ from backend.models.wall import Wall
 from backend.models.door import Door
 from backend.models.window import Window
 from backend.models.room import Room
+from backend.database.bulk import bulk_insert
 from backend.extensions import db
 
 class ObjectRepository:
     @staticmethod
-    def save_detected_objects(project_id, objects_data):
-        saved_objects = []
-        for obj_data in objects_data:
-            obj = DetectedObject(
-                project_id=project_id,
-                object_type=obj_data.get('object_type', 'UNKNOWN'),
-                x=obj_data.get('x'),
-                y=obj_data.get('y'),
-                width=obj_data.get('width'),
-                height=obj_data.get('height'),
-                x1=obj_data.get('x1'),
-                y1=obj_data.get('y1'),
-                x2=obj_data.get('x2'),
-                y2=obj_data.get('y2'),
-                angle=obj_data.get('angle'),
-                confidence=obj_data.get('confidence')
-            )
-            db.session.add(obj)
-            saved_objects.append((obj, obj_data))
-        
-        db.session.flush() # To get the generated IDs
-        
-        # Save specific types
-        for obj, obj_data in saved_objects:
-            if obj.object_type == 'WALL':
-                wall = Wall(
-                    project_id=project_id,
-                    detected_object_id=obj.id,
-                    start_x=obj_data.get('x1', obj_data.get('x', 0)),
-                    start_y=obj_data.get('y1', obj_data.get('y', 0)),
-                    end_x=obj_data.get('x2', obj_data.get('x', 0) + obj_data.get('width', 0)),
-                    end_y=obj_data.get('y2', obj_data.get('y', 0) + obj_data.get('height', 0)),
-                    thickness=obj_data.get('thickness', 10),
-                    confidence=obj.confidence
-                )
-                db.session.add(wall)
-            elif obj.object_type == 'DOOR':
-                door = Door(
-                    project_id=project_id,
-                    detected_object_id=obj.id,
-                    center_x=obj_data.get('x', 0) + obj_data.get('width', 0)/2,
-                    center_y=obj_data.get('y', 0) + obj_data.get('height', 0)/2,
-                    width=obj_data.get('width', 0),
-                    height=obj_data.get('height', 0),
-                    confidence=obj.confidence
-                )
-                db.session.add(door)
-                
-        db.session.commit()
-        return [obj[0] for obj in saved_objects]
+    def save_detected_objects(project_id, objects_data, commit=True):
+        """
+        Stores detections and the Wall/Door rows built from them with bulk
+        inserts and returns the new DetectedObject ids in input order.
+        With commit=False the rows join the caller's transaction.
+        """
+        ids = bulk_insert(DetectedObject, [
+            {
+                "project_id": project_id,
+                "object_type": obj_data.get('object_type', 'UNKNOWN'),
+                "x": obj_data.get('x'),
+                "y": obj_data.get('y'),
+                "width": obj_data.get('width'),
+                "height": obj_data.get('height'),
+                "x1": obj_data.get('x1'),
+                "y1": obj_data.get('y1'),
+                "x2": obj_data.get('x2'),
+                "y2": obj_data.get('y2'),
+                "angle": obj_data.get('angle'),
+                "confidence": obj_data.get('confidence')
+            }
+            for obj_data in objects_data
+        ], return_ids=True)
+
+        # Save specific types, linked through the returned ids
+        walls = []
+        doors = []
+        for object_id, obj_data in zip(ids, objects_data):
+            object_type = obj_data.get('object_type', 'UNKNOWN')
+            if object_type == 'WALL':
+                walls.append({
+                    "project_id": project_id,
+                    "detected_object_id": object_id,
+                    "start_x": obj_data.get('x1', obj_data.get('x', 0)),
+                    "start_y": obj_data.get('y1', obj_data.get('y', 0)),
+                    "end_x": obj_data.get('x2', obj_data.get('x', 0) + obj_data.get('width', 0)),
+                    "end_y": obj_data.get('y2', obj_data.get('y', 0) + obj_data.get('height', 0)),
+                    "thickness": obj_data.get('thickness', 10),
+                    "confidence": obj_data.get('confidence')
+                })
+            elif object_type == 'DOOR':
+                doors.append({
+                    "project_id": project_id,
+                    "detected_object_id": object_id,
+                    "center_x": obj_data.get('x', 0) + obj_data.get('width', 0)/2,
+                    "center_y": obj_data.get('y', 0) + obj_data.get('height', 0)/2,
+                    "width": obj_data.get('width', 0),
+                    "height": obj_data.get('height', 0),
+                    "confidence": obj_data.get('confidence')
+                })
+
+        bulk_insert(Wall, walls)
+        bulk_insert(Door, doors)
+        if commit:
+            db.session.commit()
+        return ids
+
+    @staticmethod
+    def get_walls(project_id):
+        return Wall.query.filter_by(project_id=project_id).order_by(Wall.id).all()
+
+    @staticmethod
+    def get_openings(project_id):
+        doors = Door.query.filter_by(project_id=project_id).order_by(Door.id).all()
+        windows = Window.query.filter_by(project_id=project_id).order_by(Window.id).all()
+        return doors, windows
+
+    @staticmethod
+    def update_geometry(walls, doors, windows, commit=True):
+        """Bulk-updates orientation and parent walls from lists of {"id": ..., ...} rows."""
+        for model, rows in ((Wall, walls), (Door, doors), (Window, windows)):
+            if rows:
+                db.session.execute(db.update(model), rows)
+        if commit:
+            db.session.commit()
+
+    @staticmethod
+    def get_by_project(project_id):
+        return DetectedObject.query.filter_by(project_id=project_id).all()
+
+    @staticmethod
+    def delete_by_project(project_id):
+        """
+        Removes all of a project's detections and the rows built from them.
+        Does not commit, so a following save swaps the runs atomically.
+        """
+        for model in (Window, Door, Wall, DetectedObject):
+            model.query.filter(model.project_id == project_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def delete_objects(project_id, object_ids, commit=True):
+        """Removes detections and the wall, door and window rows built from them."""
+        if not object_ids:
+            return
+        for model in (Wall, Door, Window):
+            model.query.filter(
+                model.project_id == project_id, model.detected_object_id.in_(object_ids)
+            ).delete()
+        DetectedObject.query.filter(
+            DetectedObject.project_id == project_id, DetectedObject.id.in_(object_ids)
+        ).delete()
+        if commit:
+            db.session.commit()
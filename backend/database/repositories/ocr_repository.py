@@ -0,0 +1,35 @@
+from backend.models.ocr_text import OCRText
+from backend.database.bulk import bulk_insert
+from backend.extensions import db
+
+class OCRRepository:
+    @staticmethod
+    def create_many(project_id, records, commit=True):
+        """Bulk-inserts OCR records (dicts of OCRText columns) for a project."""
+        bulk_insert(OCRText, [{"project_id": project_id, **record} for record in records])
+        if commit:
+            db.session.commit()
+        return records
+
+    @staticmethod
+    def get_by_project(project_id):
+        return OCRText.query.filter_by(project_id=project_id).all()
+
+    @staticmethod
+    def get_room_names(project_id):
+        return OCRText.query.filter_by(project_id=project_id, text_type='ROOM_NAME').all()
+
+    @staticmethod
+    def delete_by_project(project_id):
+        """Removes all of a project's OCR records. Does not commit (see create_many)."""
+        OCRText.query.filter(OCRText.project_id == project_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def delete_records(project_id, record_ids, commit=True):
+        if not record_ids:
+            return
+        OCRText.query.filter(
+            OCRText.project_id == project_id, OCRText.id.in_(record_ids)
+        ).delete()
+        if commit:
+            db.session.commit()
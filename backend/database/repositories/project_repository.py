@@ -1,6 +1,10 @@
+import itertools
 from backend.models.project import Project
 from backend.extensions import db
 
+# Rows fetched per round trip when streaming
+STREAM_BATCH_SIZE = 1000
+
 class ProjectRepository:
     @staticmethod
     def create(name, description=None):
@@ -13,6 +17,49 @@ class ProjectRepository:
     def get_by_public_id(public_id):
         return Project.query.filter_by(public_id=public_id).first()
 
+    @staticmethod
+    def get_scoped(public_id, model, *criteria, columns=None, after=None, limit=None, stream=False):
+        """
+        Resolves a public project id and loads the project's `model` rows
+        (matching `criteria`, in id order) in one query. Returns
+        (project_id, rows), or None when the project does not exist.
+
+        With `columns` (attribute names) the rows are dicts of the id and
+        those columns instead of model instances. `after` and `limit` select a
+        keyset page (ids greater than `after`). With `stream` the rows are
+        an iterator fed from a server-side cursor in batches, so memory
+        does not grow with the number of rows.
+        """
+        entities = [model] if columns is None else [model.id] + [getattr(model, name) for name in columns]
+        conditions = [model.project_id == Project.id, *criteria]
+        if after is not None:
+            conditions.append(model.id > after)
+        statement = (
+            db.select(Project.id, *entities)
+            .outerjoin(model, db.and_(*conditions))
+            .where(Project.public_id == public_id)
+            .order_by(model.id)
+        )
+        if limit is not None:
+            statement = statement.limit(limit)
+        if stream:
+            statement = statement.execution_options(yield_per=STREAM_BATCH_SIZE)
+
+        result = iter(db.session.execute(statement))
+        first = next(result, None)
+        if first is None:
+            return None
+        if first[1] is None:
+            # The project exists but has no matching rows
+            return first[0], iter(()) if stream else []
+
+        if columns is None:
+            rows = (row[1] for row in itertools.chain([first], result))
+        else:
+            keys = ["id"] + list(columns)
+            rows = (dict(zip(keys, row[1:])) for row in itertools.chain([first], result))
+        return first[0], rows if stream else list(rows)
+
     @staticmethod
     def list_projects(page=1, page_size=20):
         pagination = Project.query.order_by(Project.created_at.desc()).paginate(page=page, per_page=page_size, error_out=False)
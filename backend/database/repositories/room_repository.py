@@ -0,0 +1,29 @@
+from backend.models.room import Room
+from backend.extensions import db
+
+class RoomRepository:
+    @staticmethod
+    def replace_rooms(project_id, rooms, commit=True):
+        """Swaps the project's rooms for `rooms` with one bulk insert."""
+        Room.query.filter_by(project_id=project_id).delete()
+        if rooms:
+            db.session.execute(db.insert(Room), [
+                {
+                    "project_id": project_id,
+                    "name": room.get("name"),
+                    "polygon": room["polygon"],
+                    "center_x": room["center_x"],
+                    "center_y": room["center_y"],
+                    "area_pixels": room["area_pixels"],
+                    "width": room["width"],
+                    "length": room["length"],
+                    "confidence": room.get("confidence")
+                }
+                for room in rooms
+            ])
+        if commit:
+            db.session.commit()
+
+    @staticmethod
+    def get_by_project(project_id):
+        return Room.query.filter_by(project_id=project_id).order_by(Room.id).all()
@@ -1,5 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from backend.utils.image_cache import DecodedImageCache
+from backend.cv.preprocess_cache import PreprocessCache
+from backend.ocr.engine_pool import EnginePool
+from backend.ocr.room_vocabulary import RoomVocabulary
+from backend.utils.stage_executor import StageExecutor
+from backend.utils.job_runner import JobRunner
 
 db = SQLAlchemy()
 migrate = Migrate()
+image_cache = DecodedImageCache()
+preprocess_cache = PreprocessCache()
+ocr_pool = EnginePool()
+room_vocabulary = RoomVocabulary()
+stage_executor = StageExecutor()
+job_runner = JobRunner()
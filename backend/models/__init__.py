@@ -1,2 +1,13 @@
 from backend.models.project import Project
 from backend.models.blueprint import Blueprint
+from backend.models.detected_object import DetectedObject
+from backend.models.wall import Wall
+from backend.models.door import Door
+from backend.models.window import Window
+from backend.models.room import Room
+from backend.models.ocr_text import OCRText
+from backend.models.processing_job import ProcessingJob
+from backend.models.exported_model import ExportedModel
+from backend.models.detection_geometry import DetectionGeometry
+from backend.models.batch import Batch
+from backend.models.idempotency_key import IdempotencyKey
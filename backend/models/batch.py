@@ -0,0 +1,14 @@
+import uuid
+from datetime import datetime
+from backend.extensions import db
+
+class Batch(db.Model):
+    """A group of projects uploaded and processed together; its jobs carry batch_id."""
+    __tablename__ = 'batches'
+
+    id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
+    config = db.Column(db.JSON, nullable=True)
+    # When set, each item is generated with this config after it was processed
+    generate_config = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
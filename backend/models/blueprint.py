@@ -5,7 +5,7 @@ class Blueprint(db.Model):
     __tablename__ = 'blueprints'
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
     original_filename = db.Column(db.String(255), nullable=False)
     stored_filename = db.Column(db.String(255), nullable=False)
     file_path = db.Column(db.String(512), nullable=False)
@@ -14,8 +14,13 @@ class Blueprint(db.Model):
     image_width = db.Column(db.Integer, nullable=True)
     image_height = db.Column(db.Integer, nullable=True)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Each upload to a project is a new revision of the same sheet
+    revision = db.Column(db.Integer, nullable=False, default=1)
+    previous_blueprint_id = db.Column(db.Integer, db.ForeignKey('blueprints.id', ondelete='SET NULL'), nullable=True)
+    detection_mode = db.Column(db.String(20), nullable=True) # Set once the revision has been processed
 
-    project = db.relationship('Project', back_populates='blueprint')
+    project = db.relationship('Project', back_populates='blueprints')
+    previous_blueprint = db.relationship('Blueprint', remote_side=[id])
 
     def to_dict(self):
         return {
@@ -24,5 +29,6 @@ class Blueprint(db.Model):
             "file_size": self.file_size,
             "image_width": self.image_width,
             "image_height": self.image_height,
+            "revision": self.revision,
             "uploaded_at": self.uploaded_at.isoformat() if self.uploaded_at else None
         }
@@ -3,6 +3,12 @@ from backend.extensions import db
 
 class DetectedObject(db.Model):
     __tablename__ = 'detected_objects'
+    __table_args__ = (
+        # Project-scoped reads, optionally narrowed by type
+        db.Index('ix_detected_objects_project_id_object_type', 'project_id', 'object_type'),
+        # Keyset pagination (WHERE project_id = ? AND id > ? ORDER BY id)
+        db.Index('ix_detected_objects_project_id_id', 'project_id', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
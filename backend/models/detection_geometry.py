@@ -0,0 +1,16 @@
+from datetime import datetime
+from backend.extensions import db
+
+class DetectionGeometry(db.Model):
+    """The latest detection run of a project as one packed float32 array (see utils.geometry_blob)."""
+    __tablename__ = 'detection_geometry'
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, unique=True)
+    format_version = db.Column(db.Integer, nullable=False)
+    object_count = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    project = db.relationship('Project', backref=db.backref('detection_geometry', lazy=True, uselist=False,
+                                                            cascade="all, delete-orphan"))
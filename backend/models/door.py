@@ -4,14 +4,14 @@ class Door(db.Model):
     __tablename__ = 'doors'
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
-    detected_object_id = db.Column(db.Integer, db.ForeignKey('detected_objects.id', ondelete='CASCADE'), nullable=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+    detected_object_id = db.Column(db.Integer, db.ForeignKey('detected_objects.id', ondelete='CASCADE'), nullable=True, index=True)
     center_x = db.Column(db.Float, nullable=False)
     center_y = db.Column(db.Float, nullable=False)
     width = db.Column(db.Float, nullable=False)
     height = db.Column(db.Float, nullable=False)
     orientation = db.Column(db.String(50), nullable=True)
-    parent_wall_id = db.Column(db.Integer, db.ForeignKey('walls.id', ondelete='SET NULL'), nullable=True)
+    parent_wall_id = db.Column(db.Integer, db.ForeignKey('walls.id', ondelete='SET NULL'), nullable=True, index=True)
     confidence = db.Column(db.Float, nullable=True)
 
     project = db.relationship('Project', backref=db.backref('doors', lazy=True, cascade="all, delete-orphan"))
@@ -24,5 +24,7 @@ class Door(db.Model):
             "center_x": self.center_x,
             "center_y": self.center_y,
             "width": self.width,
-            "height": self.height
+            "height": self.height,
+            "orientation": self.orientation,
+            "parent_wall_id": self.parent_wall_id
         }
@@ -5,7 +5,7 @@ class ExportedModel(db.Model):
     __tablename__ = 'exported_models'
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
     format = db.Column(db.String(10), nullable=False)
     file_path = db.Column(db.String(512), nullable=False)
     file_size = db.Column(db.Integer, nullable=False)
@@ -0,0 +1,22 @@
+from datetime import datetime
+from backend.extensions import db
+
+class IdempotencyKey(db.Model):
+    """The stored outcome of a POST sent with an Idempotency-Key header."""
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (db.UniqueConstraint('key', 'endpoint', name='uq_idempotency_keys_key_endpoint'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(255), nullable=False)
+    # "POST /api/v1/projects/<id>/process"; a key is scoped to one endpoint
+    endpoint = db.Column(db.String(500), nullable=False)
+    # sha256 of the request payload; a reused key with another payload is rejected
+    fingerprint = db.Column(db.String(64), nullable=False)
+    # NULL while the first request is still running
+    status_code = db.Column(db.Integer, nullable=True)
+    body = db.Column(db.Text, nullable=True)
+    location = db.Column(db.String(500), nullable=True)
+    # When the request holding the key started; a retry takes over a key
+    # still in progress after IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+    locked_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
@@ -2,6 +2,12 @@ from backend.extensions import db
 
 class OCRText(db.Model):
     __tablename__ = 'ocr_texts'
+    __table_args__ = (
+        # Project-scoped reads, optionally narrowed by type
+        db.Index('ix_ocr_texts_project_id_text_type', 'project_id', 'text_type'),
+        # Keyset pagination (WHERE project_id = ? AND id > ? ORDER BY id)
+        db.Index('ix_ocr_texts_project_id_id', 'project_id', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
@@ -5,10 +5,27 @@ class ProcessingJob(db.Model):
     __tablename__ = 'processing_jobs'
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+    batch_id = db.Column(db.Integer, db.ForeignKey('batches.id', ondelete='SET NULL'), nullable=True, index=True)
     job_type = db.Column(db.String(100), nullable=False) # IMAGE_PREPROCESSING, CONTOUR_DETECTION, etc.
-    status = db.Column(db.String(50), nullable=False, default='PENDING')
-    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # PENDING -> RUNNING -> COMPLETED | FAILED; PENDING jobs are the work queue
+    status = db.Column(db.String(50), nullable=False, default='PENDING', index=True)
+    config = db.Column(db.JSON, nullable=True)
+    # "<project_id>:<job_type>:<config hash>" while PENDING or RUNNING, NULL
+    # once finished; the unique constraint lets one identical job be in flight
+    dedup_key = db.Column(db.String(100), nullable=True, unique=True)
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    # Stages running right now, e.g. "detect,ocr"
+    stage = db.Column(db.String(100), nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    # The worker running the job renews its lease every few seconds; a
+    # RUNNING job whose lease expired lost its worker and is re-queued
+    # (or failed after JOB_MAX_ATTEMPTS claims) by whoever notices first
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True, index=True)
     completed_at = db.Column(db.DateTime, nullable=True)
     processing_time_ms = db.Column(db.Integer, nullable=True)
     message = db.Column(db.Text, nullable=True)
@@ -16,3 +33,23 @@ class ProcessingJob(db.Model):
     metrics = db.Column(db.JSON, nullable=True)
 
     project = db.relationship('Project', backref=db.backref('processing_jobs', lazy=True, cascade="all, delete-orphan"))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "progress": self.progress,
+            "stage": self.stage,
+            "config": self.config,
+            "result": self.result,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "attempts": self.attempts,
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "processing_time_ms": self.processing_time_ms,
+            "message": self.message,
+            "error_details": self.error_details,
+            "metrics": self.metrics
+        }
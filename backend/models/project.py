@@ -13,7 +13,10 @@ class Project(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    blueprint = db.relationship('Blueprint', back_populates='project', uselist=False, cascade='all, delete-orphan')
+    # Every revision of the project's blueprint, oldest first; the current
+    # one is BlueprintRepository.latest()
+    blueprints = db.relationship('Blueprint', back_populates='project', order_by='Blueprint.id',
+                                 cascade='all, delete-orphan')
 
     def to_dict(self):
         return {
@@ -4,7 +4,7 @@ class Room(db.Model):
     __tablename__ = 'rooms'
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
     name = db.Column(db.String(255), nullable=True)
     polygon = db.Column(db.JSON, nullable=True)
     center_x = db.Column(db.Float, nullable=True)
@@ -16,3 +16,17 @@ class Room(db.Model):
     confidence = db.Column(db.Float, nullable=True)
 
     project = db.relationship('Project', backref=db.backref('project_rooms', lazy=True, cascade="all, delete-orphan"))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "polygon": self.polygon,
+            "center_x": self.center_x,
+            "center_y": self.center_y,
+            "area_pixels": self.area_pixels,
+            "estimated_area": self.estimated_area,
+            "width": self.width,
+            "length": self.length,
+            "confidence": self.confidence
+        }
@@ -4,8 +4,8 @@ class Wall(db.Model):
     __tablename__ = 'walls'
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
-    detected_object_id = db.Column(db.Integer, db.ForeignKey('detected_objects.id', ondelete='CASCADE'), nullable=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+    detected_object_id = db.Column(db.Integer, db.ForeignKey('detected_objects.id', ondelete='CASCADE'), nullable=True, index=True)
     start_x = db.Column(db.Float, nullable=False)
     start_y = db.Column(db.Float, nullable=False)
     end_x = db.Column(db.Float, nullable=False)
@@ -28,5 +28,6 @@ class Wall(db.Model):
             "end_x": self.end_x,
             "end_y": self.end_y,
             "thickness": self.thickness,
-            "height": self.height
+            "height": self.height,
+            "orientation": self.orientation
         }
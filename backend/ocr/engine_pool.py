@@ -0,0 +1,200 @@
+import ctypes
+import ctypes.util
+import os
+import queue
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+# Tesseract's default page segmentation mode (fully automatic)
+PSM_AUTO = 3
+
+def parse_tsv(tsv, min_confidence=30):
+    """
+    Converts Tesseract TSV output into word dicts in image coordinates,
+    keeping non-empty words above `min_confidence`.
+    """
+    words = []
+    for line in tsv.splitlines():
+        fields = line.split('\t')
+        if len(fields) < 12 or fields[0] == 'level':
+            continue
+        text = fields[11].strip()
+        try:
+            confidence = float(fields[10])
+        except ValueError:
+            continue
+        if text and confidence > min_confidence: # Filter out low confidence and empty text
+            words.append({
+                "text": text,
+                "x": int(fields[6]),
+                "y": int(fields[7]),
+                "width": int(fields[8]),
+                "height": int(fields[9]),
+                "confidence": confidence / 100.0
+            })
+    return words
+
+class CAPIEngine:
+    """
+    One long-lived Tesseract instance driven through libtesseract's C API.
+
+    The language model is loaded once in the constructor; every call then
+    hands the grayscale buffer over directly, with no temp file and no
+    process spawn. A single instance is not thread-safe, which is what the
+    pool is for. ctypes releases the GIL during recognition, so instances
+    in different threads run in parallel.
+    """
+
+    _lib = None
+    _lib_lock = threading.Lock()
+
+    @classmethod
+    def library(cls, path=None):
+        with cls._lib_lock:
+            if cls._lib is None:
+                path = path or ctypes.util.find_library('tesseract')
+                if not path:
+                    raise OSError("libtesseract not found")
+                lib = ctypes.CDLL(path)
+                lib.TessBaseAPICreate.restype = ctypes.c_void_p
+                lib.TessBaseAPIInit3.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+                lib.TessBaseAPIInit3.restype = ctypes.c_int
+                lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+                lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int,
+                                                    ctypes.c_int, ctypes.c_int, ctypes.c_int]
+                lib.TessBaseAPIGetTsvText.argtypes = [ctypes.c_void_p, ctypes.c_int]
+                lib.TessBaseAPIGetTsvText.restype = ctypes.POINTER(ctypes.c_char)
+                lib.TessDeleteText.argtypes = [ctypes.POINTER(ctypes.c_char)]
+                lib.TessBaseAPIClear.argtypes = [ctypes.c_void_p]
+                lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+                lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+                cls._lib = lib
+            return cls._lib
+
+    def __init__(self, language='eng', datapath=None, library_path=None):
+        self.lib = CAPIEngine.library(library_path)
+        self.handle = self.lib.TessBaseAPICreate()
+        datapath = datapath.encode() if datapath else None
+        if self.lib.TessBaseAPIInit3(self.handle, datapath, language.encode()) != 0:
+            self.lib.TessBaseAPIDelete(self.handle)
+            raise RuntimeError(f"Could not initialise Tesseract for language '{language}'")
+
+    def image_to_tsv(self, gray, psm=PSM_AUTO):
+        gray = np.ascontiguousarray(gray, dtype=np.uint8)
+        height, width = gray.shape[:2]
+        self.lib.TessBaseAPISetPageSegMode(self.handle, psm)
+        self.lib.TessBaseAPISetImage(self.handle, gray.ctypes.data, width, height, 1, gray.strides[0])
+        text = self.lib.TessBaseAPIGetTsvText(self.handle, 0)
+        try:
+            return ctypes.string_at(text).decode('utf-8', 'replace') if text else ""
+        finally:
+            if text:
+                self.lib.TessDeleteText(text)
+            self.lib.TessBaseAPIClear(self.handle)
+
+    def close(self):
+        if self.handle:
+            self.lib.TessBaseAPIEnd(self.handle)
+            self.lib.TessBaseAPIDelete(self.handle)
+            self.handle = None
+
+class SubprocessEngine:
+    """
+    Fallback through pytesseract, which runs the tesseract binary once per
+    call. Used when libtesseract cannot be loaded.
+    """
+
+    def __init__(self, language='eng', tesseract_cmd=None):
+        import pytesseract
+        self.pytesseract = pytesseract
+        self.language = language
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def image_to_tsv(self, gray, psm=PSM_AUTO):
+        return self.pytesseract.image_to_data(gray, lang=self.language, config=f"--psm {psm}")
+
+    def close(self):
+        pass
+
+class EnginePool:
+    """
+    Per-process pool of long-lived OCR engines.
+
+    Engines are created lazily on first use, so each gunicorn worker (or
+    forked child) builds its own after the fork, up to OCR_POOL_SIZE. A
+    caller checks an engine out for one image and returns it; callers
+    beyond the pool size wait for a free engine.
+    """
+
+    def __init__(self, size=2, language='eng', datapath=None, library_path=None, tesseract_cmd=None):
+        self.configure(size, language, datapath, library_path, tesseract_cmd)
+
+    def configure(self, size=2, language='eng', datapath=None, library_path=None, tesseract_cmd=None):
+        self.size = max(int(size), 1)
+        self.language = language
+        self.datapath = datapath or None
+        self.library_path = library_path or None
+        self.tesseract_cmd = tesseract_cmd or None
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def init_app(self, app):
+        self.close()
+        self.configure(
+            size=app.config.get('OCR_POOL_SIZE', 2),
+            language=app.config.get('OCR_LANGUAGE', 'eng'),
+            datapath=app.config.get('OCR_TESSDATA_PATH'),
+            library_path=app.config.get('TESSERACT_LIBRARY'),
+            tesseract_cmd=app.config.get('TESSERACT_CMD')
+        )
+
+    def _create(self):
+        try:
+            return CAPIEngine(self.language, self.datapath, self.library_path)
+        except (OSError, AttributeError):
+            return SubprocessEngine(self.language, self.tesseract_cmd)
+
+    @contextmanager
+    def engine(self):
+        if os.getpid() != self._pid:
+            # Forked after engines were created; they belong to the parent
+            self.configure(self.size, self.language, self.datapath, self.library_path, self.tesseract_cmd)
+
+        try:
+            engine = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    engine = self._create()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                engine = self._idle.get()
+
+        try:
+            yield engine
+        finally:
+            self._idle.put(engine)
+
+    def image_to_data(self, gray, psm=PSM_AUTO, min_confidence=30):
+        with self.engine() as engine:
+            tsv = engine.image_to_tsv(gray, psm)
+        return parse_tsv(tsv, min_confidence)
+
+    def close(self):
+        while True:
+            try:
+                engine = self._idle.get_nowait()
+            except (queue.Empty, AttributeError):
+                break
+            engine.close()
@@ -1,22 +1,64 @@
 from backend.ocr.tesseract_engine import TesseractEngine
+from backend.ocr.text_regions import PSM_SPARSE_TEXT
 from backend.ocr.dimension_parser import DimensionParser
 from backend.ocr.room_name_parser import RoomNameParser
-from backend.models.ocr_text import OCRText
-from backend.extensions import db
+from backend.database.repositories.ocr_repository import OCRRepository
+from backend.cv.incremental import detect_in_windows
+from backend.cv.detection_pipeline import DetectionPipeline
+from backend.utils.image_cache import load_gray
 
 class OCRPipeline:
     @staticmethod
-    def process(project_id, image_path, app_config):
+    def _extract(image, app_config, page=False, binary=None):
+        if not app_config.get('OCR_REGION_PROPOSALS', True):
+            return TesseractEngine.extract_text(image)
+
+        if page and binary is None:
+            # No mask from the caller: threshold the page the way detection does
+            binary = DetectionPipeline.preprocess(load_gray(image), app_config)[1]
+        return TesseractEngine.extract_regions(
+            image,
+            binary=binary,
+            target_height=app_config.get('OCR_TEXT_HEIGHT', 32),
+            psm=app_config.get('OCR_REGION_PSM', PSM_SPARSE_TEXT)
+        )
+
+    @staticmethod
+    def recognize(image, app_config, windows=None, regions=None, binary=None):
+        """
+        Reads the text of the page, or only of `windows` of a revised page
+        keeping the text that touches the changed `regions`. `binary` is the
+        page's wall mask when the caller already has it. Does not touch the
+        database, so it can run off the request thread.
+        """
         TesseractEngine.setup(app_config.get('TESSERACT_CMD'))
         
-        raw_texts = TesseractEngine.extract_text(image_path)
-        
+        if windows is None:
+            return OCRPipeline._extract(image, app_config, page=True, binary=binary)
+        extract = lambda crop: OCRPipeline._extract(crop, app_config)
+        return detect_in_windows(image, windows, regions, extract, band=None)
+
+    @staticmethod
+    def process(project_id, image, app_config, windows=None, regions=None):
+        """Runs OCR over the page (or `windows` of it) and stores the text."""
+        raw_texts = OCRPipeline.recognize(image, app_config, windows, regions)
+        return OCRPipeline.save(project_id, raw_texts)
+
+    @staticmethod
+    def save(project_id, raw_texts):
+        """Classifies recognized words as dimensions or room names and stores them."""
+        return OCRRepository.create_many(project_id, OCRPipeline.classify(raw_texts))
+
+    @staticmethod
+    def classify(raw_texts):
+        """OCRText records for recognized words, typed as dimensions, room names or unknown."""
+        rooms = RoomNameParser.parse_many([item['text'] for item in raw_texts])
+
         ocr_results = []
-        for item in raw_texts:
+        for item, parsed_room in zip(raw_texts, rooms):
             text = item['text']
             
             parsed_dim = DimensionParser.parse(text)
-            parsed_room = RoomNameParser.parse(text)
             
             text_type = 'UNKNOWN'
             parsed_value = None
@@ -30,20 +72,16 @@ class OCRPipeline:
                 parsed_value = parsed_room
                 normalized = parsed_room['normalized']
             
-            ocr_text = OCRText(
-                project_id=project_id,
-                text=text,
-                normalized_text=normalized,
-                text_type=text_type,
-                x=item['x'],
-                y=item['y'],
-                width=item['width'],
-                height=item['height'],
-                confidence=item['confidence'],
-                parsed_value=parsed_value
-            )
-            db.session.add(ocr_text)
-            ocr_results.append(ocr_text)
-            
-        db.session.commit()
+            ocr_results.append({
+                "text": text,
+                "normalized_text": normalized,
+                "text_type": text_type,
+                "x": item['x'],
+                "y": item['y'],
+                "width": item['width'],
+                "height": item['height'],
+                "confidence": item['confidence'],
+                "parsed_value": parsed_value
+            })
+
         return ocr_results
@@ -1,3 +1,14 @@
+# The app's RoomVocabulary, bound on first use: backend.extensions builds it
+# while importing this module's KNOWN_ROOMS
+_vocabulary = None
+
+def vocabulary():
+    global _vocabulary
+    if _vocabulary is None:
+        from backend.extensions import room_vocabulary
+        _vocabulary = room_vocabulary
+    return _vocabulary
+
 class RoomNameParser:
     KNOWN_ROOMS = [
         "bedroom", "master bedroom", "kitchen", "living room", "hall", 
@@ -7,13 +18,27 @@ class RoomNameParser:
 
     @staticmethod
     def parse(text):
-        normalized = text.lower().strip()
-        
-        # Simple fuzzy matching or direct inclusion check
-        for room in RoomNameParser.KNOWN_ROOMS:
-            if room in normalized:
-                return {
-                    "raw": text,
-                    "normalized": room
-                }
-        return None
+        """
+        Returns the longest known room name in `text`, tolerating small OCR
+        misreads, or None.
+        """
+        room = vocabulary().match(text)
+        if room is None:
+            return None
+        return {
+            "raw": text,
+            "normalized": room
+        }
+
+    @staticmethod
+    def parse_many(texts):
+        """Classifies all tokens of a page; repeated tokens are matched once."""
+        room_vocabulary = vocabulary()
+        rooms = {}
+        results = []
+        for text in texts:
+            if text not in rooms:
+                rooms[text] = room_vocabulary.match(text)
+            room = rooms[text]
+            results.append({"raw": text, "normalized": room} if room is not None else None)
+        return results
@@ -0,0 +1,184 @@
+import re
+import threading
+
+WORD = re.compile(r"[^\W\d_]+")
+
+# Tokens and fuzzy terms remembered per vocabulary; drawings repeat most of
+# their labels, dimensions and grid references
+CACHE_SIZE = 4096
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions) between `a` and `b`, or max_distance + 1 once it is
+    certain to exceed `max_distance`.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        before, previous = previous, current
+    return previous[-1]
+
+def deletes(term, distance):
+    """All strings obtained by removing up to `distance` characters from `term`."""
+    variants = {term}
+    level = {term}
+    for _ in range(distance):
+        level = {t[:i] + t[i + 1:] for t in level if len(t) > 1 for i in range(len(t))}
+        variants |= level
+    return variants
+
+def load_names(path):
+    """
+    Reads one room name per line; `alias = canonical` maps a localized or
+    abbreviated name to the name it is reported as. Blank lines and lines
+    starting with # are skipped.
+    """
+    names = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            alias, _, canonical = line.partition("=")
+            names[alias.strip()] = canonical.strip() or alias.strip()
+    return names
+
+class RoomVocabulary:
+    """
+    Room names compiled for per-token lookups that do not grow with the
+    vocabulary.
+
+    Tokens are split into letter-only words and every run of up to
+    `max_words` consecutive words is looked up in a dict; the longest hit
+    wins, so "master bedroom" beats "bedroom". When nothing matches
+    exactly, a symmetric-delete (SymSpell) index finds names within one
+    edit (tokens of 5-7 letters) or two edits (8 or more), which covers
+    typical OCR misreads such as "KITCHFN" or "MASTERBEDROOM".
+    """
+
+    def __init__(self, names=None, max_distance=2):
+        self._lock = threading.Lock()
+        self.configure(names, max_distance)
+
+    def configure(self, names=None, max_distance=2):
+        """`names` is a list of names or a dict of alias -> canonical name."""
+        if names is None:
+            from backend.ocr.room_name_parser import RoomNameParser
+            names = RoomNameParser.KNOWN_ROOMS
+        if not isinstance(names, dict):
+            names = {name: name for name in names}
+
+        exact = {}
+        for alias, canonical in names.items():
+            key = self.normalize(alias)
+            if key:
+                exact[key] = canonical.lower().strip()
+
+        index = {}
+        for key in exact:
+            for variant in deletes(key, max_distance):
+                index.setdefault(variant, []).append(key)
+
+        with self._lock:
+            self.max_distance = max_distance
+            self.exact = exact
+            self.index = index
+            self.max_words = max((key.count(" ") + 1 for key in exact), default=1)
+            self._cache = {}
+            self._fuzzy_cache = {}
+
+    def init_app(self, app):
+        names = {}
+        path = app.config.get('ROOM_NAMES_FILE')
+        if path:
+            names.update(load_names(path))
+        for name in filter(None, (n.strip() for n in app.config.get('ROOM_NAMES', '').split(','))):
+            names.setdefault(name, name)
+        if names:
+            from backend.ocr.room_name_parser import RoomNameParser
+            base = {name: name for name in RoomNameParser.KNOWN_ROOMS}
+            self.configure({**base, **names}, app.config.get('ROOM_NAME_MAX_EDITS', 2))
+        else:
+            self.configure(max_distance=app.config.get('ROOM_NAME_MAX_EDITS', 2))
+
+    @staticmethod
+    def normalize(text):
+        return " ".join(WORD.findall(text.lower()))
+
+    def _allowed(self, term):
+        if len(term) < 5:
+            return 0
+        return min(1 if len(term) < 8 else 2, self.max_distance)
+
+    def _fuzzy(self, term):
+        """(distance, key) of the closest name to `term`, or None."""
+        cache = self._fuzzy_cache
+        if term in cache:
+            return cache[term]
+        allowed = self._allowed(term)
+        if not allowed:
+            return None
+        best = None
+        for variant in deletes(term, allowed):
+            for key in self.index.get(variant, ()):
+                distance = edit_distance(term, key, allowed)
+                if distance <= allowed and (best is None or (distance, -len(key)) < (best[0], -len(best[1]))):
+                    best = (distance, key)
+        if len(cache) >= CACHE_SIZE:
+            cache.clear()
+        cache[term] = best
+        return best
+
+    def match(self, text):
+        """Canonical room name in `text`, or None."""
+        cache = self._cache
+        if text in cache:
+            return cache[text]
+        room = self._match(text)
+        if len(cache) >= CACHE_SIZE:
+            cache.clear()
+        cache[text] = room
+        return room
+
+    def _match(self, text):
+        normalized = self.normalize(text)
+        exact, max_words = self.exact, self.max_words
+        if normalized in exact:
+            return exact[normalized]
+        if not normalized:
+            return None
+
+        words = normalized.split(" ")
+
+        best = None
+        for start in range(len(words)):
+            for end in range(min(len(words), start + max_words), start, -1):
+                key = " ".join(words[start:end])
+                if key in exact:
+                    if best is None or len(key) > len(best):
+                        best = key
+                    break
+        if best is not None:
+            return exact[best]
+        # Misreads are only looked for in words long enough to tell apart
+        if all(len(word) < 5 for word in words):
+            return None
+
+        fuzzy = None
+        for start in range(len(words)):
+            for end in range(min(len(words), start + max_words), start, -1):
+                term = " ".join(words[start:end])
+                found = self._fuzzy(term) if len(term) >= 5 else None
+                if found and (fuzzy is None or (found[0], -len(found[1])) < (fuzzy[0], -len(fuzzy[1]))):
+                    fuzzy = found
+        return exact[fuzzy[1]] if fuzzy else None
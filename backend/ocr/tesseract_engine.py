@@ -1,36 +1,39 @@
 import pytesseract
-from pytesseract import Output
-import cv2
+from backend.ocr.engine_pool import PSM_AUTO
+from backend.ocr.text_regions import PSM_SPARSE_TEXT, propose_text_regions, ocr_regions
+from backend.cv.preprocessing import preprocess_gray
+from backend.utils.image_cache import load_gray
 
 class TesseractEngine:
     @staticmethod
     def setup(tesseract_cmd=None):
+        # Only used by the subprocess fallback when libtesseract is missing
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
     @staticmethod
-    def extract_text(image_path):
-        image = cv2.imread(image_path)
-        if image is None:
-            raise FileNotFoundError("Could not read image for OCR")
-            
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        results = pytesseract.image_to_data(gray, output_type=Output.DICT)
-        
-        extracted = []
-        for i in range(len(results["text"])):
-            text = results["text"][i].strip()
-            conf = int(results["conf"][i])
-            
-            if text and conf > 30: # Filter out low confidence and empty text
-                extracted.append({
-                    "text": text,
-                    "x": results["left"][i],
-                    "y": results["top"][i],
-                    "width": results["width"][i],
-                    "height": results["height"][i],
-                    "confidence": conf / 100.0
-                })
-        
-        return extracted
+    def extract_text(image, psm=PSM_AUTO):
+        """OCRs a page or crop on a pooled engine and returns word boxes."""
+        from backend.extensions import ocr_pool
+
+        gray = load_gray(image)
+        return ocr_pool.image_to_data(gray, psm=psm)
+
+    @staticmethod
+    def extract_regions(image, binary=None, target_height=32, psm=PSM_SPARSE_TEXT):
+        """
+        OCRs only the text-like regions of a page, in parallel on the engine
+        pool, and returns word boxes in page coordinates. `binary` is the
+        thresholded page when the caller already has it. Pages where no
+        region is found are read whole.
+        """
+        from backend.extensions import ocr_pool
+
+        gray = load_gray(image)
+        if binary is None:
+            binary = preprocess_gray(gray)[1]
+
+        regions = propose_text_regions(binary)
+        if not regions:
+            return ocr_pool.image_to_data(gray)
+        return ocr_regions(gray, regions, ocr_pool, target_height=target_height, psm=psm)
@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+# Tesseract's sparse text mode: find as much text as possible, in no order
+PSM_SPARSE_TEXT = 11
+
+def propose_text_regions(binary, min_height=6, max_height=120, max_aspect=20.0, padding=4):
+    """
+    Finds text-like areas in a thresholded page (ink > 0).
+
+    Connected components are kept when their height is in the text range,
+    they are not long thin strokes (walls, dimension lines) and they fill a
+    moderate share of their box. Kept components are joined along the line
+    direction into word/line boxes. Returns (x0, y0, x1, y1, text_height)
+    tuples, where text_height is the median component height in the box.
+    """
+    ink = (binary > 0).astype(np.uint8)
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    w, h = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT]
+    area = stats[:, cv2.CC_STAT_AREA]
+    fill = area / np.maximum(w * h, 1)
+    aspect = np.maximum(w, h) / np.maximum(np.minimum(w, h), 1)
+
+    text_like = (h >= min_height) & (h <= max_height) & (w <= max_height * max_aspect) & \
+                (aspect <= max_aspect) & (fill >= 0.1) & (fill <= 0.95)
+    text_like[0] = False
+    if not text_like.any():
+        return []
+
+    lookup = np.zeros(count, np.uint8)
+    lookup[text_like] = 255
+    glyphs = lookup[labels]
+
+    # Bridge the gaps between characters and words on one line
+    gap = max(int(np.median(h[text_like]) * 0.8), 3)
+    joined = cv2.dilate(glyphs, cv2.getStructuringElement(cv2.MORPH_RECT, (gap, 1)))
+    line_count, line_labels, line_stats, _ = cv2.connectedComponentsWithStats(joined, connectivity=8)
+
+    # Median glyph height per line, for rescaling
+    glyph_lines = line_labels[stats[text_like, cv2.CC_STAT_TOP] + h[text_like] // 2,
+                              stats[text_like, cv2.CC_STAT_LEFT] + w[text_like] // 2]
+    glyph_heights = h[text_like]
+
+    height, width = binary.shape[:2]
+    regions = []
+    for label in range(1, line_count):
+        x, y, lw, lh = line_stats[label, :4].tolist()
+        heights = glyph_heights[glyph_lines == label]
+        text_height = float(np.median(heights)) if len(heights) else float(lh)
+        regions.append((max(x - padding, 0), max(y - padding, 0),
+                        min(x + lw + padding, width), min(y + lh + padding, height), text_height))
+    return regions
+
+def ocr_regions(gray, regions, pool, target_height=32, psm=PSM_SPARSE_TEXT, workers=None):
+    """
+    OCRs every region on the engine pool in parallel. Each crop is rescaled
+    so its text is about `target_height` pixels tall and the word boxes are
+    mapped back to page coordinates.
+    """
+    def run(region):
+        x0, y0, x1, y1, text_height = region
+        crop = gray[y0:y1, x0:x1]
+        scale = min(max(target_height / max(text_height, 1.0), 0.5), 4.0)
+        if abs(scale - 1.0) > 0.1:
+            interpolation = cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=interpolation)
+        else:
+            scale = 1.0
+
+        words = pool.image_to_data(crop, psm=psm)
+        for word in words:
+            word["x"] = int(round(x0 + word["x"] / scale))
+            word["y"] = int(round(y0 + word["y"] / scale))
+            word["width"] = int(round(word["width"] / scale))
+            word["height"] = int(round(word["height"] / scale))
+        return words
+
+    if not regions:
+        return []
+    with ThreadPoolExecutor(max_workers=workers or pool.size) as executor:
+        return [word for words in executor.map(run, regions) for word in words]
@@ -0,0 +1,150 @@
+import io
+import os
+import zipfile
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+from backend.database.repositories.batch_repository import BatchRepository
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.utils.image_utils import validate_image_file
+
+class BatchService:
+    @staticmethod
+    def create_batch(uploads, config, generate_config=None):
+        """
+        Creates a batch with shared processing `config` and adds `uploads`
+        (images and .zip archives of images) to it. With `generate_config`
+        every processed item is also generated.
+        """
+        if not uploads:
+            raise ValueError("No files provided")
+        batch = BatchRepository.create(config or {}, generate_config)
+        return BatchService.add_items(batch.public_id, uploads)
+
+    @staticmethod
+    def add_items(public_id, uploads):
+        """
+        Creates one project per image, stores its blueprint and queues its
+        PROCESS job. Files that are not valid images are reported in
+        "rejected" and do not create a project.
+        """
+        from backend.services.blueprint_service import BlueprintService
+        from backend.services.job_service import JobService
+
+        batch = BatchRepository.get_by_public_id(public_id)
+        if not batch:
+            raise ValueError(f"Batch {public_id} not found")
+
+        existing = len({project_id for project_id, _, _ in BatchRepository.get_items(batch.id)})
+        max_items = current_app.config.get('BATCH_MAX_ITEMS', 1000)
+
+        accepted, rejected = [], []
+        for upload, error in BatchService._images(uploads):
+            if error:
+                rejected.append({"filename": upload.filename, "error": error})
+                continue
+            if existing + len(accepted) >= max_items:
+                rejected.append({"filename": upload.filename, "error": f"Batch is limited to {max_items} items"})
+                continue
+            try:
+                validate_image_file(upload)
+            except ValueError as e:
+                rejected.append({"filename": upload.filename, "error": str(e)})
+                continue
+
+            name = os.path.splitext(upload.filename)[0]
+            project = ProjectRepository.create(name=name, description=f"Batch {batch.public_id}")
+            try:
+                # Decoding is left to the job workers
+                BlueprintService.upload_blueprint(project.public_id, upload, decode=False)
+            except ValueError as e:
+                ProjectRepository.delete(project)
+                rejected.append({"filename": upload.filename, "error": str(e)})
+                continue
+            job = JobService.enqueue(project, "PROCESS", batch.config or {}, batch_id=batch.id)
+            accepted.append({"project_id": project.public_id, "name": name, "job_id": job["id"]})
+
+        return {"batch_id": batch.public_id, "accepted": accepted, "rejected": rejected}
+
+    @staticmethod
+    def _images(uploads):
+        """
+        Yields (upload, error) for the uploaded images, expanding .zip
+        archives one entry at a time; an archive that cannot be used is
+        yielded with its error.
+        """
+        max_bytes = current_app.config.get('BATCH_MAX_ARCHIVE_MB', 2048) * 1024 * 1024
+        for upload in uploads:
+            if not (upload.filename or "").lower().endswith(".zip"):
+                yield upload, None
+                continue
+            try:
+                archive = zipfile.ZipFile(upload.stream)
+            except zipfile.BadZipFile:
+                yield upload, "Not a valid zip archive"
+                continue
+            with archive:
+                entries = [
+                    info for info in archive.infolist()
+                    if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+                    and not os.path.basename(info.filename).startswith(".")
+                ]
+                # Checked before extracting anything, so a zip bomb is never inflated
+                if sum(info.file_size for info in entries) > max_bytes:
+                    yield upload, f"Archive expands to more than {max_bytes // (1024 * 1024)} MB"
+                    continue
+                for info in entries:
+                    yield FileStorage(stream=io.BytesIO(archive.read(info)), filename=os.path.basename(info.filename)), None
+
+    @staticmethod
+    def get_batch(public_id):
+        """
+        Aggregate status and progress of a batch plus per-item results, from
+        one query over the batch's jobs. Returns None when it does not exist.
+        """
+        batch = BatchRepository.get_by_public_id(public_id)
+        if not batch:
+            return None
+
+        items = {}
+        for project_id, name, job in BatchRepository.get_items(batch.id):
+            item = items.setdefault(project_id, {"project_id": project_id, "name": name, "jobs": []})
+            item["jobs"].append({
+                "id": job.id, "job_type": job.job_type, "status": job.status, "progress": job.progress,
+                "stage": job.stage, "message": job.message, "result": job.result
+            })
+
+        expected = 2 if batch.generate_config is not None else 1
+        counts = {"PENDING": 0, "RUNNING": 0, "COMPLETED": 0, "FAILED": 0}
+        for item in items.values():
+            statuses = [job["status"] for job in item["jobs"]]
+            if "FAILED" in statuses:
+                item["status"] = "FAILED"
+            elif len(statuses) == expected and all(s == "COMPLETED" for s in statuses):
+                item["status"] = "COMPLETED"
+            elif all(s == "PENDING" for s in statuses):
+                item["status"] = "PENDING"
+            else:
+                item["status"] = "RUNNING"
+            item["progress"] = 100 if item["status"] in ("COMPLETED", "FAILED") else \
+                sum(job["progress"] for job in item["jobs"]) // expected
+            counts[item["status"]] += 1
+
+        total = len(items)
+        if counts["PENDING"] == total:
+            status = "PENDING"
+        elif counts["PENDING"] + counts["RUNNING"] == 0:
+            status = "COMPLETED"
+        else:
+            status = "RUNNING"
+
+        return {
+            "id": batch.public_id,
+            "status": status,
+            "progress": sum(item["progress"] for item in items.values()) // total if total else 0,
+            "total": total,
+            "counts": {key.lower(): value for key, value in counts.items()},
+            "config": batch.config,
+            "generate_config": batch.generate_config,
+            "created_at": batch.created_at.isoformat() if batch.created_at else None,
+            "items": list(items.values())
+        }
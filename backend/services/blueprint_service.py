@@ -6,7 +6,7 @@ import os
 
 class BlueprintService:
     @staticmethod
-    def upload_blueprint(public_id, file):
+    def upload_blueprint(public_id, file, decode=True):
         # 1. Get project
         project = ProjectRepository.get_by_public_id(public_id)
         if not project:
@@ -15,17 +15,15 @@ class BlueprintService:
         # 2. Validate file
         validate_image_file(file)
         
-        # 3. Check if project already has a blueprint, if so delete old one
-        existing = BlueprintRepository.get_by_project_id(project.id)
-        if existing:
-            # We don't delete the physical file right now for safety, but we could.
-            pass
+        # 3. A new upload is a revision of the project's current blueprint;
+        # the old file is kept so the next run can diff against it
+        existing = BlueprintRepository.latest(project.id)
 
         # 4. Save to disk
-        file_data = save_blueprint_image(file, project.id, current_app.config)
+        file_data = save_blueprint_image(file, project.id, current_app.config, decode=decode)
 
         # 5. Save to database
-        blueprint = BlueprintRepository.create(project.id, file_data)
+        blueprint = BlueprintRepository.create(project.id, file_data, previous=existing)
         
         # 6. Update project status
         project.status = 'UPLOADED'
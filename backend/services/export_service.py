@@ -1,3 +1,5 @@
+import numpy as np
+from flask import current_app
 from backend.database.repositories.project_repository import ProjectRepository
 from backend.models.wall import Wall
 from backend.models.door import Door
@@ -6,14 +8,64 @@ from backend.blender.blender_runner import BlenderRunner
 from backend.extensions import db
 
 class ExportService:
+    @staticmethod
+    def scene_geometry(project, app_config):
+        """
+        Walls and doors of a project as rows, or as dicts when the project's
+        geometry is stored as a blob. Blob doors (and any door without a
+        host wall) are linked to the nearest wall here, since blob geometry
+        has no stored links.
+        """
+        from backend.database.repositories.geometry_repository import GeometryRepository
+        from backend.cv.spatial_index import assign_openings
+        from backend.utils.geometry_blob import walls_and_doors
+
+        walls = Wall.query.filter_by(project_id=project.id).all()
+        doors = Door.query.filter_by(project_id=project.id).all()
+        geometry = GeometryRepository.load(project.id)
+        if geometry is None:
+            return walls, doors
+
+        blob_walls, blob_doors = walls_and_doors(geometry)
+        walls = [w.to_dict() for w in walls] + blob_walls
+        doors = [d.to_dict() for d in doors] + blob_doors
+
+        unlinked = [d for d in doors if d["parent_wall_id"] is None]
+        if walls and unlinked:
+            segments = np.array([(w["start_x"], w["start_y"], w["end_x"], w["end_y"]) for w in walls])
+            centers = np.array([(d["center_x"], d["center_y"]) for d in unlinked])
+            indices, orientations = assign_openings(
+                segments, centers,
+                max_distance=app_config.get('OPENING_MAX_WALL_DISTANCE', 64),
+                cell_size=app_config.get('SPATIAL_INDEX_CELL_SIZE', 64)
+            )
+            for door, index, orientation in zip(unlinked, indices.tolist(), orientations):
+                if index >= 0:
+                    door["parent_wall_id"] = walls[index]["id"]
+                    door["orientation"] = orientation
+        return walls, doors
+
+    @staticmethod
+    def submit_generation(public_id, config):
+        """Checks the request and queues generate_model as a GENERATE job."""
+        from backend.services.job_service import JobService
+
+        project = ProjectRepository.get_by_public_id(public_id)
+        if not project:
+            raise ValueError(f"Project {public_id} not found")
+        return JobService.enqueue(project, "GENERATE", config)
+
     @staticmethod
     def generate_model(public_id, config):
         project = ProjectRepository.get_by_public_id(public_id)
         if not project:
             raise ValueError(f"Project {public_id} not found")
             
-        walls = Wall.query.filter_by(project_id=project.id).all()
-        doors = Door.query.filter_by(project_id=project.id).all()
+        from backend.utils.stage_metrics import stage
+
+        with stage("export_read") as counts:
+            walls, doors = ExportService.scene_geometry(project, current_app.config)
+            counts["walls"], counts["doors"] = len(walls), len(doors)
         
         project.status = 'GENERATING_3D'
         db.session.commit()
@@ -0,0 +1,147 @@
+import hashlib
+import json
+from backend.database.repositories.job_repository import JobRepository
+from backend.models.processing_job import ProcessingJob
+
+class JobService:
+    @staticmethod
+    def handlers():
+        """job_type -> callable(public_id, config) returning the job's result."""
+        from backend.services.processing_service import ProcessingService
+        from backend.services.export_service import ExportService
+
+        return {
+            "PROCESS": ProcessingService.start_processing,
+            "GENERATE": ExportService.generate_model
+        }
+
+    @staticmethod
+    def dedup_key(project_id, job_type, config):
+        """Identifies identical work: same project, operation and config (key order aside)."""
+        digest = hashlib.sha256(json.dumps(config or {}, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+        return f"{project_id}:{job_type}:{digest}"
+
+    @staticmethod
+    def enqueue(project, job_type, config, batch_id=None):
+        """
+        Queues a job for the project and wakes the job runner. A request
+        identical to a job that is still pending or running attaches to
+        that job instead of starting the work again; its dict then has
+        "deduplicated": true. A job left RUNNING by a killed worker does not
+        count once its lease has expired.
+        """
+        from flask import current_app
+        from backend.extensions import job_runner
+
+        if job_type not in JobService.handlers():
+            raise ValueError(f"Unknown job type {job_type}")
+        job, created = JobRepository.create(
+            project.id, job_type, config, batch_id=batch_id,
+            dedup_key=JobService.dedup_key(project.id, job_type, config),
+            max_attempts=current_app.config['JOB_MAX_ATTEMPTS']
+        )
+        if created:
+            job_runner.notify()
+        return {**job.to_dict(), "deduplicated": not created}
+
+    @staticmethod
+    def get_job(public_id, job_id):
+        from flask import current_app
+
+        job = JobRepository.get_scoped(public_id, job_id)
+        if job is None:
+            return None
+        return JobRepository.check_lease(job, current_app.config['JOB_MAX_ATTEMPTS']).to_dict()
+
+    @staticmethod
+    def job_events(public_id, job_id, poll_interval=0.5, timeout=300, keepalive=15):
+        """
+        Server-sent events for a job: a "progress" event with the job's
+        status, progress, stage and message whenever they change, then a
+        "done" event with the full job once it has finished. The stream
+        ends after `timeout` s; clients reconnect and get the current
+        state first. A job whose worker died is recovered as soon as its
+        lease expires. Returns None when the project or job does not exist.
+        """
+        import time
+        from flask import current_app
+
+        job = JobRepository.get_scoped(public_id, job_id)
+        if job is None:
+            return None
+
+        max_attempts = current_app.config['JOB_MAX_ATTEMPTS']
+
+        def events():
+            from backend.extensions import db
+
+            last, started, sent_at = None, time.monotonic(), time.monotonic()
+            while True:
+                state = JobRepository.get_state(job_id, max_attempts=max_attempts)
+                if state is None:
+                    return
+                if state != last:
+                    status, progress, stage, message = state
+                    yield "progress", {"status": status, "progress": progress, "stage": stage, "message": message}
+                    last, sent_at = state, time.monotonic()
+                    if status in ('COMPLETED', 'FAILED'):
+                        yield "done", db.session.get(ProcessingJob, job_id).to_dict()
+                        return
+                now = time.monotonic()
+                if now - started >= timeout:
+                    return
+                if now - sent_at >= keepalive:
+                    # A comment line keeps proxies from closing an idle stream
+                    yield None, None
+                    sent_at = now
+                time.sleep(poll_interval)
+
+        return events()
+
+    @staticmethod
+    def run_next():
+        """
+        Claims and runs the oldest pending job. Returns the finished job's
+        dict, or None when no job was pending.
+        """
+        from flask import current_app
+        from backend.extensions import db
+        from backend.utils.stage_metrics import StageMetrics
+        from backend.utils.job_progress import JobLease, JobProgress
+
+        lease_seconds = current_app.config['JOB_LEASE_SECONDS']
+        job = JobRepository.claim_next(lease_seconds, current_app.config['JOB_MAX_ATTEMPTS'])
+        if job is None:
+            return None
+
+        handler = JobService.handlers()[job.job_type]
+        metrics = StageMetrics(
+            memory=current_app.config.get('STAGE_METRICS_MEMORY', 'rss'),
+            listener=JobProgress(job.id, job.job_type, job.config)
+        )
+        try:
+            with metrics.activate(), JobLease(job.id, job.attempts, lease_seconds):
+                result = handler(job.project.public_id, job.config or {})
+        except Exception as e:
+            db.session.rollback()
+            # Validation errors are the client's; anything else is ours
+            message = str(e) if isinstance(e, ValueError) else f"{job.job_type} job failed"
+            return JobRepository.finish(
+                job, 'FAILED', message=message, error_details=str(e), metrics=metrics.to_dict()
+            ).to_dict()
+        finished = JobRepository.finish(
+            job, 'COMPLETED', result=result, message=result.get("message"), metrics=metrics.to_dict()
+        )
+        # Not when the job was recovered from this worker meanwhile
+        if finished.status == 'COMPLETED' and finished.batch_id is not None and finished.job_type == "PROCESS":
+            JobService._generate_batch_item(finished)
+        return finished.to_dict()
+
+    @staticmethod
+    def _generate_batch_item(job):
+        """Queues the GENERATE job of a processed batch item when its batch asks for models."""
+        from backend.database.repositories.batch_repository import BatchRepository
+
+        batch = BatchRepository.get(job.batch_id)
+        if batch is not None and batch.generate_config is not None:
+            JobService.enqueue(job.project, "GENERATE", batch.generate_config, batch_id=batch.id)
@@ -3,47 +3,373 @@ from backend.database.repositories.blueprint_repository import BlueprintReposito
 from backend.cv.detection_pipeline import DetectionPipeline
 
 class ProcessingService:
+    @staticmethod
+    def submit_processing(public_id, config):
+        """Checks the request and queues start_processing as a PROCESS job."""
+        from backend.services.job_service import JobService
+
+        project = ProjectRepository.get_by_public_id(public_id)
+        if not project:
+            raise ValueError(f"Project {public_id} not found")
+        if not BlueprintRepository.latest(project.id):
+            raise ValueError(f"No blueprint uploaded for project {public_id}")
+        return JobService.enqueue(project, "PROCESS", config)
+
     @staticmethod
     def start_processing(public_id, config):
         project = ProjectRepository.get_by_public_id(public_id)
         if not project:
             raise ValueError(f"Project {public_id} not found")
-            
-        blueprint = BlueprintRepository.get_by_project_id(project.id)
+
+        blueprint = BlueprintRepository.latest(project.id)
         if not blueprint:
             raise ValueError(f"No blueprint uploaded for project {public_id}")
-            
+
         project.status = 'PROCESSING'
         from backend.extensions import db
         db.session.commit()
-        
+
         mode = config.get("detection_mode", "auto")
-        
+
         try:
-            from backend.database.repositories.object_repository import ObjectRepository
+            from backend.database.repositories.ocr_repository import OCRRepository
+            from backend.database.repositories.room_repository import RoomRepository
             from backend.ocr.ocr_pipeline import OCRPipeline
             from flask import current_app
-            
-            # Synchronous processing for now
-            detected_objects = DetectionPipeline.process(blueprint.file_path, mode)
-            
-            # Save to database
-            ObjectRepository.save_detected_objects(project.id, detected_objects)
-            
-            ocr_count = 0
+
+            from backend.utils.image_cache import load_gray
+            from backend.utils.stage_metrics import stage, timed
+            from backend.extensions import stage_executor
+
+            # Decode once; CV and OCR share the same grayscale buffer
+            with stage("decode") as counts:
+                gray = load_gray(blueprint.file_path)
+                counts["pixels"] = int(gray.size)
+
+            revision = ProcessingService._plan_revision(project, blueprint, gray, mode, config, current_app.config)
+            if revision:
+                return ProcessingService._process_revision(project, blueprint, gray, revision, config, current_app.config)
+
+            # Preprocessed once, before OCR starts, so detection, OCR region
+            # proposals and room segmentation share the masks
+            prepared = DetectionPipeline.prepare(gray, current_app.config)
+
+            # OCR reads the page in the background while detection runs here;
+            # both spend their time in native code outside the GIL
+            ocr_future = None
             if config.get("run_ocr", False):
-                ocr_results = OCRPipeline.process(project.id, blueprint.file_path, current_app.config)
-                ocr_count = len(ocr_results)
-            
-            project.status = 'DETECTED'
-            db.session.commit()
-            
+                # A coarse-to-fine page has no full-resolution mask; OCR then
+                # thresholds the page itself, which detection never does
+                binary = prepared["morphed"] if prepared["factor"] == 1 else None
+                ocr_future = stage_executor.submit(
+                    timed, "ocr", OCRPipeline.recognize, gray, current_app.config, binary=binary
+                )
+
+            try:
+                with stage("detect") as counts:
+                    mode, detected_objects, detection_stats = DetectionPipeline.run(
+                        gray, mode, current_app.config, prepared=prepared
+                    )
+                    counts["objects"] = len(detected_objects)
+                ocr_records = OCRPipeline.classify(ocr_future.result()) if ocr_future is not None else None
+            except Exception:
+                # Never leave OCR running past a failed request
+                if ocr_future is not None:
+                    ocr_future.exception()
+                raise
+
+            with stage("rooms") as counts:
+                if ocr_records is not None:
+                    room_texts = [r for r in ocr_records if r["text_type"] == 'ROOM_NAME']
+                else:
+                    room_texts = ProcessingService._room_texts(OCRRepository.get_room_names(project.id))
+                rooms = ProcessingService._extract_rooms(
+                    DetectionPipeline.wall_mask(prepared, gray.shape), room_texts, current_app.config
+                )
+                counts["rooms"] = len(rooms)
+
+            # Every write of the run goes into one transaction, so a failure
+            # leaves the previous run in place
+            with stage("persist") as counts:
+                ProcessingService._store_detections(project, detected_objects, current_app.config)
+                if ocr_records is not None:
+                    OCRRepository.delete_by_project(project.id)
+                    OCRRepository.create_many(project.id, ocr_records, commit=False)
+                RoomRepository.replace_rooms(project.id, rooms, commit=False)
+                with stage("link") as link_counts:
+                    linked_openings = link_counts["openings"] = ProcessingService._link_openings(
+                        project, current_app.config
+                    )
+                blueprint.detection_mode = mode
+                project.status = 'DETECTED'
+                db.session.commit()
+                counts["rows"] = len(detected_objects) + len(ocr_records or []) + len(rooms)
+
             return {
                 "message": "Processing complete",
+                "detection_mode": mode,
+                "detection_stats": detection_stats,
                 "detected_objects": len(detected_objects),
-                "ocr_records": ocr_count
+                "ocr_records": len(ocr_records or []),
+                "rooms": len(rooms),
+                "linked_openings": linked_openings
             }
         except Exception as e:
+            db.session.rollback()
             project.status = 'FAILED'
             db.session.commit()
             raise e
+
+    @staticmethod
+    def _plan_revision(project, blueprint, gray, mode, config, app_config):
+        """
+        Decides whether a revised blueprint can be processed incrementally:
+        the previous revision must have been processed with the same mode and
+        have the same size, and the pixel diff must be small enough that
+        re-detecting the changed regions is cheaper than a full run.
+        """
+        from backend.cv.incremental import changed_regions, region_area
+        from backend.utils.image_cache import load_gray
+
+        previous = blueprint.previous_blueprint
+        if not config.get("incremental", app_config.get('INCREMENTAL_DETECTION', True)):
+            return None
+        if not previous or not previous.detection_mode or blueprint.detection_mode:
+            return None
+        if ProcessingService._blob_storage(app_config):
+            # Incremental runs edit per-object rows; a blob is rewritten whole
+            return None
+        if mode not in ("auto", previous.detection_mode):
+            return None
+
+        try:
+            previous_gray = load_gray(previous.file_path)
+        except FileNotFoundError:
+            # The previous file is gone; fall back to a full run
+            return None
+
+        regions = changed_regions(
+            previous_gray, gray,
+            threshold=app_config.get('INCREMENTAL_DIFF_THRESHOLD', 32),
+            block_size=app_config.get('INCREMENTAL_BLOCK_SIZE', 64)
+        )
+        if regions is None:
+            return None
+        changed_fraction = region_area(regions) / float(gray.shape[0] * gray.shape[1])
+        if changed_fraction > app_config.get('INCREMENTAL_MAX_CHANGED_FRACTION', 0.3):
+            return None
+
+        return {
+            "mode": previous.detection_mode,
+            "previous_revision": previous.revision,
+            "previous_gray": previous_gray,
+            "regions": regions,
+            "changed_fraction": changed_fraction
+        }
+
+    @staticmethod
+    def _process_revision(project, blueprint, gray, revision, config, app_config):
+        """
+        Re-detects only the changed regions of a revision. Walls, doors and
+        OCR text of the previous revision that lie outside them are kept as
+        they are; records touching a changed region are replaced.
+        """
+        from backend.cv.incremental import object_boxes, touches, detection_windows
+        from backend.database.repositories.object_repository import ObjectRepository
+        from backend.database.repositories.ocr_repository import OCRRepository
+        from backend.database.repositories.room_repository import RoomRepository
+        from backend.ocr.ocr_pipeline import OCRPipeline
+        from backend.utils.stage_metrics import stage, timed
+        from backend.extensions import db, stage_executor
+
+        mode, regions = revision["mode"], revision["regions"]
+
+        previous_objects = ObjectRepository.get_by_project(project.id)
+        records = [
+            {"x": o.x, "y": o.y, "width": o.width, "height": o.height,
+             "x1": o.x1, "y1": o.y1, "x2": o.x2, "y2": o.y2}
+            for o in previous_objects
+        ]
+        boxes = object_boxes(records)
+        stale = touches(records, regions)
+        windows = detection_windows(regions, boxes[stale], gray.shape)
+
+        # The previous revision's masks, patched with the changed regions,
+        # are this revision's; without them rooms use a coarse mask
+        masks = DetectionPipeline.cached_masks(revision["previous_gray"], app_config)
+
+        ocr_future = None
+        kept_texts, stale_text_ids = [], []
+        if config.get("run_ocr", False):
+            previous_texts = OCRRepository.get_by_project(project.id)
+            if previous_texts:
+                text_records = [
+                    {"x": t.x, "y": t.y, "width": t.width, "height": t.height} for t in previous_texts
+                ]
+                text_boxes = object_boxes(text_records)
+                stale_texts = touches(text_records, regions, band=None)
+                kept_texts = [t for t, is_stale in zip(previous_texts, stale_texts.tolist()) if not is_stale]
+                stale_text_ids = [t.id for t, is_stale in zip(previous_texts, stale_texts.tolist()) if is_stale]
+                ocr_windows = detection_windows(regions, text_boxes[stale_texts], gray.shape)
+                ocr_future = stage_executor.submit(
+                    timed, "ocr", OCRPipeline.recognize, gray, app_config, windows=ocr_windows, regions=regions
+                )
+            else:
+                # The previous revision was processed without OCR
+                ocr_future = stage_executor.submit(timed, "ocr", OCRPipeline.recognize, gray, app_config)
+
+        try:
+            with stage("detect") as counts:
+                detected_objects, detection_stats = DetectionPipeline.run_windows(
+                    gray, mode, windows, regions, app_config, masks=masks
+                )
+                counts["objects"] = len(detected_objects)
+            ocr_records = OCRPipeline.classify(ocr_future.result()) if ocr_future is not None else None
+        except Exception:
+            if ocr_future is not None:
+                ocr_future.exception()
+            raise
+
+        detection_stats["incremental"] = {
+            "previous_revision": revision["previous_revision"],
+            "changed_regions": len(regions),
+            "changed_fraction": round(revision["changed_fraction"], 4),
+            "reused_objects": int(len(previous_objects) - stale.sum()),
+            "replaced_objects": int(stale.sum())
+        }
+
+        # Rooms depend on the whole wall mask and are cheap to rebuild
+        with stage("rooms") as counts:
+            if masks is not None:
+                DetectionPipeline.store_masks(gray, app_config, masks)
+                wall_mask = masks[1]
+            else:
+                wall_mask = DetectionPipeline.coarse_wall_mask(gray, app_config)
+            if ocr_records is not None:
+                room_texts = ProcessingService._room_texts([t for t in kept_texts if t.text_type == 'ROOM_NAME'])
+                room_texts += [r for r in ocr_records if r["text_type"] == 'ROOM_NAME']
+            else:
+                room_texts = ProcessingService._room_texts(OCRRepository.get_room_names(project.id))
+            rooms = ProcessingService._extract_rooms(wall_mask, room_texts, app_config)
+            counts["rooms"] = len(rooms)
+
+        with stage("persist") as counts:
+            ObjectRepository.delete_objects(
+                project.id, [o.id for o, is_stale in zip(previous_objects, stale.tolist()) if is_stale],
+                commit=False
+            )
+            ObjectRepository.save_detected_objects(project.id, detected_objects, commit=False)
+            if ocr_records is not None:
+                OCRRepository.delete_records(project.id, stale_text_ids, commit=False)
+                OCRRepository.create_many(project.id, ocr_records, commit=False)
+            RoomRepository.replace_rooms(project.id, rooms, commit=False)
+            with stage("link") as link_counts:
+                linked_openings = link_counts["openings"] = ProcessingService._link_openings(project, app_config)
+            blueprint.detection_mode = mode
+            project.status = 'DETECTED'
+            db.session.commit()
+            counts["rows"] = len(detected_objects) + len(ocr_records or []) + len(rooms)
+
+        return {
+            "message": "Processing complete",
+            "detection_mode": mode,
+            "detection_stats": detection_stats,
+            "detected_objects": len(detected_objects),
+            "ocr_records": len(ocr_records or []),
+            "rooms": len(rooms),
+            "linked_openings": linked_openings
+        }
+
+    @staticmethod
+    def _blob_storage(app_config):
+        return app_config.get('GEOMETRY_STORAGE', 'rows') == 'blob'
+
+    @staticmethod
+    def _store_detections(project, detected_objects, app_config):
+        """
+        Stores a full run as per-object rows, or as one geometry blob with
+        GEOMETRY_STORAGE=blob, in place of the project's previous run so a
+        re-run never leaves both runs' objects behind. Does not commit.
+        """
+        from backend.database.repositories.object_repository import ObjectRepository
+        from backend.database.repositories.geometry_repository import GeometryRepository
+
+        ObjectRepository.delete_by_project(project.id)
+        if ProcessingService._blob_storage(app_config):
+            GeometryRepository.save(project.id, detected_objects, commit=False)
+        else:
+            GeometryRepository.delete(project.id, commit=False)
+            ObjectRepository.save_detected_objects(project.id, detected_objects, commit=False)
+
+    @staticmethod
+    def _room_texts(texts):
+        return [
+            {"x": t.x, "y": t.y, "width": t.width, "height": t.height, "normalized_text": t.normalized_text}
+            for t in texts
+        ]
+
+    @staticmethod
+    def _extract_rooms(wall_mask, room_texts, app_config):
+        """
+        Segments rooms from the run's wall mask and names them after the
+        ROOM_NAME text inside them. Returns the room dicts; storing them
+        is part of the run's final transaction.
+        """
+        from backend.cv.room_segmenter import segment_rooms, name_rooms
+
+        rooms, labels = segment_rooms(
+            wall_mask,
+            gap_close=app_config.get('ROOM_GAP_CLOSE', 15),
+            min_area_fraction=app_config.get('ROOM_MIN_AREA_FRACTION', 0.0005)
+        )
+        return name_rooms(rooms, labels, room_texts)
+
+    @staticmethod
+    def _count_blob_links(project, app_config):
+        from backend.database.repositories.geometry_repository import GeometryRepository
+        from backend.services.export_service import ExportService
+
+        if GeometryRepository.load(project.id) is None:
+            return 0
+        _, doors = ExportService.scene_geometry(project, app_config)
+        return sum(1 for door in doors if door["parent_wall_id"] is not None)
+
+    @staticmethod
+    def _link_openings(project, app_config):
+        """
+        Records every wall's orientation and assigns each door and window
+        to its nearest wall through one spatial index over the project's
+        walls. Returns the number of openings that found a wall. Does not
+        commit.
+        """
+        import numpy as np
+        from backend.cv.spatial_index import assign_openings, wall_orientation
+        from backend.database.repositories.object_repository import ObjectRepository
+
+        if ProcessingService._blob_storage(app_config):
+            # Blob geometry is linked when it is read (see ExportService)
+            return ProcessingService._count_blob_links(project, app_config)
+
+        walls = ObjectRepository.get_walls(project.id)
+        doors, windows = ObjectRepository.get_openings(project.id)
+
+        segments = np.array([(w.start_x, w.start_y, w.end_x, w.end_y) for w in walls], dtype=np.float64)
+        wall_rows = [
+            {"id": w.id, "orientation": wall_orientation(np.arctan2(w.end_y - w.start_y, w.end_x - w.start_x))}
+            for w in walls
+        ]
+
+        openings = doors + windows
+        centers = np.array([(o.center_x, o.center_y) for o in openings], dtype=np.float64)
+        indices, orientations = assign_openings(
+            segments, centers,
+            max_distance=app_config.get('OPENING_MAX_WALL_DISTANCE', 64),
+            cell_size=app_config.get('SPATIAL_INDEX_CELL_SIZE', 64)
+        )
+        rows = [
+            {"id": o.id, "parent_wall_id": walls[i].id if i >= 0 else None, "orientation": orientation}
+            for o, i, orientation in zip(openings, indices.tolist(), orientations)
+        ]
+
+        ObjectRepository.update_geometry(wall_rows, rows[:len(doors)], rows[len(doors):], commit=False)
+        return int((indices >= 0).sum())
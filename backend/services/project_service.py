@@ -1,5 +1,40 @@
+import re
+import itertools
 from backend.database.repositories.project_repository import ProjectRepository
 
+DETECTION_FIELDS = ["id", "object_type", "x", "y", "width", "height", "x1", "y1", "x2", "y2", "angle", "confidence"]
+OCR_FIELDS = ["id", "text", "normalized_text", "text_type", "x", "y", "width", "height", "confidence", "parsed_value"]
+
+# Blob objects are streamed to_dicts()-ed in chunks of this many
+BLOB_CHUNK_SIZE = 1000
+
+BLOB_CURSOR = re.compile(r"g(\d+)")
+
+def _select_fields(fields, allowed):
+    """Requested fields in canonical order; all of `allowed` when none are given."""
+    if not fields:
+        return list(allowed)
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return [name for name in allowed if name in fields]
+
+def _parse_cursor(cursor):
+    """(row id, blob index) after which a page starts; a blob cursor means the rows are done."""
+    if cursor is None or cursor == "":
+        return None, None
+    match = BLOB_CURSOR.fullmatch(str(cursor))
+    if match:
+        return None, int(match.group(1))
+    try:
+        return int(cursor), None
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+def _project(rows, fields):
+    # Rows always carry "id" (it is the cursor); drop it and other extras unless requested
+    return ({name: row[name] for name in fields} for row in rows)
+
 class ProjectService:
     @staticmethod
     def create_project(data):
@@ -18,14 +53,123 @@ class ProjectService:
         if not project:
             return None
         
+        from backend.database.repositories.blueprint_repository import BlueprintRepository
+
         data = project.to_dict()
-        if project.blueprint:
-            data['blueprint'] = project.blueprint.to_dict()
-        else:
-            data['blueprint'] = None
+        blueprint = BlueprintRepository.latest(project.id)
+        data['blueprint'] = blueprint.to_dict() if blueprint else None
         
         return data
 
+    @staticmethod
+    def get_rooms(public_id):
+        from backend.models.room import Room
+
+        scoped = ProjectRepository.get_scoped(public_id, Room)
+        if scoped is None:
+            return None
+        return [room.to_dict() for room in scoped[1]]
+
+    @staticmethod
+    def get_detections(public_id):
+        scoped = ProjectService.list_detections(public_id)
+        return None if scoped is None else scoped[0]
+
+    @staticmethod
+    def list_detections(public_id, fields=None, cursor=None, limit=None, stream=False):
+        """
+        Detections of the project's latest run: per-object rows plus, for
+        projects processed with GEOMETRY_STORAGE=blob, the objects still in
+        the geometry blob (string ids "g<index>"), in that order.
+
+        Returns (items, next_cursor), or None when the project does not
+        exist. `fields` limits the keys of each item. With `limit` the items
+        are a keyset page starting after `cursor` (the last id of the
+        previous page) and next_cursor is None on the last page. With
+        `stream` the items are an iterator over everything after `cursor`
+        that holds one batch in memory at a time.
+        """
+        from backend.models.detected_object import DetectedObject
+        from backend.database.repositories.geometry_repository import GeometryRepository
+        from backend.utils.geometry_blob import to_dicts
+
+        fields = _select_fields(fields, DETECTION_FIELDS)
+        after_row, after_blob = _parse_cursor(cursor)
+        if stream:
+            limit = None
+
+        if after_blob is None:
+            scoped = ProjectRepository.get_scoped(public_id, DetectedObject, columns=DETECTION_FIELDS[1:],
+                                                  after=after_row, limit=limit, stream=stream)
+            if scoped is None:
+                return None
+            project_id, rows = scoped
+            if limit is not None and len(rows) == limit:
+                return list(_project(rows, fields)), str(rows[-1]["id"])
+            start = 0
+        else:
+            project = ProjectRepository.get_by_public_id(public_id)
+            if project is None:
+                return None
+            project_id, rows, start = project.id, [], after_blob + 1
+
+        def blob_objects():
+            import numpy as np
+
+            geometry = GeometryRepository.load(project_id)
+            if geometry is None:
+                return
+            live = np.flatnonzero(~np.isnan(geometry["type"]))
+            live = live[live >= start]
+            for offset in range(0, len(live), BLOB_CHUNK_SIZE):
+                yield from to_dicts(geometry, live[offset:offset + BLOB_CHUNK_SIZE])
+
+        if stream:
+            return _project(itertools.chain(rows, blob_objects()), fields), None
+
+        remaining = None if limit is None else limit - len(rows)
+        blob = list(itertools.islice(blob_objects(), remaining))
+        items = rows + blob
+        next_cursor = None
+        if remaining is not None and len(blob) == remaining and blob:
+            next_cursor = blob[-1]["id"]
+        return list(_project(items, fields)), next_cursor
+
+    @staticmethod
+    def get_ocr(public_id):
+        scoped = ProjectService.list_ocr(public_id)
+        return None if scoped is None else scoped[0]
+
+    @staticmethod
+    def list_ocr(public_id, fields=None, cursor=None, limit=None, stream=False):
+        """OCR records of the project; arguments and result as for list_detections."""
+        from backend.models.ocr_text import OCRText
+
+        fields = _select_fields(fields, OCR_FIELDS)
+        after, after_blob = _parse_cursor(cursor)
+        if after_blob is not None:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if stream:
+            limit = None
+        scoped = ProjectRepository.get_scoped(public_id, OCRText, columns=OCR_FIELDS[1:],
+                                              after=after, limit=limit, stream=stream)
+        if scoped is None:
+            return None
+        rows = scoped[1]
+        if stream:
+            return _project(rows, fields), None
+        next_cursor = str(rows[-1]["id"]) if limit is not None and len(rows) == limit else None
+        return list(_project(rows, fields)), next_cursor
+
+    @staticmethod
+    def get_jobs(public_id):
+        from backend.models.processing_job import ProcessingJob
+
+        scoped = ProjectRepository.get_scoped(public_id, ProcessingJob)
+        if scoped is None:
+            return None
+        return [job.to_dict() for job in scoped[1]]
+
     @staticmethod
     def list_projects(page=1, page_size=20):
         projects, total = ProjectRepository.list_projects(page, page_size)
@@ -0,0 +1,81 @@
+import numpy as np
+
+# Bump when GEOMETRY_DTYPE changes; stored next to every blob
+FORMAT_VERSION = 1
+
+OBJECT_TYPES = ["UNKNOWN", "WALL", "DOOR", "WINDOW", "ROOM", "TEXT"]
+TYPE_CODES = {name: code for code, name in enumerate(OBJECT_TYPES)}
+
+GEOMETRY_FIELDS = ["x", "y", "width", "height", "x1", "y1", "x2", "y2", "angle", "confidence"]
+GEOMETRY_DTYPE = np.dtype([("type", "<f4")] + [(name, "<f4") for name in GEOMETRY_FIELDS])
+
+def pack(objects):
+    """
+    Packs detection dicts into the bytes of a little-endian float32
+    structured array, one 44-byte record per object. Missing values are
+    stored as NaN; a NaN type marks an object that was materialized into
+    rows.
+    """
+    array = np.full(len(objects), np.nan, dtype=GEOMETRY_DTYPE)
+    if not objects:
+        return array.tobytes()
+    array["type"] = [TYPE_CODES.get(o.get("object_type", "UNKNOWN"), 0) for o in objects]
+    for name in GEOMETRY_FIELDS:
+        array[name] = [np.nan if o.get(name) is None else o[name] for o in objects]
+    return array.tobytes()
+
+def unpack(buffer):
+    """Zero-copy, read-only view of a packed blob."""
+    return np.frombuffer(buffer, dtype=GEOMETRY_DTYPE)
+
+def blob_id(index):
+    # Blob objects have no row id; string ids never collide with row ids
+    return f"g{index}"
+
+def to_dicts(array, indices=None):
+    """Detection dicts in the /detections format for the live objects of `array` (or `indices` of it)."""
+    indices = np.flatnonzero(~np.isnan(array["type"])) if indices is None else np.asarray(indices)
+    selected = array[indices]
+    # float32 carries ~7 significant digits; do not report float64 noise
+    columns = {name: selected[name].astype(np.float64).round(3) for name in GEOMETRY_FIELDS}
+    columns = {name: np.where(np.isnan(v), None, v).tolist() for name, v in columns.items()}
+    types = selected["type"].astype(np.int64).tolist()
+    return [
+        {
+            "id": blob_id(index),
+            "object_type": OBJECT_TYPES[code] if 0 <= code < len(OBJECT_TYPES) else "UNKNOWN",
+            **{name: columns[name][i] for name in GEOMETRY_FIELDS}
+        }
+        for i, (index, code) in enumerate(zip(indices.tolist(), types))
+    ]
+
+def _filled(array, name, fallback):
+    values = array[name].astype(np.float64)
+    return np.where(np.isnan(values), fallback, values)
+
+def walls_and_doors(array):
+    """
+    Wall and door dicts shaped like Wall.to_dict()/Door.to_dict(), built
+    column-wise with the same rules as ObjectRepository.save_detected_objects.
+    """
+    x, y = _filled(array, "x", 0.0), _filled(array, "y", 0.0)
+    w, h = _filled(array, "width", 0.0), _filled(array, "height", 0.0)
+
+    wall_idx = np.flatnonzero(array["type"] == TYPE_CODES["WALL"])
+    start_x, start_y = _filled(array, "x1", x), _filled(array, "y1", y)
+    end_x, end_y = _filled(array, "x2", x + w), _filled(array, "y2", y + h)
+    walls = [
+        {"id": blob_id(i), "start_x": sx, "start_y": sy, "end_x": ex, "end_y": ey,
+         "thickness": 10.0, "height": None, "orientation": None}
+        for i, sx, sy, ex, ey in zip(wall_idx.tolist(), start_x[wall_idx].tolist(), start_y[wall_idx].tolist(),
+                                     end_x[wall_idx].tolist(), end_y[wall_idx].tolist())
+    ]
+
+    door_idx = np.flatnonzero(array["type"] == TYPE_CODES["DOOR"])
+    doors = [
+        {"id": blob_id(i), "center_x": cx, "center_y": cy, "width": dw, "height": dh,
+         "orientation": None, "parent_wall_id": None}
+        for i, cx, cy, dw, dh in zip(door_idx.tolist(), (x + w / 2)[door_idx].tolist(), (y + h / 2)[door_idx].tolist(),
+                                     w[door_idx].tolist(), h[door_idx].tolist())
+    ]
+    return walls, doors
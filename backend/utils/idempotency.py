@@ -0,0 +1,78 @@
+import hashlib
+from functools import wraps
+from flask import Response, current_app, make_response, request
+from backend.database.repositories.idempotency_repository import IdempotencyRepository
+from backend.utils.response import error_response
+
+FORM_MIMETYPES = ("multipart/form-data", "application/x-www-form-urlencoded")
+
+def _fingerprint():
+    """sha256 of the payload: form fields and file contents, or the raw body."""
+    digest = hashlib.sha256()
+    if request.mimetype in FORM_MIMETYPES:
+        for name, value in sorted(request.form.items(multi=True)):
+            digest.update(f"{name}={value}\0".encode())
+        for name, file in request.files.items(multi=True):
+            digest.update(f"{name}:{file.filename}\0".encode())
+            # Hashed in chunks so large uploads are not held in memory twice
+            for chunk in iter(lambda: file.stream.read(1 << 20), b""):
+                digest.update(chunk)
+            file.stream.seek(0)
+    else:
+        digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+def _replay(record):
+    response = Response(record.body, status=record.status_code, mimetype="application/json")
+    if record.location:
+        response.headers["Location"] = record.location
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+def idempotent(view):
+    """
+    Honours an Idempotency-Key header on a POST route. The first request
+    with a key runs and its response is stored for IDEMPOTENCY_TTL_HOURS;
+    a retry with the same key and payload gets that response back (with
+    Idempotent-Replayed: true) without running again. A retry while the
+    first is still running gets 409 until IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+    have passed, after which it runs in place of the first; the key with a
+    different payload gets 422. 5xx responses and failed requests are not
+    stored, so the request can be retried.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get("Idempotency-Key")
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > 255:
+            return error_response("VALIDATION_ERROR", "Idempotency-Key is longer than 255 characters", status_code=400)
+
+        fingerprint = _fingerprint()
+        record, first = IdempotencyRepository.begin(
+            key, f"{request.method} {request.path}", fingerprint,
+            current_app.config["IDEMPOTENCY_TTL_HOURS"], current_app.config["IDEMPOTENCY_LOCK_TIMEOUT_SECONDS"]
+        )
+        if record is not None and not first:
+            if record.fingerprint != fingerprint:
+                return error_response("IDEMPOTENCY_KEY_REUSED",
+                                      "Idempotency-Key was already used with a different request", status_code=422)
+            if record.status_code is None:
+                return error_response("IDEMPOTENCY_KEY_IN_USE",
+                                      "A request with this Idempotency-Key is still in progress", status_code=409)
+            return _replay(record)
+
+        completed = False
+        try:
+            response = make_response(view(*args, **kwargs))
+            if record is not None and response.status_code < 500 and not response.is_streamed:
+                IdempotencyRepository.complete(record.id, response.status_code, response.get_data(as_text=True),
+                                               response.headers.get("Location"))
+                completed = True
+            return response
+        finally:
+            # Whatever went wrong, a retry must be able to run the request again
+            if record is not None and not completed:
+                IdempotencyRepository.discard(record.id)
+
+    return wrapper
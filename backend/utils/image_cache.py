@@ -0,0 +1,114 @@
+import os
+import threading
+from collections import OrderedDict
+import cv2
+
+class DecodedImageCache:
+    """
+    Bounded in-process LRU of decoded blueprint images.
+
+    Entries are keyed by path, modification time and file size so a file
+    replaced on disk is decoded again. Cached arrays are marked read-only
+    because the same buffer is handed to validation, CV and OCR.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get('DECODED_IMAGE_CACHE_MB', 512) * 1024 * 1024
+        self.clear()
+
+    def _key(self, path, flavour):
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, flavour)
+
+    def _get(self, key):
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+            return image
+
+    def _put(self, key, image):
+        image.setflags(write=False)
+        if image.nbytes > self.max_bytes:
+            return image
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            self._entries[key] = image
+            self._size += image.nbytes
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.nbytes
+        return image
+
+    def get_gray(self, path):
+        """Returns the image as a single-channel array, decoding at most once."""
+        if not os.path.exists(path):
+            return None
+        key = self._key(path, 'gray')
+        image = self._get(key)
+        if image is not None:
+            return image
+
+        # Reuse a cached color decode, otherwise decode straight to grayscale
+        color = self._get(self._key(path, 'color'))
+        if color is not None:
+            image = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+        else:
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            return None
+        return self._put(key, image)
+
+    def get_color(self, path):
+        """Returns the image as a 3-channel BGR array, decoding at most once."""
+        if not os.path.exists(path):
+            return None
+        key = self._key(path, 'color')
+        image = self._get(key)
+        if image is not None:
+            return image
+
+        image = cv2.imread(path)
+        if image is None:
+            return None
+        return self._put(key, image)
+
+    def evict(self, path):
+        path = os.path.abspath(path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self._size -= self._entries.pop(key).nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+def load_gray(image):
+    """Accepts a path or an already decoded array and returns a grayscale array."""
+    from backend.extensions import image_cache
+
+    if isinstance(image, (str, os.PathLike)):
+        path = image
+        image = image_cache.get_gray(path)
+        if image is None:
+            raise FileNotFoundError(f"Could not load image at {path}")
+        return image
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
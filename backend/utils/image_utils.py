@@ -1,8 +1,8 @@
 import os
-import cv2
 import uuid
 from werkzeug.utils import secure_filename
 from backend.config import config_by_name
+from backend.extensions import image_cache
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 ALLOWED_MIME_TYPES = {'image/png', 'image/jpeg'}
@@ -22,7 +22,24 @@ def validate_image_file(file):
     # but for now we rely on extension and cv2 decoding.
     return True
 
-def save_blueprint_image(file, project_id, app_config):
+def read_image_size(file_path):
+    """(width, height) from the image header, without decoding the pixels."""
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(file_path) as image:
+            if image.format not in ("PNG", "JPEG"):
+                raise ValueError("Uploaded file is not a valid or readable image")
+            return image.size
+    except (UnidentifiedImageError, OSError):
+        raise ValueError("Uploaded file is not a valid or readable image")
+
+def save_blueprint_image(file, project_id, app_config, decode=True):
+    """
+    Stores an uploaded blueprint and returns its Blueprint columns. With
+    decode=False only the image header is checked; batch uploads use it
+    because their pixels are decoded by a job worker, not this process.
+    """
     original_filename = secure_filename(file.filename)
     extension = original_filename.rsplit('.', 1)[1].lower() if '.' in original_filename else 'png'
     stored_filename = f"{project_id}_{uuid.uuid4().hex}.{extension}"
@@ -33,13 +50,20 @@ def save_blueprint_image(file, project_id, app_config):
     file_path = os.path.join(upload_folder, stored_filename)
     file.save(file_path)
     
-    # Verify it's a valid image that OpenCV can read
-    image = cv2.imread(file_path)
-    if image is None:
-        os.remove(file_path)
-        raise ValueError("Uploaded file is not a valid or readable image")
-        
-    height, width = image.shape[:2]
+    if decode:
+        # Verify it's a valid image that OpenCV can read. The decoded pixels stay
+        # in the shared cache so processing does not decode the file again.
+        image = image_cache.get_gray(file_path)
+        if image is None:
+            os.remove(file_path)
+            raise ValueError("Uploaded file is not a valid or readable image")
+        height, width = image.shape[:2]
+    else:
+        try:
+            width, height = read_image_size(file_path)
+        except ValueError:
+            os.remove(file_path)
+            raise
     file_size = os.path.getsize(file_path)
     
     # MIME type derivation
@@ -0,0 +1,103 @@
+import threading
+
+# Share of a job's work per top-level stage; stages missing from a run
+# (e.g. ocr without run_ocr) do not count
+STAGE_WEIGHTS = {
+    # link runs inside persist's transaction and is counted with it
+    "PROCESS": {"decode": 5, "detect": 40, "ocr": 25, "rooms": 15, "persist": 15},
+    "GENERATE": {"export_read": 10, "blender_input": 5, "blender_run": 85}
+}
+
+class JobProgress:
+    """
+    StageMetrics listener that turns stage transitions into a job's
+    progress (0-99 while running) and its running stages, and writes them
+    to the job's row for GET /jobs/<id> and /jobs/<id>/events.
+
+    Writes go through JobRepository.update_progress on a connection of
+    their own, only when the progress or the running stages changed.
+    """
+
+    def __init__(self, job_id, job_type, config=None):
+        weights = dict(STAGE_WEIGHTS.get(job_type, {}))
+        if job_type == "PROCESS" and not (config or {}).get("run_ocr", False):
+            weights.pop("ocr", None)
+        self.job_id = job_id
+        self.weights = weights
+        self.total = sum(weights.values()) or 1
+        self.done = set()
+        self.running = []
+        self._written = None
+        self._lock = threading.Lock()
+
+    @property
+    def progress(self):
+        return min(99, 100 * sum(self.weights[name] for name in self.done) // self.total)
+
+    def __call__(self, name, event):
+        if name not in self.weights:
+            # Nested stages (preprocess) do not move the bar
+            return
+        with self._lock:
+            if event == "start":
+                self.running.append(name)
+            else:
+                if name in self.running:
+                    self.running.remove(name)
+                self.done.add(name)
+            state = (self.progress, ",".join(self.running) or None)
+            if state == self._written:
+                return
+            self._written = state
+        self._write(*state)
+
+    def _write(self, progress, stage):
+        from flask import current_app
+        from backend.database.repositories.job_repository import JobRepository
+
+        try:
+            JobRepository.update_progress(self.job_id, progress, stage)
+        except Exception:
+            # Progress is best-effort; the job's outcome is what matters
+            current_app.logger.exception("Could not record progress of job %s", self.job_id)
+
+class JobLease:
+    """
+    Renews a running job's lease every `lease_seconds` / 3 on a thread of
+    its own for as long as the block runs, so that a job in a long stage
+    is told apart from one whose worker was killed (see
+    JobRepository.recover_expired).
+    """
+
+    def __init__(self, job_id, attempt, lease_seconds):
+        self.job_id = job_id
+        self.attempt = attempt
+        self.lease_seconds = float(lease_seconds)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        from flask import current_app
+
+        self._thread = threading.Thread(
+            target=self._renew, args=(current_app._get_current_object(),), name=f"lease-{self.job_id}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _renew(self, app):
+        from backend.database.repositories.job_repository import JobRepository
+
+        with app.app_context():
+            while not self._stop.wait(self.lease_seconds / 3):
+                try:
+                    if not JobRepository.renew_lease(self.job_id, self.attempt, self.lease_seconds):
+                        # Finished, or recovered by another worker
+                        return
+                except Exception:
+                    # The next renewal may still make it in time
+                    app.logger.exception("Could not renew the lease of job %s", self.job_id)
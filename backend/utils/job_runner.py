@@ -0,0 +1,93 @@
+import os
+import threading
+
+class JobRunner:
+    """
+    Executes queued ProcessingJobs on background threads of a server
+    process. The queue is the processing_jobs table: every thread polls it
+    for PENDING jobs and claims one atomically, so any number of web
+    processes and standalone workers (python -m backend.worker) can share
+    it without a broker. A running job holds a lease its thread keeps
+    renewing; when a process is killed mid-job, the next poll (or a
+    client polling the job) finds the lease expired and queues the job
+    again.
+
+    With workers=0 a process only enqueues and leaves execution to
+    standalone workers. Threads start on the first notify() (or start())
+    in each process, so gunicorn workers forked from a preloaded app each
+    get their own.
+    """
+
+    def __init__(self, workers=1, poll_interval=1.0):
+        self.workers = max(int(workers), 0)
+        self.poll_interval = float(poll_interval)
+        self._app = None
+        self._threads = []
+        self._pid = os.getpid()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.shutdown()
+        self._app = app
+        self.workers = max(int(app.config.get('JOB_WORKERS', 1)), 0)
+        self.poll_interval = float(app.config.get('JOB_POLL_INTERVAL', 1.0))
+
+    def start(self, workers=None):
+        workers = self.workers if workers is None else workers
+        with self._lock:
+            if os.getpid() != self._pid:
+                self._threads, self._pid = [], os.getpid()
+                self._wake, self._stop = threading.Event(), threading.Event()
+            if self._threads or not workers or self._app is None:
+                return
+            self._stop.clear()
+            for i in range(workers):
+                thread = threading.Thread(target=self._loop, name=f"job-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def notify(self):
+        """Wakes an idle worker thread after a job was queued."""
+        self.start()
+        self._wake.set()
+
+    def run_pending(self):
+        """Runs queued jobs on the calling thread until the queue is empty."""
+        from backend.services.job_service import JobService
+
+        finished = []
+        while True:
+            job = JobService.run_next()
+            if job is None:
+                return finished
+            finished.append(job)
+
+    def _loop(self):
+        from backend.extensions import db
+
+        while not self._stop.is_set():
+            try:
+                with self._app.app_context():
+                    try:
+                        self.run_pending()
+                    finally:
+                        db.session.remove()
+            except Exception:
+                # Keep the thread alive; the job itself is marked FAILED by JobService
+                self._app.logger.exception("Job runner iteration failed")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def shutdown(self):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads or os.getpid() != self._pid:
+            return
+        self._stop.set()
+        self._wake.set()
+        for thread in threads:
+            thread.join()
+        self._stop.clear()
+        self._wake.clear()
@@ -1,4 +1,5 @@
-from flask import jsonify
+import json
+from flask import Response, jsonify, stream_with_context
 
 def success_response(data=None, meta=None, status_code=200):
     return jsonify({
@@ -19,3 +20,41 @@ def error_response(code, message, details=None, status_code=400):
         },
         "meta": {}
     }), status_code
+
+def job_accepted_response(project_id, job):
+    """202 for a queued job, pointing at the URL that reports its progress."""
+    response, status_code = success_response(data=job, status_code=202)
+    response.headers["Location"] = f"/api/v1/projects/{project_id}/jobs/{job['id']}"
+    return response, status_code
+
+# Lines per chunk written to the socket
+NDJSON_CHUNK_LINES = 500
+
+def ndjson_response(items, status_code=200):
+    """Streams an iterable of dicts as newline-delimited JSON, one object per line."""
+    def generate():
+        lines = []
+        for item in items:
+            lines.append(json.dumps(item))
+            if len(lines) >= NDJSON_CHUNK_LINES:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return Response(stream_with_context(generate()), status=status_code, mimetype="application/x-ndjson")
+
+def event_stream_response(events):
+    """
+    Streams (event, data) pairs as server-sent events; a (None, None) pair
+    is sent as a keep-alive comment.
+    """
+    def generate():
+        for event, data in events:
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,48 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+class StageExecutor:
+    """
+    Per-process thread pool for pipeline stages that run alongside the
+    request thread, e.g. OCR while CV detection runs.
+
+    At most `max_workers` stages run at once in a server process; further
+    submissions queue. With max_workers=0 stages run inline on the caller's
+    thread. Threads do not survive a fork, so a forked worker builds its
+    own pool on first use.
+    """
+
+    def __init__(self, max_workers=2):
+        self.max_workers = max(int(max_workers), 0)
+        self._executor = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.shutdown()
+        self.max_workers = max(int(app.config.get('PROCESSING_CONCURRENCY', 2)), 0)
+
+    def submit(self, fn, *args, **kwargs):
+        if not self.max_workers:
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            if self._executor is None or os.getpid() != self._pid:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage")
+                self._pid = os.getpid()
+            executor = self._executor
+        # Carry context variables (e.g. the run's stage metrics) to the stage thread
+        return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and os.getpid() == self._pid:
+            executor.shutdown(wait=True)
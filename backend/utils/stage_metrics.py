@@ -0,0 +1,192 @@
+import contextvars
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("stage_metrics", default=None)
+
+# tracemalloc is process-wide; it runs while any collector needs it
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+_active_stages = 0
+
+def _cpu_seconds():
+    # Includes finished child processes (Blender) where the OS reports them
+    t = os.times()
+    return time.process_time() + t.children_user + t.children_system
+
+def _rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class _RssSampler:
+    """Polls the resident set size while stages are open and keeps each one's peak."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._peaks = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def open(self):
+        token = object()
+        with self._lock:
+            self._peaks[token] = _rss_kb() or 0
+        return token
+
+    def close(self, token):
+        rss = _rss_kb() or 0
+        with self._lock:
+            return max(self._peaks.pop(token), rss)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            rss = _rss_kb()
+            if rss is None:
+                return
+            with self._lock:
+                for token, peak in self._peaks.items():
+                    if rss > peak:
+                        self._peaks[token] = rss
+
+class StageMetrics:
+    """
+    Wall time, CPU time, memory and item counts of the pipeline stages of
+    one run, collected by stage() blocks anywhere below activate().
+
+    CPU time is process-wide (all threads and finished child processes)
+    while the stage ran, so stages that overlap, such as OCR next to
+    detection, both count the shared time. Stages called inside another
+    one (link inside persist) are also part of the outer stage's
+    time.
+
+    memory is "rss" (peak resident set size of the process while the
+    stage ran, sampled every few milliseconds; Linux only), "tracemalloc"
+    (peak traced Python/NumPy allocation above the stage's start, an
+    upper bound when stages overlap; exact, but it noticeably slows
+    Python-heavy stages such as line detection) or "off".
+    """
+
+    def __init__(self, memory="rss", listener=None):
+        if memory not in ("tracemalloc", "rss", "off"):
+            raise ValueError(f"Unknown memory metric: {memory}")
+        self.memory = memory
+        # Called with (name, "start" | "end") around every stage
+        self.listener = listener
+        self.stages = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._sampler = _RssSampler() if memory == "rss" and _rss_kb() is not None else None
+
+    @contextmanager
+    def activate(self):
+        global _tracing_users, _started_tracing
+        if self.memory == "tracemalloc":
+            with _tracing_lock:
+                if _tracing_users == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _started_tracing = True
+                _tracing_users += 1
+        if self._sampler is not None:
+            self._sampler.start()
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+            if self._sampler is not None:
+                self._sampler.stop()
+            if self.memory == "tracemalloc":
+                with _tracing_lock:
+                    _tracing_users -= 1
+                    if _tracing_users == 0 and _started_tracing:
+                        # Leave tracing alone when someone else started it
+                        tracemalloc.stop()
+                        _started_tracing = False
+
+    def add(self, name, wall, cpu, memory_kb, counts):
+        with self._lock:
+            entry = self.stages.setdefault(name, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0})
+            entry["calls"] += 1
+            entry["wall_ms"] = round(entry["wall_ms"] + wall * 1000, 2)
+            entry["cpu_ms"] = round(entry["cpu_ms"] + cpu * 1000, 2)
+            if memory_kb is not None:
+                key = "peak_kb" if self.memory == "tracemalloc" else "rss_peak_kb"
+                entry[key] = max(entry.get(key, memory_kb), memory_kb)
+            for count, value in counts.items():
+                entry[count] = entry.get(count, 0) + value
+        if self.listener is not None:
+            self.listener(name, "end")
+
+    def to_dict(self):
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self.stages.items()}
+        return {
+            "memory": self.memory,
+            "wall_ms": round((time.perf_counter() - self._started) * 1000, 2),
+            "stages": stages
+        }
+
+@contextmanager
+def stage(name):
+    """
+    Times the block as stage `name` of the active StageMetrics, if any.
+    Yields a dict the block can fill with item counts, e.g.
+    counts["objects"] = len(objects).
+    """
+    global _active_stages
+    metrics = _current.get()
+    counts = {}
+    if metrics is None:
+        yield counts
+        return
+
+    if metrics.listener is not None:
+        metrics.listener(name, "start")
+    traced = metrics.memory == "tracemalloc" and tracemalloc.is_tracing()
+    if traced:
+        with _tracing_lock:
+            if _active_stages == 0:
+                tracemalloc.reset_peak()
+            _active_stages += 1
+        start_traced = tracemalloc.get_traced_memory()[0]
+    sampler = metrics._sampler
+    rss_token = sampler.open() if sampler is not None else None
+    start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+    try:
+        yield counts
+    finally:
+        wall, cpu = time.perf_counter() - start_wall, _cpu_seconds() - start_cpu
+        memory_kb = None
+        if traced:
+            peak = tracemalloc.get_traced_memory()[1]
+            with _tracing_lock:
+                _active_stages -= 1
+            memory_kb = max(peak - start_traced, 0) // 1024
+        elif rss_token is not None:
+            memory_kb = sampler.close(rss_token)
+        metrics.add(name, wall, cpu, memory_kb, counts)
+
+def timed(name, fn, *args, **kwargs):
+    """Calls fn inside stage(name); counts the items of a list result."""
+    with stage(name) as counts:
+        result = fn(*args, **kwargs)
+        if isinstance(result, list):
+            counts["items"] = len(result)
+        return result
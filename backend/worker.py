@@ -0,0 +1,85 @@
+"""
+Standalone job worker: runs queued /process, /generate and batch jobs from
+the processing_jobs table, next to (or instead of) the job threads of the
+web processes. Set JOB_WORKERS=0 on the web server to leave all execution
+to workers started this way.
+
+--processes starts a pool of worker processes (default: one per core),
+each running --threads jobs at a time. Processes do not share a GIL, so
+batch throughput grows with the number of cores. --drain exits once the
+queue is empty instead of waiting for new jobs.
+
+Usage:
+    python -m backend.worker
+    python -m backend.worker --processes 8 --threads 1
+    python -m backend.worker --processes 1 --threads 2 --drain
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import threading
+
+def serve(threads, drain):
+    """Runs jobs in this process until stopped (or, with `drain`, until the queue is empty)."""
+    from backend.app import create_app
+    from backend.extensions import db, job_runner
+
+    app = create_app(os.getenv("FLASK_ENV", "development"))
+
+    if drain:
+        def run():
+            with app.app_context():
+                try:
+                    job_runner.run_pending()
+                finally:
+                    db.session.remove()
+
+        workers = [threading.Thread(target=run, name=f"job-{i}") for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return
+
+    job_runner.start(workers=threads)
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    # Finishes the jobs in progress; pending ones stay queued for the next worker
+    job_runner.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=0, help="worker processes (0: one per core)")
+    parser.add_argument("--threads", type=int, default=1, help="jobs run at once per process")
+    parser.add_argument("--drain", action="store_true", help="exit once no job is pending")
+    args = parser.parse_args()
+
+    processes = args.processes or os.cpu_count() or 1
+    threads = max(args.threads, 1)
+    if processes == 1:
+        serve(threads, args.drain)
+        return
+
+    # Each child builds its own app and connections; nothing is inherited
+    context = multiprocessing.get_context("spawn")
+    children = [
+        context.Process(target=serve, args=(threads, args.drain), name=f"worker-{i}")
+        for i in range(processes)
+    ]
+    for child in children:
+        child.start()
+    # Children stop gracefully on SIGTERM; Ctrl+C reaches them directly
+    signal.signal(signal.SIGTERM, lambda *_: [child.terminate() for child in children])
+    for child in children:
+        try:
+            child.join()
+        except KeyboardInterrupt:
+            child.join()
+
+if __name__ == "__main__":
+    main()
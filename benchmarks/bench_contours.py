@@ -0,0 +1,61 @@
+"""
+Runtime of contour classification on speckled scans against the original
+per-contour RETR_TREE loop.
+
+Speckle is random ink dilated into small blobs, which yields hundreds of
+thousands of tiny contours the size filter rejects, plus a few walls so
+both paths have something to classify.
+
+Usage:
+    python -m benchmarks.bench_contours --size 4000 --densities 0.02 0.08
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from backend.cv.contour_detector import detect_contours
+
+def original_detect(morphed, min_size=10, min_door_size=20):
+    contours, _ = cv2.findContours(morphed, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    detected = []
+    for contour in contours:
+        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        x, y, w, h = cv2.boundingRect(approx)
+        if w < min_size or h < min_size:
+            continue
+        if len(approx) >= 4 and ((w / h > 3.0) or (h / w > 3.0)):
+            detected.append((x, y, w, h, "WALL"))
+        elif w >= min_door_size and h >= min_door_size:
+            detected.append((x, y, w, h, "DOOR"))
+    return detected
+
+def speckled_mask(size, density, seed=0):
+    rng = np.random.default_rng(seed)
+    mask = ((rng.random((size, size)) < density) * 255).astype(np.uint8)
+    mask = cv2.dilate(mask, np.ones((2, 2), np.uint8))
+    for offset in range(size // 8, size, size // 4):
+        cv2.rectangle(mask, (offset, offset // 2), (offset + size // 10, offset // 2 + 20), 255, -1)
+    return mask
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=4000)
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.02, 0.08])
+    args = parser.parse_args()
+
+    print(f"{'density':>8} {'contours':>9} {'original s':>11} {'batched s':>10} {'speedup':>8} {'objects':>8}")
+    for density in args.densities:
+        mask = speckled_mask(args.size, density)
+        contours = len(cv2.findContours(mask, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[0])
+        _, original_s = timed(original_detect, mask)
+        objects, batched_s = timed(detect_contours, mask)
+        print(f"{density:>8.2f} {contours:>9} {original_s:>11.2f} {batched_s:>10.2f} "
+              f"{original_s / max(batched_s, 1e-6):>7.1f}x {len(objects):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Scaling benchmark for the Hough duplicate-segment filter.
+
+Generates synthetic wall-like segment sets of growing size (each wall drawn
+as several jittered Hough fragments) and times the grid-indexed filter
+against the original pairwise loop. The pairwise loop is skipped above
+--max-naive segments because it grows quadratically.
+
+Usage:
+    python -m benchmarks.bench_line_filter --sizes 1000 5000 20000 50000
+"""
+import argparse
+import math
+import time
+import numpy as np
+from backend.cv.line_detector import filter_duplicate_segments, distance
+
+def synthetic_segments(count, width=6000, height=4000, fragments=4, seed=0):
+    rng = np.random.default_rng(seed)
+    walls = max(count // fragments, 1)
+    x1 = rng.integers(0, width, size=walls)
+    y1 = rng.integers(0, height, size=walls)
+    horizontal = rng.random(walls) < 0.5
+    length = rng.integers(50, 600, size=walls)
+    x2 = np.where(horizontal, x1 + length, x1)
+    y2 = np.where(horizontal, y1, y1 + length)
+    base = np.stack([x1, y1, x2, y2], axis=1)
+    segments = base[rng.integers(0, walls, size=count)]
+    return (segments + rng.integers(-8, 9, size=segments.shape)).tolist()
+
+def pairwise_filter(segments, min_distance=15.0):
+    kept = []
+    for x1, y1, x2, y2 in segments:
+        p1, p2 = (x1, y1), (x2, y2)
+        duplicate = False
+        for (fp1, fp2) in kept:
+            v1 = (x2 - x1, y2 - y1)
+            v2 = (fp2[0] - fp1[0], fp2[1] - fp1[1])
+            mag1 = math.sqrt(v1[0]**2 + v1[1]**2)
+            mag2 = math.sqrt(v2[0]**2 + v2[1]**2)
+            if mag1 > 0 and mag2 > 0:
+                if abs(v1[0]*v2[1] - v1[1]*v2[0]) / (mag1 * mag2) < 0.05:
+                    if distance(p1, fp1) < min_distance and distance(p2, fp2) < min_distance:
+                        duplicate = True
+                        break
+        if not duplicate:
+            kept.append((p1, p2))
+    return len(kept)
+
+def time_call(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000, 100000])
+    parser.add_argument("--max-naive", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'segments':>10} {'kept':>8} {'grid ms':>10} {'pairwise ms':>12} {'speedup':>8}")
+    for size in args.sizes:
+        segments = synthetic_segments(size)
+        keep, grid_ms = time_call(filter_duplicate_segments, segments)
+        kept = int(keep.sum())
+
+        naive = "-"
+        speedup = "-"
+        if size <= args.max_naive:
+            naive_kept, naive_ms = time_call(pairwise_filter, segments)
+            if naive_kept != kept:
+                raise AssertionError(f"Filter mismatch at {size}: {kept} vs {naive_kept}")
+            naive = f"{naive_ms:.1f}"
+            speedup = f"{naive_ms / max(grid_ms, 1e-6):.0f}x"
+
+        print(f"{size:>10} {kept:>8} {grid_ms:>10.1f} {naive:>12} {speedup:>8}")
+
+if __name__ == "__main__":
+    main()
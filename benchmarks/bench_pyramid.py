@@ -0,0 +1,97 @@
+"""
+Runtime and wall recall of coarse-to-fine pyramid detection against the
+single-scale path.
+
+Runs on a synthetic large-format plan (thick walls, door symbols and text
+labels on white paper) and on every image in samples/ upscaled to the
+same long side. Recall is the share of single-scale walls the pyramid run
+also reports: exact box matches in contour mode, rasterised coverage
+within a wall width in line mode.
+
+Usage:
+    python -m benchmarks.bench_pyramid --long-side 8000 --factors 4 8
+"""
+import argparse
+import glob
+import os
+import time
+import cv2
+import numpy as np
+from backend.cv.preprocessing import preprocess_gray
+from backend.cv.contour_detector import detect_contours
+from backend.cv.line_detector import detect_lines
+from backend.cv.pyramid import detect_pyramid
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "samples")
+
+def synthetic_plan(width, height, seed=1):
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width), 255, np.uint8)
+    cv2.rectangle(image, (200, 200), (width - 200, height - 200), 0, 14)
+    for x in range(1400, width - 400, 1300):
+        cv2.line(image, (x, 200), (x, height - 200), 0, 10)
+    for y in range(1500, height - 400, 1400):
+        cv2.line(image, (200, y), (width - 200, y), 0, 10)
+    for _ in range(40):
+        x, y = rng.integers(400, width - 600), rng.integers(400, height - 600)
+        cv2.rectangle(image, (int(x), int(y)), (int(x) + 120, int(y) + 90), 0, 4)
+    for i in range(60):
+        x, y = rng.integers(400, width - 600), rng.integers(400, height - 600)
+        cv2.putText(image, f"ROOM {i}", (int(x), int(y)), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 3)
+    return image
+
+def load_pages(long_side):
+    height = long_side * 3 // 4
+    yield "synthetic", synthetic_plan(long_side, height)
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*"))):
+        gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            continue
+        scale = long_side / max(gray.shape)
+        yield os.path.basename(path), cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+
+def single_scale(gray, mode):
+    blurred, morphed = preprocess_gray(gray)
+    return detect_contours(morphed) if mode == "contour" else detect_lines(blurred)
+
+def wall_recall(reference, candidate, mode, shape):
+    if mode == "contour":
+        key = lambda o: (o["object_type"], o["x"], o["y"], o["width"], o["height"])
+        walls = [key(o) for o in reference if o["object_type"] == "WALL"]
+        found = set(map(key, candidate))
+        return sum(w in found for w in walls) / len(walls) if walls else 1.0
+
+    def render(objects, thickness):
+        canvas = np.zeros(shape, np.uint8)
+        for o in objects:
+            cv2.line(canvas, (o["x1"], o["y1"]), (o["x2"], o["y2"]), 255, thickness)
+        return canvas > 0
+
+    ref = render(reference, 3)
+    near = cv2.dilate(render(candidate, 3).astype(np.uint8), np.ones((25, 25), np.uint8)) > 0
+    return (ref & near).sum() / ref.sum() if ref.any() else 1.0
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--long-side", type=int, default=8000)
+    parser.add_argument("--factors", type=int, nargs="+", default=[4, 8])
+    parser.add_argument("--modes", nargs="+", default=["contour", "line"])
+    args = parser.parse_args()
+
+    print(f"{'page':<22} {'mode':<8} {'factor':>6} {'single s':>9} {'pyramid s':>10} {'speedup':>8} {'recall':>7}")
+    for name, gray in load_pages(args.long_side):
+        for mode in args.modes:
+            reference, single_s = timed(single_scale, gray, mode)
+            for factor in args.factors:
+                objects, pyramid_s = timed(detect_pyramid, gray, mode, factor=factor)
+                recall = wall_recall(reference, objects, mode, gray.shape)
+                print(f"{name:<22} {mode:<8} {factor:>6} {single_s:>9.2f} {pyramid_s:>10.2f} "
+                      f"{single_s / max(pyramid_s, 1e-6):>7.1f}x {recall:>7.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Door-to-wall association through the segment grid against the naive
+walls x doors scan.
+
+Synthetic plans place axis-aligned and diagonal wall segments at a fixed
+density and one door per five walls, a third of them next to a wall.
+The naive scan is chunked to bound memory and skipped above --max-naive
+walls because it grows with walls x doors.
+
+Usage:
+    python -m benchmarks.bench_spatial_index --walls 10000 50000 200000
+"""
+import argparse
+import time
+import numpy as np
+from backend.cv.spatial_index import SegmentGrid, point_segment_distance
+
+def synthetic_plan(walls, seed=0):
+    rng = np.random.default_rng(seed)
+    size = int(np.sqrt(walls) * 300)
+    x, y = rng.uniform(0, size, walls), rng.uniform(0, size, walls)
+    length = rng.uniform(50, 800, walls)
+    angle = rng.choice([0.0, np.pi / 2, np.pi / 4], walls)
+    segments = np.stack([x, y, x + length * np.cos(angle), y + length * np.sin(angle)], axis=1)
+
+    doors = rng.uniform(0, size, (walls // 5, 2))
+    # Put a third of the doors on a wall
+    hosted = rng.random(len(doors)) < 1 / 3
+    hosts = rng.integers(0, walls, hosted.sum())
+    t = rng.random(len(hosts))[:, None]
+    on_wall = segments[hosts, 0:2] + t * (segments[hosts, 2:4] - segments[hosts, 0:2])
+    doors[hosted] = on_wall + rng.normal(0, 10, (len(hosts), 2))
+    return segments, doors
+
+def naive_nearest(segments, points, max_distance, chunk=64):
+    indices = np.full(len(points), -1, dtype=np.int64)
+    for start in range(0, len(points), chunk):
+        block = points[start:start + chunk]
+        d = point_segment_distance(np.repeat(block, len(segments), axis=0), np.tile(segments, (len(block), 1)))
+        d = d.reshape(len(block), len(segments))
+        best = d.argmin(axis=1)
+        indices[start:start + chunk] = np.where(d[np.arange(len(block)), best] <= max_distance, best, -1)
+    return indices
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--walls", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--max-distance", type=float, default=64.0)
+    parser.add_argument("--cell-size", type=float, default=64.0)
+    parser.add_argument("--max-naive", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'walls':>8} {'doors':>7} {'build s':>8} {'query s':>8} {'naive s':>8} {'speedup':>8} {'linked':>7} {'agree':>6}")
+    for walls in args.walls:
+        segments, doors = synthetic_plan(walls)
+        grid, build_s = timed(SegmentGrid, segments, cell_size=args.cell_size)
+        (indices, _), query_s = timed(grid.nearest, doors, args.max_distance)
+        linked = (indices >= 0).mean()
+
+        if walls <= args.max_naive:
+            expected, naive_s = timed(naive_nearest, segments, doors, args.max_distance)
+            agree = f"{(expected == indices).mean():.3f}"
+            naive = f"{naive_s:>8.2f}"
+            speedup = f"{naive_s / (build_s + query_s):>7.1f}x"
+        else:
+            agree, naive, speedup = "-", f"{'-':>8}", f"{'-':>8}"
+        print(f"{walls:>8} {len(doors):>7} {build_s:>8.3f} {query_s:>8.3f} {naive} {speedup} {linked:>7.3f} {agree:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Regression benchmark for the CV and OCR pipeline over samples/.
+
+Times preprocess_image (counting wall-mask pixels), detect_contours and
+detect_lines on every sample image, the dimension and room-name parsers
+on a fixed corpus of OCR tokens, and ObjectRepository.save_detected_objects
+against an in-memory SQLite database. For every case it records the best wall-clock time of
+--repeat runs, the peak Python/NumPy allocation of one traced run and the
+number of results, and compares them to a stored baseline.
+
+The run fails (exit status 1) when a case is slower or uses more memory
+than the baseline by more than --threshold, or when a result count
+changes. Runs offline; no Tesseract, Blender or Postgres is needed.
+Baselines are machine-specific: refresh them with --update-baseline on
+the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --threshold 0.3 --repeat 9
+    python -m benchmarks.suite --update-baseline
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from backend.cv.preprocessing import preprocess_image
+from backend.cv.contour_detector import detect_contours
+from backend.cv.line_detector import detect_lines
+from backend.ocr.dimension_parser import DimensionParser
+from backend.ocr.room_name_parser import RoomNameParser
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SAMPLES_DIR = os.path.join(ROOT, "samples")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Reference workload stored alongside the cases
+CALIBRATION = "_calibration"
+
+# Differences below this many seconds are timer noise, not regressions
+MIN_SECONDS = 0.002
+
+OCR_TOKENS = [
+    "12x10", "12 ft x 10 ft", "3.5m x 4.2m", "14'x16'", "2400mm x 3600mm", "10.5 X 12",
+    "BEDROOM", "Master Bedroom", "KITCHEN", "Living Room", "DINING", "Bath", "W.C.",
+    "Store Room", "BALCONY", "Office", "Garage", "Closet", "Hall", "Toilet",
+    "N", "UP", "DN", "SCALE 1:100", "A-101", "REV B", "NOTES:", "0.9", "FFL+0.00",
+]
+
+def parser_corpus(size=5000):
+    return [OCR_TOKENS[i % len(OCR_TOKENS)] for i in range(size)]
+
+def sample_paths():
+    return sorted(glob.glob(os.path.join(SAMPLES_DIR, "*")))
+
+def measure(fn, repeat, min_time=0.25):
+    """
+    Returns (best seconds, peak KiB, result) for `fn`. Runs at least
+    `repeat` times and for at least `min_time` seconds so short cases get
+    enough samples for the minimum to be stable.
+    """
+    best = float("inf")
+    runs = 0
+    began = time.perf_counter()
+    while runs < repeat or time.perf_counter() - began < min_time:
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+        runs += 1
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1024.0, result
+
+def calibrate():
+    """
+    Times a fixed mixed NumPy/OpenCV and pure-Python workload. Case times
+    are compared relative to it so a uniformly slower or busier machine
+    does not read as a regression.
+    """
+    image = np.tile(np.arange(256, dtype=np.uint8), (1024, 4))
+
+    def workload():
+        cv2.GaussianBlur(image, (5, 5), 0)
+        cv2.Canny(image, 50, 150)
+        return sum(i * i for i in range(100000))
+
+    return measure(workload, repeat=10, min_time=0.5)[0]
+
+def _make_app():
+    from backend.app import create_app
+    from backend.extensions import db
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+    return app
+
+def run_suite(repeat=5, paths=None):
+    from backend.extensions import db, image_cache
+    from backend.database.repositories.project_repository import ProjectRepository
+    from backend.database.repositories.object_repository import ObjectRepository
+
+    results = {CALIBRATION: {"seconds": round(calibrate(), 6), "peak_kb": 0.0, "count": 0}}
+
+    def record(name, fn, count=len):
+        seconds, peak_kb, result = measure(fn, repeat)
+        results[name] = {
+            "seconds": round(seconds, 6),
+            "peak_kb": round(peak_kb, 1),
+            "count": count(result)
+        }
+        return result
+
+    corpus = parser_corpus()
+    record("parsers/dimension", lambda: [t for t in corpus if DimensionParser.parse(t)])
+    record("parsers/room_name", lambda: [t for t in corpus if RoomNameParser.parse(t)])
+
+    app = _make_app()
+    for path in paths if paths is not None else sample_paths():
+        name = os.path.basename(path)
+
+        def preprocess():
+            # Measure the decode too, not a cache hit
+            image_cache.clear()
+            return preprocess_image(path)
+
+        _, _, blurred, morphed = record(f"{name}/preprocess_image", preprocess,
+                                        count=lambda r: int(np.count_nonzero(r[3])))
+        contours = record(f"{name}/detect_contours", lambda: detect_contours(morphed))
+        lines = record(f"{name}/detect_lines", lambda: detect_lines(blurred))
+
+        with app.app_context():
+            def save():
+                project = ProjectRepository.create(f"bench {name}")
+                return ObjectRepository.save_detected_objects(project.id, contours + lines)
+
+            record(f"{name}/save_detected_objects", save)
+            db.session.remove()
+
+    return results
+
+def compare(results, baseline, threshold, min_seconds=MIN_SECONDS):
+    """
+    Returns a list of human-readable regressions against `baseline`. Times
+    are scaled by how much slower the calibration workload ran.
+    """
+    scale = 1.0
+    if CALIBRATION in baseline and CALIBRATION in results:
+        scale = results[CALIBRATION]["seconds"] / max(baseline[CALIBRATION]["seconds"], 1e-9)
+
+    failures = []
+    for name, base in sorted(baseline.items()):
+        if name == CALIBRATION:
+            continue
+        current = results.get(name)
+        if current is None:
+            failures.append(f"{name}: missing from this run")
+            continue
+        if current["count"] != base["count"]:
+            failures.append(f"{name}: count {base['count']} -> {current['count']}")
+        expected = base["seconds"] * scale
+        if current["seconds"] - expected > min_seconds and current["seconds"] > expected * (1 + threshold):
+            failures.append(f"{name}: time {expected:.4f}s (scaled baseline) -> {current['seconds']:.4f}s")
+        if current["peak_kb"] > base["peak_kb"] * (1 + threshold) + 64:
+            failures.append(f"{name}: peak memory {base['peak_kb']:.0f} KiB -> {current['peak_kb']:.0f} KiB")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("BENCH_REGRESSION_THRESHOLD", 0.5)),
+                        help="allowed relative slowdown or memory growth (default 0.5)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_suite(repeat=args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'case':<42} {'seconds':>9} {'base s':>9} {'peak KiB':>9} {'count':>7}")
+    for name, current in sorted(results.items()):
+        base = baseline.get(name, {}).get("seconds")
+        base_text = f"{base:>9.4f}" if base is not None else f"{'-':>9}"
+        print(f"{name:<42} {current['seconds']:>9.4f} {base_text} {current['peak_kb']:>9.0f} {current['count']:>7}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("No baseline found; run with --update-baseline to create one")
+        return 0
+
+    failures = compare(results, baseline, args.threshold)
+    if failures:
+        print(f"\n{len(failures)} regression(s) above {args.threshold:.0%}:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"\nNo regressions above {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import requests
 import json
 import os
+import time
+import uuid
 
 class ApiClient:
     def __init__(self, base_url="http://127.0.0.1:5000/api/v1"):
@@ -24,13 +26,122 @@ class ApiClient:
 
     def process_project(self, project_id, config):
         url = f"{self.base_url}/projects/{project_id}/process"
-        response = requests.post(url, json=config, timeout=60) # Longer timeout for processing
+        return self._post_idempotent(url, config) # Queues a job (202)
+        
+    def get_detections(self, project_id, cursor=None, limit=500, fields=None):
+        url = f"{self.base_url}/projects/{project_id}/detections"
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        if fields:
+            params["fields"] = ",".join(fields)
+        response = requests.get(url, params=params, timeout=self.timeout)
         response.raise_for_status()
         return response.json()
-        
+
+    def iter_detection_pages(self, project_id, limit=500, fields=None):
+        """Yields detection pages in order, following next_cursor until the last one."""
+        cursor = None
+        while True:
+            body = self.get_detections(project_id, cursor=cursor, limit=limit, fields=fields)
+            yield body['data']
+            cursor = body['meta'].get('next_cursor')
+            if not cursor:
+                return
+
     def generate_model(self, project_id, config):
         url = f"{self.base_url}/projects/{project_id}/generate"
-        response = requests.post(url, json=config, timeout=120) # Blender can take time
+        return self._post_idempotent(url, config) # Queues a job (202)
+
+    def get_job(self, project_id, job_id):
+        url = f"{self.base_url}/projects/{project_id}/jobs/{job_id}"
+        response = requests.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def job_events(self, project_id, job_id):
+        """Yields (event, data) from the job's server-sent event stream until the server closes it."""
+        url = f"{self.base_url}/projects/{project_id}/jobs/{job_id}/events"
+        # The server sends at least a keep-alive every 15 s
+        with requests.get(url, stream=True, timeout=(self.timeout, 60)) as response:
+            response.raise_for_status()
+            event, data = None, []
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    field, _, value = line.partition(":")
+                    if field == "event":
+                        event = value.strip()
+                    elif field == "data":
+                        data.append(value.strip())
+                    continue
+                if event and data:
+                    yield event, json.loads("\n".join(data))
+                event, data = None, []
+
+    def wait_for_job(self, project_id, job_id, on_update=None):
+        """
+        Follows a job's progress events until it finishes; returns the
+        finished job and raises if it failed.
+        """
+        while True:
+            for event, data in self.job_events(project_id, job_id):
+                if event == "progress" and on_update:
+                    on_update(data)
+                elif event == "done":
+                    if data['status'] == 'FAILED':
+                        raise RuntimeError(data.get('message') or f"Job {job_id} failed")
+                    return data
+            # The stream timed out before the job finished; reconnect
+
+    def create_batch(self, file_paths, config, generate=None):
+        """
+        Uploads many blueprints (images or .zip archives of images) as one
+        batch; each becomes a project processed with `config` and, when
+        `generate` is given, generated with it.
+        """
+        url = f"{self.base_url}/batches"
+        data = {"config": json.dumps(config)}
+        if generate is not None:
+            data["generate"] = json.dumps(generate)
+        return self._post_files(url, file_paths, data)
+
+    def add_batch_items(self, batch_id, file_paths):
+        return self._post_files(f"{self.base_url}/batches/{batch_id}/items", file_paths, {})
+
+    def get_batch(self, batch_id):
+        response = requests.get(f"{self.base_url}/batches/{batch_id}", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _post_idempotent(self, url, payload, attempts=3):
+        """
+        POSTs with one Idempotency-Key for all attempts, so a retry after a
+        timeout or a dropped connection gets the original job back instead
+        of queuing the work again.
+        """
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        for attempt in range(attempts):
+            try:
+                response = requests.post(url, json=payload, headers=headers, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError):
+                if attempt == attempts - 1:
+                    raise
+                continue
+            # 409: the first attempt is still being handled by the server
+            if response.status_code == 409 and attempt < attempts - 1:
+                time.sleep(1)
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    def _post_files(self, url, file_paths, data):
+        handles = [open(path, 'rb') for path in file_paths]
+        try:
+            files = [('files', (os.path.basename(path), f)) for path, f in zip(file_paths, handles)]
+            response = requests.post(url, files=files, data=data, timeout=self.timeout)
+        finally:
+            for f in handles:
+                f.close()
         response.raise_for_status()
         return response.json()
 
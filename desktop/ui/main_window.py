@@ -2,12 +2,12 @@ import sys
 import os
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, 
                              QHBoxLayout, QWidget, QLabel, QFileDialog, QProgressBar, 
-                             QSpacerItem, QSizePolicy, QLineEdit, QMessageBox)
+                             QSpacerItem, QSizePolicy, QLineEdit, QMessageBox, QListWidget)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
 from desktop.api_client import ApiClient
-from desktop.workers import UploadAndProcessWorker, GenerationWorker
+from desktop.workers import UploadAndProcessWorker, GenerationWorker, DetectionsWorker
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -71,6 +71,10 @@ class MainWindow(QMainWindow):
         
         self.status_label = QLabel('Ready')
         layout.addWidget(self.status_label)
+
+        # Detections
+        self.detections_list = QListWidget()
+        layout.addWidget(self.detections_list)
         
         container = QWidget()
         container.setLayout(layout)
@@ -108,7 +112,22 @@ class MainWindow(QMainWindow):
     def on_processing_done(self, result):
         self.process_btn.setEnabled(True)
         self.generate_btn.setEnabled(True)
+        self.load_detections()
         QMessageBox.information(self, "Success", "Processing complete!")
+
+    def load_detections(self):
+        self.detections_list.clear()
+        self.detections_worker = DetectionsWorker(self.project_id)
+        self.detections_worker.page.connect(self.on_detections_page)
+        self.detections_worker.finished.connect(lambda total: self.status_label.setText(f"{total} detections"))
+        self.detections_worker.error.connect(self.on_error)
+        self.detections_worker.start()
+
+    def on_detections_page(self, items):
+        for item in items:
+            confidence = item.get('confidence')
+            score = f" ({confidence:.2f})" if confidence is not None else ""
+            self.detections_list.addItem(f"{item['object_type']} #{item['id']}{score}")
         
     def generate_model(self):
         if not self.project_id:
@@ -125,7 +144,7 @@ class MainWindow(QMainWindow):
         
     def on_generation_done(self, result):
         self.generate_btn.setEnabled(True)
-        export_id = result['data']['id']
+        export_id = result['id']
         QMessageBox.information(self, "Success", f"Model generated! Ready to download export ID: {export_id}")
         
     def on_error(self, err_msg):
@@ -21,15 +21,22 @@ class UploadAndProcessWorker(QThread):
             self.client.upload_blueprint(self.project_id, self.file_path)
             
             self.status.emit("Processing image...")
-            self.progress.emit(50)
-            result = self.client.process_project(self.project_id, self.config)
+            self.progress.emit(30)
+            job = self.client.process_project(self.project_id, self.config)['data']
+            job = self.client.wait_for_job(self.project_id, job['id'], on_update=self.on_job_update)
             
             self.status.emit("Done!")
             self.progress.emit(100)
-            self.finished.emit(result)
+            self.finished.emit(job['result'])
         except Exception as e:
             self.error.emit(str(e))
 
+    def on_job_update(self, update):
+        # The job's 0-100 maps onto the remaining 30-100 of the bar
+        self.progress.emit(30 + update['progress'] * 70 // 100)
+        if update['stage']:
+            self.status.emit(f"Processing image ({update['stage']})...")
+
 class GenerationWorker(QThread):
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
@@ -45,11 +52,42 @@ class GenerationWorker(QThread):
     def run(self):
         try:
             self.status.emit("Generating 3D model with Blender...")
-            self.progress.emit(50)
-            result = self.client.generate_model(self.project_id, self.config)
+            self.progress.emit(10)
+            job = self.client.generate_model(self.project_id, self.config)['data']
+            job = self.client.wait_for_job(self.project_id, job['id'], on_update=self.on_job_update)
             
             self.status.emit("Model generated!")
             self.progress.emit(100)
-            self.finished.emit(result)
+            self.finished.emit(job['result'])
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def on_job_update(self, update):
+        self.progress.emit(max(10, update['progress']))
+        if update['stage'] == 'blender_run':
+            self.status.emit("Running Blender...")
+
+class DetectionsWorker(QThread):
+    page = pyqtSignal(list)
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    # Only what the list view shows
+    FIELDS = ["id", "object_type", "confidence"]
+
+    def __init__(self, project_id, page_size=500):
+        super().__init__()
+        self.project_id = project_id
+        self.page_size = page_size
+        self.client = ApiClient()
+
+    def run(self):
+        # Each page is emitted as soon as it arrives so the view fills in progressively
+        try:
+            total = 0
+            for items in self.client.iter_detection_pages(self.project_id, limit=self.page_size, fields=self.FIELDS):
+                total += len(items)
+                self.page.emit(items)
+            self.finished.emit(total)
         except Exception as e:
             self.error.emit(str(e))
@@ -0,0 +1,27 @@
+import cv2
+import pytest
+from backend.app import create_app
+from backend.extensions import db
+from backend.database.repositories.blueprint_repository import BlueprintRepository
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app("testing")
+    app.config.update(UPLOAD_FOLDER=str(tmp_path))
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def upload():
+    """Stores `image` at `path` and registers it as the project's blueprint."""
+    def save(project, image, path, previous=None):
+        cv2.imwrite(str(path), image)
+        return BlueprintRepository.create(project.id, {
+            "original_filename": path.name, "stored_filename": path.name, "file_path": str(path),
+            "mime_type": "image/png", "file_size": path.stat().st_size,
+            "image_width": image.shape[1], "image_height": image.shape[0]
+        }, previous=previous)
+    return save
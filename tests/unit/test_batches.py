@@ -0,0 +1,69 @@
+import io
+import zipfile
+import cv2
+import numpy as np
+from backend.extensions import job_runner
+from backend.services.export_service import ExportService
+
+def png(seed):
+    image = np.full((300, 400), 255, np.uint8)
+    cv2.rectangle(image, (20, 20), (380, 280), 0, 6)
+    cv2.rectangle(image, (60 + seed * 10, 60), (200, 160), 0, 3)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+def archive(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+def test_batch_creates_projects_and_reports_aggregate_progress(app, monkeypatch):
+    monkeypatch.setattr(ExportService, "generate_model", lambda public_id, config: {"id": 1, "message": "ok"})
+    client = app.test_client()
+    response = client.post("/api/v1/batches", data={
+        "files": [
+            (io.BytesIO(png(0)), "ground.png"),
+            (archive({"plans/first.png": png(1), "plans/second.png": png(2), "__MACOSX/._first.png": b"x",
+                      "notes.txt": b"not a plan"}), "portfolio.zip"),
+            (io.BytesIO(b"garbage"), "broken.png")
+        ],
+        "config": '{"detection_mode": "contour"}',
+        "generate": '{"format": "glb"}'
+    }, content_type="multipart/form-data")
+    assert response.status_code == 202
+    data = response.get_json()["data"]
+    assert sorted(item["name"] for item in data["accepted"]) == ["first", "ground", "second"]
+    assert sorted(item["filename"] for item in data["rejected"]) == ["broken.png", "notes.txt"]
+
+    url = f"/api/v1/batches/{data['batch_id']}"
+    batch = client.get(url).get_json()["data"]
+    assert batch["status"] == "PENDING" and batch["total"] == 3 and batch["progress"] == 0
+
+    finished = job_runner.run_pending()
+    # Every processed item is followed by its GENERATE job
+    assert sorted(job["job_type"] for job in finished) == ["GENERATE"] * 3 + ["PROCESS"] * 3
+
+    batch = client.get(url).get_json()["data"]
+    assert batch["status"] == "COMPLETED" and batch["progress"] == 100
+    assert batch["counts"] == {"pending": 0, "running": 0, "completed": 3, "failed": 0}
+    item = batch["items"][0]
+    assert [job["job_type"] for job in item["jobs"]] == ["PROCESS", "GENERATE"]
+    assert item["jobs"][0]["result"]["detected_objects"] > 0
+
+def test_items_can_be_added_and_limits_apply(app):
+    client = app.test_client()
+    app.config.update(BATCH_MAX_ITEMS=2, BATCH_MAX_ARCHIVE_MB=0)
+    data = client.post("/api/v1/batches", data={"files": [(io.BytesIO(png(0)), "a.png")]},
+                       content_type="multipart/form-data").get_json()["data"]
+
+    added = client.post(f"/api/v1/batches/{data['batch_id']}/items", data={
+        "files": [(io.BytesIO(png(1)), "b.png"), (io.BytesIO(png(2)), "c.png"),
+                  (archive({"d.png": png(3)}), "more.zip")]
+    }, content_type="multipart/form-data").get_json()["data"]
+    assert [item["name"] for item in added["accepted"]] == ["b"]
+    assert [item["filename"] for item in added["rejected"]] == ["c.png", "more.zip"]
+
+    assert client.post("/api/v1/batches", data={}, content_type="multipart/form-data").status_code == 400
+    assert client.get("/api/v1/batches/missing").status_code == 404
@@ -0,0 +1,26 @@
+import os
+from benchmarks.suite import compare, run_suite, SAMPLES_DIR, CALIBRATION
+
+def case(seconds, peak_kb=100.0, count=10):
+    return {"seconds": seconds, "peak_kb": peak_kb, "count": count}
+
+def test_compare_flags_slowdowns_memory_and_count_changes():
+    baseline = {CALIBRATION: case(0.01), "a": case(0.1), "b": case(0.1), "c": case(0.1), "d": case(0.1)}
+    results = {CALIBRATION: case(0.01), "a": case(0.12), "b": case(0.2),
+               "c": case(0.1, peak_kb=1000.0), "d": case(0.1, count=11)}
+    failures = compare(results, baseline, threshold=0.5)
+    assert [f.split(":")[0] for f in failures] == ["b", "c", "d"]
+
+def test_compare_scales_by_calibration():
+    baseline = {CALIBRATION: case(0.01), "a": case(0.1)}
+    slower_machine = {CALIBRATION: case(0.02), "a": case(0.2)}
+    assert compare(slower_machine, baseline, threshold=0.25) == []
+    assert compare(slower_machine, {"a": case(0.1)}, threshold=0.25) != []
+
+def test_suite_runs_offline_on_a_sample():
+    results = run_suite(repeat=1, paths=[os.path.join(SAMPLES_DIR, "images.png")])
+    for stage in ("preprocess_image", "detect_contours", "detect_lines", "save_detected_objects"):
+        assert results[f"images.png/{stage}"]["seconds"] > 0
+    assert results["images.png/save_detected_objects"]["count"] == (
+        results["images.png/detect_contours"]["count"] + results["images.png/detect_lines"]["count"])
+    assert results["parsers/room_name"]["count"] > 0
@@ -0,0 +1,58 @@
+from sqlalchemy import event
+from backend.extensions import db
+from backend.database.repositories.object_repository import ObjectRepository
+from backend.database.repositories.ocr_repository import OCRRepository
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.models.detected_object import DetectedObject
+from backend.models.door import Door
+from backend.models.wall import Wall
+
+def detections(count):
+    objects = []
+    for i in range(count):
+        if i % 3 == 2:
+            objects.append({"object_type": "DOOR", "x": i, "y": 0, "width": 40, "height": 20, "confidence": 0.5})
+        else:
+            objects.append({"object_type": "WALL", "x1": i, "y1": 0, "x2": i, "y2": 100, "confidence": 0.9})
+    return objects
+
+def test_walls_and_doors_keep_their_detected_object(app):
+    project = ProjectRepository.create("Bulk")
+    objects = detections(30)
+    ids = ObjectRepository.save_detected_objects(project.id, objects)
+
+    stored = {o.id: o for o in DetectedObject.query.filter_by(project_id=project.id)}
+    assert sorted(ids) == sorted(stored) and len(set(ids)) == 30
+    for object_id, data in zip(ids, objects):
+        assert stored[object_id].object_type == data["object_type"]
+        assert stored[object_id].created_at is not None
+
+    walls = Wall.query.filter_by(project_id=project.id).all()
+    doors = Door.query.filter_by(project_id=project.id).all()
+    assert len(walls) == 20 and len(doors) == 10
+    assert all(w.start_x == stored[w.detected_object_id].x1 for w in walls)
+    assert all(d.center_x == stored[d.detected_object_id].x + 20 for d in doors)
+
+def test_large_batches_use_a_handful_of_statements(app):
+    project = ProjectRepository.create("Dense")
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        ObjectRepository.save_detected_objects(project.id, detections(3000))
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT")]) <= 10
+    assert Wall.query.filter_by(project_id=project.id).count() == 2000
+
+def test_ocr_records_are_stored_in_bulk(app):
+    project = ProjectRepository.create("Text")
+    OCRRepository.create_many(project.id, [
+        {"text": "KITCHEN", "normalized_text": "kitchen", "text_type": "ROOM_NAME", "x": 1, "y": 2,
+         "width": 3, "height": 4, "confidence": 0.9, "parsed_value": {"normalized": "kitchen"}},
+        {"text": "12x10", "normalized_text": "12x10", "text_type": "DIMENSION", "x": 5, "y": 6,
+         "width": 7, "height": 8, "confidence": 0.8, "parsed_value": None},
+    ])
+    names = OCRRepository.get_room_names(project.id)
+    assert [(t.text, t.parsed_value) for t in names] == [("KITCHEN", {"normalized": "kitchen"})]
@@ -0,0 +1,50 @@
+import glob
+import os
+import cv2
+import numpy as np
+import pytest
+from backend.cv.contour_detector import detect_contours, contour_boxes
+from backend.cv.preprocessing import preprocess_image
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'samples')
+
+def reference_detect(morphed, min_size=10, min_door_size=20):
+    # The original per-contour loop over the full tree
+    contours, _ = cv2.findContours(morphed, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    found = []
+    for contour in contours:
+        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        x, y, w, h = cv2.boundingRect(approx)
+        if w < min_size or h < min_size:
+            continue
+        if len(approx) >= 4 and ((w / h > 3.0) or (h / w > 3.0)):
+            found.append((x, y, w, h, "WALL"))
+        elif w >= min_door_size and h >= min_door_size:
+            found.append((x, y, w, h, "DOOR"))
+    return sorted(found)
+
+def as_tuples(objects):
+    return sorted((o["x"], o["y"], o["width"], o["height"], o["object_type"]) for o in objects)
+
+@pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(SAMPLES_DIR, '*'))))
+def test_matches_reference_without_duplicate_filter(path):
+    _, _, _, morphed = preprocess_image(path)
+    assert as_tuples(detect_contours(morphed, duplicate_inset=None)) == reference_detect(morphed)
+
+def test_contour_boxes_match_bounding_rect():
+    rng = np.random.default_rng(3)
+    mask = ((rng.random((300, 300)) < 0.1) * 255).astype(np.uint8)
+    contours, _ = cv2.findContours(mask, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    expected = np.array([cv2.boundingRect(c) for c in contours])
+    assert np.array_equal(contour_boxes(contours), expected)
+    assert contour_boxes(()).shape == (0, 4)
+
+def test_inner_outline_of_a_stroke_is_dropped():
+    mask = np.zeros((400, 400), np.uint8)
+    cv2.rectangle(mask, (50, 50), (350, 300), 255, 6)
+    # A separate room drawn inside the first must survive
+    cv2.rectangle(mask, (150, 120), (250, 200), 255, 6)
+
+    objects = detect_contours(mask)
+    assert as_tuples(objects) == [(48, 48, 305, 255, "DOOR"), (148, 118, 105, 85, "DOOR")]
+    assert len(detect_contours(mask, duplicate_inset=None)) == 4
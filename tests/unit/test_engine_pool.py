@@ -0,0 +1,59 @@
+import threading
+import time
+import numpy as np
+from backend.ocr.engine_pool import EnginePool, SubprocessEngine, parse_tsv
+
+TSV = "\n".join([
+    "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext",
+    "1\t1\t0\t0\t0\t0\t0\t0\t640\t480\t-1\t",
+    "5\t1\t1\t1\t1\t1\t36\t92\t180\t24\t96.5\tKITCHEN",
+    "5\t1\t1\t1\t1\t2\t230\t92\t90\t24\t91\t12'x10'",
+    "5\t1\t1\t1\t2\t1\t40\t140\t20\t20\t12.0\t~",
+    "5\t1\t1\t1\t2\t2\t70\t140\t20\t20\t88\t ",
+])
+
+def test_parse_tsv_keeps_confident_words():
+    assert parse_tsv(TSV) == [
+        {"text": "KITCHEN", "x": 36, "y": 92, "width": 180, "height": 24, "confidence": 0.965},
+        {"text": "12'x10'", "x": 230, "y": 92, "width": 90, "height": 24, "confidence": 0.91},
+    ]
+
+class CountingEngine:
+    created = 0
+
+    def __init__(self):
+        CountingEngine.created += 1
+        self.busy = False
+
+    def image_to_tsv(self, gray, psm):
+        assert not self.busy, "engine used by two callers at once"
+        self.busy = True
+        time.sleep(0.01)
+        self.busy = False
+        return TSV
+
+    def close(self):
+        pass
+
+def test_pool_reuses_a_bounded_number_of_engines():
+    CountingEngine.created = 0
+    pool = EnginePool(size=2)
+    pool._create = CountingEngine
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.image_to_data(np.zeros((8, 8), np.uint8))))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8 and all(len(words) == 2 for words in results)
+    assert CountingEngine.created == 2
+
+def test_pool_falls_back_to_the_tesseract_binary_without_the_library(tmp_path, monkeypatch):
+    from backend.ocr.engine_pool import CAPIEngine
+    monkeypatch.setattr(CAPIEngine, "_lib", None)
+    pool = EnginePool(size=1, library_path=str(tmp_path / "missing.so"))
+    with pool.engine() as engine:
+        assert isinstance(engine, SubprocessEngine)
@@ -0,0 +1,48 @@
+import numpy as np
+from backend.database.repositories.geometry_repository import GeometryRepository
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.models.wall import Wall
+from backend.services.export_service import ExportService
+from backend.services.project_service import ProjectService
+from backend.utils.geometry_blob import GEOMETRY_DTYPE, pack, unpack, to_dicts
+
+OBJECTS = [
+    {"object_type": "WALL", "x1": 0, "y1": 0, "x2": 1000, "y2": 0, "angle": 0.0, "confidence": 0.75},
+    {"object_type": "WALL", "x1": 0, "y1": 0, "x2": 0, "y2": 800, "confidence": 0.5},
+    {"object_type": "DOOR", "x": 460, "y": -30, "width": 40, "height": 40, "confidence": 0.25},
+]
+
+def test_blob_is_a_zero_copy_float32_array():
+    blob = pack(OBJECTS)
+    array = unpack(blob)
+
+    assert len(blob) == 3 * GEOMETRY_DTYPE.itemsize == 132
+    assert not array.flags.owndata and not array.flags.writeable
+    assert array["x2"].tolist()[:2] == [1000.0, 0.0] and np.isnan(array["x"][0])
+
+    first = to_dicts(array)[0]
+    assert first == {"id": "g0", "object_type": "WALL", "x": None, "y": None, "width": None, "height": None,
+                     "x1": 0.0, "y1": 0.0, "x2": 1000.0, "y2": 0.0, "angle": 0.0, "confidence": 0.75}
+
+def test_detections_and_export_read_the_blob(app):
+    project = ProjectRepository.create("Blob")
+    GeometryRepository.save(project.id, OBJECTS)
+
+    detections = ProjectService.get_detections(project.public_id)
+    assert [d["id"] for d in detections] == ["g0", "g1", "g2"]
+
+    walls, doors = ExportService.scene_geometry(project, {})
+    assert len(walls) == 2 and Wall.query.count() == 0
+    assert doors[0]["parent_wall_id"] == "g0" and doors[0]["orientation"] == "HORIZONTAL"
+
+def test_materialized_objects_move_to_rows(app):
+    project = ProjectRepository.create("Edit")
+    GeometryRepository.save(project.id, OBJECTS)
+    ids = GeometryRepository.materialize(project.id, [1])
+
+    detections = ProjectService.get_detections(project.public_id)
+    assert [d["id"] for d in detections] == [ids[0], "g0", "g2"]
+    assert Wall.query.filter_by(project_id=project.id).one().end_y == 800
+
+    walls, _ = ExportService.scene_geometry(project, {})
+    assert sorted(w["end_y"] for w in walls) == [0.0, 800.0]
@@ -0,0 +1,129 @@
+import hashlib
+import io
+from datetime import datetime, timedelta
+import cv2
+import numpy as np
+from backend.controllers.project_controller import ProjectController
+from backend.database.repositories.idempotency_repository import IdempotencyRepository
+from backend.database.repositories.job_repository import JobRepository
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.extensions import db, job_runner
+
+def plan():
+    image = np.full((600, 800), 255, np.uint8)
+    cv2.rectangle(image, (40, 40), (760, 560), 0, 8)
+    cv2.rectangle(image, (300, 100), (500, 140), 0, 4)
+    return image
+
+def test_identical_requests_attach_to_the_job_in_flight(app, tmp_path, upload):
+    project = ProjectRepository.create("Double click")
+    upload(project, plan(), tmp_path / "plan.png")
+    client = app.test_client()
+    base = f"/api/v1/projects/{project.public_id}"
+
+    first = client.post(base + "/process", json={"detection_mode": "contour", "run_ocr": False}).get_json()["data"]
+    second = client.post(base + "/process", json={"run_ocr": False, "detection_mode": "contour"}).get_json()["data"]
+    other = client.post(base + "/process", json={"detection_mode": "line", "run_ocr": False}).get_json()["data"]
+    assert second["id"] == first["id"] and second["deduplicated"]
+    assert other["id"] != first["id"] and not other["deduplicated"]
+
+    def status(job):
+        return client.get(base + f"/jobs/{job['id']}").get_json()["data"]["status"]
+
+    job_runner.run_pending()
+    assert status(first) == status(other) == "COMPLETED"
+    detections = len(client.get(base + "/detections").get_json()["data"])
+    assert detections > 0
+    # The same request after the first finished runs again and replaces its rows
+    again = client.post(base + "/process", json={"detection_mode": "line", "run_ocr": False}).get_json()["data"]
+    assert not again["deduplicated"]
+    job_runner.run_pending()
+    assert status(again) == "COMPLETED"
+    assert len(client.get(base + "/detections").get_json()["data"]) == detections
+
+def test_identical_requests_do_not_attach_to_a_dead_job(app):
+    project = ProjectRepository.create("Killed worker")
+    client = app.test_client()
+    base = f"/api/v1/projects/{project.public_id}"
+
+    def post():
+        return client.post(base + "/generate", json={"format": "glb"}).get_json()["data"]
+
+    def kill(job):
+        # The claiming worker dies without anyone polling the job
+        job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+    first = post()
+    kill(JobRepository.claim_next())
+    # Queued again, so the identical request attaches to it
+    retried = post()
+    assert retried["id"] == first["id"] and retried["deduplicated"] and retried["status"] == "PENDING"
+
+    kill(JobRepository.claim_next())
+    fresh = post()
+    assert fresh["id"] != first["id"] and not fresh["deduplicated"]
+    assert JobRepository.get_state(first["id"])[0] == "FAILED"
+
+def test_idempotency_key_replays_the_first_response(app):
+    project = ProjectRepository.create("Retry")
+    client = app.test_client()
+    base = f"/api/v1/projects/{project.public_id}"
+    headers = {"Idempotency-Key": "generate-1"}
+
+    first = client.post(base + "/generate", json={"format": "glb"}, headers=headers)
+    job_runner.run_pending()
+    retry = client.post(base + "/generate", json={"format": "glb"}, headers=headers)
+    assert first.status_code == retry.status_code == 202
+    assert retry.get_json() == first.get_json()
+    assert retry.headers["Location"] == first.headers["Location"]
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(client.get(base + "/jobs").get_json()["data"]) == 1
+
+    reused = client.post(base + "/generate", json={"format": "obj"}, headers=headers)
+    assert reused.status_code == 422
+    # Keys are scoped to the endpoint
+    assert client.post("/api/v1/projects", json={"name": "Other"}, headers=headers).status_code == 201
+
+def test_idempotency_key_on_uploads(app, tmp_path):
+    client = app.test_client()
+    project = client.post("/api/v1/projects", json={"name": "Upload"}).get_json()["data"]
+    url = f"/api/v1/projects/{project['id']}/blueprint"
+    ok, png = cv2.imencode(".png", plan())
+
+    def post(content):
+        return client.post(url, data={"file": (io.BytesIO(content), "plan.png")},
+                           headers={"Idempotency-Key": "upload-1"}, content_type="multipart/form-data")
+
+    first = post(png.tobytes())
+    retry = post(png.tobytes())
+    assert first.status_code == retry.status_code
+    assert "Idempotent-Replayed" not in first.headers and retry.headers["Idempotent-Replayed"] == "true"
+    assert post(png.tobytes()[:-1] + b"\0").status_code == 422
+
+def test_stale_or_failed_requests_release_their_key(app, monkeypatch):
+    client = app.test_client()
+    body = b'{"name": "Held"}'
+
+    def post(key):
+        return client.post("/api/v1/projects", data=body, content_type="application/json",
+                           headers={"Idempotency-Key": key})
+
+    # A request that raises frees its key
+    def broken(request):
+        raise RuntimeError("database went away")
+    with monkeypatch.context() as patch:
+        patch.setattr(ProjectController, "create_project", broken)
+        assert post("create-1").status_code == 500
+    first = post("create-1")
+    assert first.status_code == 201 and "Idempotent-Replayed" not in first.headers
+
+    # A key held by a request that died is taken over once its lock is stale
+    held, _ = IdempotencyRepository.begin("create-2", "POST /api/v1/projects",
+                                          hashlib.sha256(body).hexdigest(), 24, 120)
+    assert post("create-2").status_code == 409
+    held.locked_at -= timedelta(minutes=5)
+    db.session.commit()
+    taken = post("create-2")
+    assert taken.status_code == 201 and "Idempotent-Replayed" not in taken.headers
+    assert post("create-2").headers["Idempotent-Replayed"] == "true"
@@ -0,0 +1,45 @@
+import os
+import cv2
+import numpy as np
+from backend.utils.image_cache import DecodedImageCache
+from backend.cv.detection_pipeline import DetectionPipeline
+
+def write_image(tmp_path, name, size):
+    path = os.path.join(tmp_path, name)
+    cv2.imwrite(path, np.full((size, size, 3), 200, np.uint8))
+    return path
+
+def test_gray_decode_is_shared(tmp_path):
+    cache = DecodedImageCache()
+    path = write_image(tmp_path, "plan.png", 64)
+
+    first = cache.get_gray(path)
+    assert first.shape == (64, 64)
+    assert cache.get_gray(path) is first
+    assert not first.flags.writeable
+    assert cache.get_gray(os.path.join(tmp_path, "missing.png")) is None
+
+def test_lru_eviction_is_bounded(tmp_path):
+    cache = DecodedImageCache(max_bytes=2 * 100 * 100)
+    paths = [write_image(tmp_path, f"plan{i}.png", 100) for i in range(3)]
+
+    oldest = cache.get_gray(paths[0])
+    for path in paths[1:]:
+        cache.get_gray(path)
+    assert len(cache) == 2
+    assert cache.size_bytes <= cache.max_bytes
+
+    # The oldest entry was evicted and is decoded into a new buffer
+    assert cache.get_gray(paths[0]) is not oldest
+    cache.evict(paths[0])
+    assert len(cache) == 1
+
+def test_pipeline_accepts_read_only_buffer(tmp_path):
+    cache = DecodedImageCache()
+    path = os.path.join(tmp_path, "walls.png")
+    image = np.full((200, 200), 255, np.uint8)
+    cv2.rectangle(image, (20, 20), (180, 180), 0, 6)
+    cv2.imwrite(path, image)
+
+    objects = DetectionPipeline.process(cache.get_gray(path), "contour")
+    assert len(objects) > 0
@@ -0,0 +1,97 @@
+import warnings
+import cv2
+import numpy as np
+from backend.cv.detection_pipeline import DetectionPipeline
+from backend.cv.incremental import changed_regions, detection_windows, detect_in_windows
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.database.repositories.object_repository import ObjectRepository
+from backend.services.processing_service import ProcessingService
+from backend.services.project_service import ProjectService
+from backend.extensions import db, preprocess_cache
+from backend.cv.preprocessing import preprocess_gray
+from backend.utils.image_cache import load_gray
+from backend.models.blueprint import Blueprint
+
+def sheet(extra_room=False):
+    image = np.full((1200, 1600), 255, np.uint8)
+    cv2.rectangle(image, (40, 40), (1560, 1160), 0, 8)
+    for x in range(300, 1500, 370):
+        cv2.rectangle(image, (x, 100), (x + 200, 140), 0, 4)
+        cv2.rectangle(image, (x, 700), (x + 120, 800), 0, 4)
+    if extra_room:
+        cv2.rectangle(image, (600, 900), (760, 1020), 0, 4)
+    return image
+
+def test_changed_regions_cover_only_the_edit():
+    previous, current = sheet(), sheet(extra_room=True)
+    regions = changed_regions(previous, current, block_size=64, margin=0)
+    assert len(regions) == 1
+    x0, y0, x1, y1 = regions[0]
+    assert x0 <= 598 and y0 <= 898 and x1 >= 762 and y1 >= 1022
+    assert (x1 - x0) * (y1 - y0) < 0.05 * current.size
+    assert changed_regions(previous, previous) == []
+    assert changed_regions(previous, current[:600]) is None
+
+def test_windows_grow_to_cover_touched_objects_and_merge():
+    stale = np.array([[100, 100, 400, 120]], dtype=np.float64)
+    windows = detection_windows([(150, 90, 200, 130), (380, 100, 420, 140)], stale, (1000, 1000), margin=10)
+    assert windows == [(90, 80, 430, 150)]
+
+def test_detect_in_windows_shifts_and_filters():
+    image = np.zeros((100, 100), np.uint8)
+    found = lambda crop: [{"x": 1, "y": 1, "width": 5, "height": 5}, {"x": 40, "y": 40, "width": 5, "height": 5}]
+    items = detect_in_windows(image, [(10, 20, 90, 90)], [(0, 0, 30, 30)], found)
+    assert items == [{"x": 11, "y": 21, "width": 5, "height": 5}]
+
+def test_revision_is_detected_incrementally(app, tmp_path, upload):
+    project = ProjectRepository.create("Revisions")
+    first = upload(project, sheet(), tmp_path / "rev1.png")
+    result = ProcessingService.start_processing(project.public_id, {"detection_mode": "contour"})
+    assert "incremental" not in result["detection_stats"]
+
+    second = upload(project, sheet(extra_room=True), tmp_path / "rev2.png", previous=first)
+    assert second.revision == 2
+    result = ProcessingService.start_processing(project.public_id, {})
+    stats = result["detection_stats"]["incremental"]
+    assert stats["previous_revision"] == 1 and stats["changed_regions"] == 1
+    assert stats["reused_objects"] > 0
+
+    key = lambda o: (o["object_type"], o["x"], o["y"], o["width"], o["height"])
+    stored = sorted(key({"object_type": o.object_type, "x": o.x, "y": o.y, "width": o.width, "height": o.height})
+                    for o in ObjectRepository.get_by_project(project.id))
+    _, full, _ = DetectionPipeline.run(sheet(extra_room=True), "contour", app.config)
+    assert stored == sorted(map(key, full))
+
+def test_project_reports_and_deletes_every_revision(app, tmp_path, upload):
+    project = ProjectRepository.create("Deleted revisions")
+    first = upload(project, sheet(), tmp_path / "rev1.png")
+    upload(project, sheet(extra_room=True), tmp_path / "rev2.png", previous=first)
+    db.session.expire_all()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert ProjectService.get_project(project.public_id)["blueprint"]["revision"] == 2
+    assert [b.revision for b in project.blueprints] == [1, 2]
+
+    ProjectRepository.delete(project)
+    assert Blueprint.query.count() == 0
+
+def test_revision_patches_the_cached_wall_mask(app, tmp_path, upload, monkeypatch):
+    monkeypatch.setattr(preprocess_cache, "directory", str(tmp_path / "cache"))
+    monkeypatch.setattr(preprocess_cache, "max_bytes", 64 * 1024 * 1024)
+    (tmp_path / "cache").mkdir()
+    project = ProjectRepository.create("Patched mask")
+    first = upload(project, sheet(), tmp_path / "rev1.png")
+    ProcessingService.start_processing(project.public_id, {"detection_mode": "contour"})
+
+    upload(project, sheet(extra_room=True), tmp_path / "rev2.png", previous=first)
+    calls = []
+    monkeypatch.setattr(DetectionPipeline, "_preprocess", lambda *a: calls.append(1))
+    result = ProcessingService.start_processing(project.public_id, {})
+    assert "incremental" in result["detection_stats"] and calls == []
+
+    # The patched pair is what a full preprocess of the revision gives
+    gray = load_gray(str(tmp_path / "rev2.png"))
+    _, patched = DetectionPipeline.cached_masks(gray, app.config)
+    _, full = preprocess_gray(gray)
+    assert (patched == full).all()
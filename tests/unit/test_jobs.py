@@ -0,0 +1,150 @@
+import json
+import time
+from datetime import datetime, timedelta
+import cv2
+import numpy as np
+from backend.database.repositories.job_repository import JobRepository
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.extensions import db, job_runner
+from backend.services.export_service import ExportService
+from backend.utils.job_progress import JobLease, JobProgress
+
+def plan():
+    image = np.full((600, 800), 255, np.uint8)
+    cv2.rectangle(image, (40, 40), (760, 560), 0, 8)
+    cv2.rectangle(image, (300, 100), (500, 140), 0, 4)
+    return image
+
+def test_process_is_queued_and_run_by_the_job_runner(app, tmp_path, upload):
+    project = ProjectRepository.create("Queued")
+    upload(project, plan(), tmp_path / "plan.png")
+    client = app.test_client()
+    base = f"/api/v1/projects/{project.public_id}"
+
+    response = client.post(base + "/process", json={"detection_mode": "contour"})
+    assert response.status_code == 202
+    job = response.get_json()["data"]
+    assert job["status"] == "PENDING" and job["job_type"] == "PROCESS"
+    assert response.headers["Location"].endswith(f"{base}/jobs/{job['id']}")
+    assert [j["status"] for j in client.get(base + "/jobs").get_json()["data"]] == ["PENDING"]
+
+    finished = job_runner.run_pending()
+    assert [j["id"] for j in finished] == [job["id"]]
+    assert job_runner.run_pending() == []
+
+    job = client.get(f"{base}/jobs/{job['id']}").get_json()["data"]
+    assert job["status"] == "COMPLETED" and job["progress"] == 100
+    assert job["result"]["detected_objects"] > 0 and job["processing_time_ms"] is not None
+
+    stages = job["metrics"]["stages"]
+    assert {"decode", "preprocess", "detect", "persist", "rooms", "link"} <= set(stages)
+    assert stages["detect"]["objects"] == job["result"]["detected_objects"]
+    assert all(s["wall_ms"] >= 0 and s["cpu_ms"] >= 0 for s in stages.values())
+    assert len(client.get(base + "/detections").get_json()["data"]) == job["result"]["detected_objects"]
+
+def test_failed_job_records_the_error(app, monkeypatch):
+    project = ProjectRepository.create("Failing")
+    def fail(public_id, config):
+        raise ValueError("Blender is not installed")
+    monkeypatch.setattr(ExportService, "generate_model", fail)
+    client = app.test_client()
+    base = f"/api/v1/projects/{project.public_id}"
+
+    job = client.post(base + "/generate", json={"format": "glb"}).get_json()["data"]
+    job_runner.run_pending()
+    job = client.get(f"{base}/jobs/{job['id']}").get_json()["data"]
+    assert job["status"] == "FAILED" and job["message"] == "Blender is not installed"
+
+def test_requests_are_checked_before_queueing(app):
+    project = ProjectRepository.create("No blueprint")
+    client = app.test_client()
+    assert client.post(f"/api/v1/projects/{project.public_id}/process", json={}).status_code == 400
+    assert client.post("/api/v1/projects/missing/generate", json={}).status_code == 404
+    assert client.get(f"/api/v1/projects/{project.public_id}/jobs/1").status_code == 404
+    assert job_runner.run_pending() == []
+
+def events(response):
+    parsed = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in lines:
+            parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed
+
+def test_progress_follows_stage_transitions(app):
+    project = ProjectRepository.create("Progress")
+    job, _ = JobRepository.create(project.id, "PROCESS", {"run_ocr": True})
+    assert JobRepository.claim_next().id == job.id
+
+    progress = JobProgress(job.id, "PROCESS", job.config)
+    progress("decode", "start")
+    assert JobRepository.get_state(job.id)[1:3] == (0, "decode")
+    progress("decode", "end")
+    progress("detect", "start")
+    progress("ocr", "start")
+    progress("preprocess", "start")
+    assert JobRepository.get_state(job.id)[1:3] == (5, "detect,ocr")
+    progress("detect", "end")
+    assert JobRepository.get_state(job.id)[1:3] == (45, "ocr")
+
+def test_event_stream_reports_progress_until_done(app, monkeypatch):
+    project = ProjectRepository.create("Events")
+    monkeypatch.setattr(ExportService, "generate_model", lambda public_id, config: {"id": 7, "message": "ok"})
+    client = app.test_client()
+    base = f"/api/v1/projects/{project.public_id}"
+    job = client.post(base + "/generate", json={}).get_json()["data"]
+
+    app.config.update(JOB_EVENTS_TIMEOUT=0)
+    response = client.get(f"{base}/jobs/{job['id']}/events")
+    assert response.mimetype == "text/event-stream"
+    assert events(response) == [("progress", {"status": "PENDING", "progress": 0, "stage": None, "message": None})]
+
+    job_runner.run_pending()
+    streamed = events(client.get(f"{base}/jobs/{job['id']}/events"))
+    assert [event for event, _ in streamed] == ["progress", "done"]
+    assert streamed[0][1]["progress"] == 100 and streamed[1][1]["result"] == {"id": 7, "message": "ok"}
+    assert client.get(f"{base}/jobs/999/events").status_code == 404
+
+def expire(job):
+    job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+def test_jobs_of_killed_workers_are_run_again_then_failed(app, monkeypatch):
+    project = ProjectRepository.create("Killed")
+    monkeypatch.setattr(ExportService, "generate_model", lambda public_id, config: {"message": "ok"})
+    client = app.test_client()
+    base = f"/api/v1/projects/{project.public_id}"
+    job = client.post(base + "/generate", json={"format": "glb"}).get_json()["data"]
+
+    # The worker that claimed it dies: any poller sees the lease run out
+    claimed = JobRepository.claim_next()
+    assert claimed.attempts == 1 and claimed.lease_expires_at > datetime.utcnow()
+    expire(claimed)
+    polled = client.get(f"{base}/jobs/{job['id']}").get_json()["data"]
+    assert polled["status"] == "PENDING" and polled["attempts"] == 1
+    # Its late outcome does not overwrite the job's new state
+    JobRepository.finish(claimed, 'COMPLETED', result={"message": "late"})
+    assert JobRepository.get_state(job["id"])[0] == "PENDING"
+    assert client.post(base + "/generate", json={"format": "glb"}).get_json()["data"]["deduplicated"]
+
+    # After JOB_MAX_ATTEMPTS claims the job fails, and frees its dedup key
+    expire(JobRepository.claim_next())
+    app.config.update(JOB_EVENTS_TIMEOUT=0)
+    streamed = events(client.get(f"{base}/jobs/{job['id']}/events"))
+    assert [event for event, _ in streamed] == ["progress", "done"]
+    assert streamed[1][1]["status"] == "FAILED" and streamed[1][1]["attempts"] == 2
+    again = client.post(base + "/generate", json={"format": "glb"}).get_json()["data"]
+    assert not again["deduplicated"]
+    assert [j["id"] for j in job_runner.run_pending()] == [again["id"]]
+
+def test_running_jobs_renew_their_lease(app):
+    project = ProjectRepository.create("Busy")
+    JobRepository.create(project.id, "GENERATE", {})
+    job = JobRepository.claim_next(lease_seconds=0.3)
+    granted = job.lease_expires_at
+    with JobLease(job.id, job.attempts, 0.3):
+        time.sleep(0.25)
+        db.session.rollback()
+        assert job.lease_expires_at > granted and job.heartbeat_at > job.started_at
+        # Past the first lease, but renewed
+        assert JobRepository.recover_expired(max_attempts=2) == 0
@@ -0,0 +1,53 @@
+import glob
+import math
+import os
+import cv2
+import numpy as np
+import pytest
+from backend.cv.line_detector import filter_duplicate_segments, distance
+from backend.cv.preprocessing import preprocess_image
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'samples')
+
+def reference_filter(segments, min_distance=15.0):
+    # The original pairwise filter, kept here as the source of truth
+    kept = []
+    keep = []
+    for x1, y1, x2, y2 in segments:
+        p1, p2 = (x1, y1), (x2, y2)
+        duplicate = False
+        for (fp1, fp2) in kept:
+            v1 = (x2 - x1, y2 - y1)
+            v2 = (fp2[0] - fp1[0], fp2[1] - fp1[1])
+            mag1 = math.sqrt(v1[0]**2 + v1[1]**2)
+            mag2 = math.sqrt(v2[0]**2 + v2[1]**2)
+            if mag1 > 0 and mag2 > 0:
+                sine_angle = abs(v1[0]*v2[1] - v1[1]*v2[0]) / (mag1 * mag2)
+                if sine_angle < 0.05:
+                    if distance(p1, fp1) < min_distance and distance(p2, fp2) < min_distance:
+                        duplicate = True
+                        break
+        if not duplicate:
+            kept.append((p1, p2))
+        keep.append(not duplicate)
+    return np.array(keep, dtype=bool)
+
+def hough_segments(path):
+    _, _, blurred, _ = preprocess_image(path)
+    edges = cv2.Canny(blurred, 50, 150)
+    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, threshold=50, minLineLength=50, maxLineGap=10)
+    return [] if lines is None else lines.reshape(-1, 4).tolist()
+
+@pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(SAMPLES_DIR, "*"))))
+def test_filter_matches_reference_on_samples(path):
+    segments = hough_segments(path)
+    assert filter_duplicate_segments(segments).tolist() == reference_filter(segments).tolist()
+
+def test_filter_matches_reference_on_clustered_segments():
+    rng = np.random.default_rng(7)
+    base = rng.integers(0, 400, size=(60, 4))
+    jitter = rng.integers(-12, 13, size=(600, 4))
+    segments = (base[rng.integers(0, 60, size=600)] + jitter).tolist()
+    segments.append([5, 5, 5, 5]) # zero-length segments are never duplicates
+    segments.append([5, 5, 5, 5])
+    assert filter_duplicate_segments(segments).tolist() == reference_filter(segments).tolist()
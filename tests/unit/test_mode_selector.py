@@ -0,0 +1,35 @@
+import cv2
+import numpy as np
+from backend.cv.mode_selector import image_features, choose_mode, score_detections
+from backend.cv.preprocessing import preprocess_gray
+from backend.cv.contour_detector import detect_contours
+from backend.cv.line_detector import detect_lines
+from backend.cv.detection_pipeline import DetectionPipeline
+
+def draw_plan(thickness):
+    image = np.full((900, 1200), 255, np.uint8)
+    cv2.rectangle(image, (50, 50), (1150, 850), 0, thickness)
+    cv2.line(image, (600, 50), (600, 850), 0, thickness)
+    cv2.line(image, (50, 450), (600, 450), 0, thickness)
+    return image
+
+def test_thin_line_drawing_prefers_lines():
+    assert choose_mode(image_features(draw_plan(2))) == "line"
+
+def test_solid_walls_prefer_contours():
+    assert choose_mode(image_features(draw_plan(40))) == "contour"
+
+def test_blank_page_defaults_to_contours():
+    assert choose_mode(image_features(np.full((300, 300), 255, np.uint8))) == "contour"
+
+def test_race_keeps_best_scoring_result():
+    gray = draw_plan(2)
+    blurred, morphed = preprocess_gray(gray)
+    scores = {
+        "contour": score_detections(detect_contours(morphed), morphed),
+        "line": score_detections(detect_lines(blurred), morphed)
+    }
+
+    mode, objects, _ = DetectionPipeline.run(gray, "race", {"MERGE_COLLINEAR_SEGMENTS": False})
+    assert mode == max(scores, key=scores.get)
+    assert objects
@@ -0,0 +1,54 @@
+import json
+from backend.database.repositories.geometry_repository import GeometryRepository
+from backend.database.repositories.object_repository import ObjectRepository
+from backend.database.repositories.project_repository import ProjectRepository
+
+def walls(count):
+    return [{"object_type": "WALL", "x1": i, "y1": 0, "x2": i, "y2": 50, "confidence": 0.5} for i in range(count)]
+
+def pages(client, url, limit):
+    cursor, seen = None, []
+    while True:
+        body = client.get(url, query_string={"limit": limit, **({"cursor": cursor} if cursor else {})}).get_json()
+        assert len(body["data"]) <= limit
+        seen.extend(item["id"] for item in body["data"])
+        cursor = body["meta"]["next_cursor"]
+        if cursor is None:
+            return seen
+
+def test_keyset_pages_cover_rows_then_blob_exactly_once(app):
+    project = ProjectRepository.create("Paged")
+    ObjectRepository.save_detected_objects(project.id, walls(7))
+    GeometryRepository.save(project.id, walls(5))
+    client = app.test_client()
+    url = f"/api/v1/projects/{project.public_id}/detections"
+
+    everything = [item["id"] for item in client.get(url, query_string={"limit": 100}).get_json()["data"]]
+    assert len(everything) == 12 and everything[7:] == ["g0", "g1", "g2", "g3", "g4"]
+    for limit in (1, 3, 5, 7, 12):
+        assert pages(client, url, limit) == everything
+
+def test_fields_and_ndjson_stream(app):
+    project = ProjectRepository.create("Fields")
+    ObjectRepository.save_detected_objects(project.id, walls(3))
+    GeometryRepository.save(project.id, walls(2))
+    client = app.test_client()
+    url = f"/api/v1/projects/{project.public_id}/detections"
+
+    body = client.get(url, query_string={"fields": "x1,object_type"}).get_json()
+    assert body["data"][0] == {"object_type": "WALL", "x1": 0.0}
+
+    response = client.get(url, query_string={"format": "ndjson", "fields": "id,x1"})
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["x1"] for line in lines] == [0.0, 1.0, 2.0, 0.0, 1.0]
+    assert lines[-1]["id"] == "g1"
+
+def test_invalid_parameters_are_rejected(app):
+    project = ProjectRepository.create("Invalid")
+    client = app.test_client()
+    base = f"/api/v1/projects/{project.public_id}"
+    assert client.get(base + "/detections?fields=id,secret").status_code == 400
+    assert client.get(base + "/ocr?cursor=g3").status_code == 400
+    assert client.get(base + "/ocr?limit=0").status_code == 400
+    assert client.get("/api/v1/projects/missing/detections?format=ndjson").status_code == 404
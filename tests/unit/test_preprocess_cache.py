@@ -0,0 +1,64 @@
+import os
+import cv2
+import numpy as np
+from backend.cv.preprocess_cache import PreprocessCache, _entry_size, _remove_entry
+from backend.cv.detection_pipeline import DetectionPipeline
+from backend.extensions import preprocess_cache
+
+def plan():
+    image = np.full((300, 400), 255, np.uint8)
+    cv2.rectangle(image, (20, 20), (380, 280), 0, 6)
+    cv2.line(image, (200, 20), (200, 280), 0, 6)
+    return image
+
+def test_store_and_load_memory_mapped(tmp_path):
+    cache = PreprocessCache(str(tmp_path))
+    gray = plan()
+    key = cache.make_key(gray, blur_kernel=(5, 5), block_size=11, kernel_size=5)
+    assert key != cache.make_key(gray, blur_kernel=(3, 3), block_size=11, kernel_size=5)
+    assert cache.load(key, ("blurred",)) is None
+
+    cache.store(key, {"blurred": gray, "morphed": 255 - gray})
+    blurred, morphed = cache.load(key, ("blurred", "morphed"))
+    assert isinstance(blurred, np.memmap)
+    assert (blurred == gray).all() and (morphed == 255 - gray).all()
+
+def test_eviction_keeps_cache_bounded(tmp_path):
+    cache = PreprocessCache(str(tmp_path), max_bytes=300 * 1024)
+    for i in range(5):
+        gray = np.full((300, 400), i, np.uint8)
+        cache.store(cache.make_key(gray), {"blurred": gray})
+        os.utime(os.path.join(str(tmp_path), cache.make_key(gray)), (i, i))
+    cache.evict()
+
+    remaining = os.listdir(str(tmp_path))
+    assert len(remaining) == 2
+    newest = np.full((300, 400), 4, np.uint8)
+    assert cache.make_key(newest) in remaining
+
+def test_entries_removed_by_another_process_are_misses(tmp_path):
+    cache = PreprocessCache(str(tmp_path))
+    gray = plan()
+    key = cache.make_key(gray)
+    cache.store(key, {"blurred": gray, "morphed": gray})
+    entry = os.path.join(str(tmp_path), key)
+    os.remove(os.path.join(entry, "morphed.npy"))
+    assert cache.load(key, ("blurred", "morphed")) is None
+
+    _remove_entry(entry)
+    assert not os.path.exists(entry)
+    # A second eviction of the same entry is a no-op, not an error
+    _remove_entry(entry)
+    assert _entry_size(entry) == 0
+    cache.evict()
+
+def test_pipeline_reuses_cached_intermediates(tmp_path, monkeypatch):
+    monkeypatch.setattr(preprocess_cache, "directory", str(tmp_path))
+    monkeypatch.setattr(preprocess_cache, "max_bytes", 1024 * 1024 * 1024)
+    gray = plan()
+
+    first = DetectionPipeline.process(gray, "contour")
+    assert len(os.listdir(str(tmp_path))) == 1
+    assert DetectionPipeline.process(gray, "contour") == first
+    assert DetectionPipeline.process(gray, "line") != []
+    assert len(os.listdir(str(tmp_path))) == 1
@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+from backend.cv.preprocessing import preprocess_gray
+from backend.cv.contour_detector import detect_contours
+from backend.cv.pyramid import coarse_params, detect_pyramid, regions_of_interest
+
+def sparse_plan():
+    image = np.full((2400, 3200), 255, np.uint8)
+    # Walls drawn as hollow double-line outlines
+    cv2.rectangle(image, (100, 100), (500, 160), 0, 3)
+    cv2.rectangle(image, (100, 300), (160, 700), 0, 3)
+    cv2.rectangle(image, (1800, 1500), (2200, 1550), 0, 3)
+    cv2.rectangle(image, (300, 400), (380, 470), 0, 4)
+    return image
+
+def test_regions_only_cover_candidates():
+    regions = regions_of_interest([{"x1": 10, "y1": 10, "x2": 90, "y2": 10}], (200, 200), 4, block_size=64)
+    assert regions
+    assert all(y1 <= 128 for _, _, _, y1 in regions)
+    assert sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in regions) < 800 * 800 / 4
+
+def test_pyramid_contours_keep_single_scale_walls():
+    gray = sparse_plan()
+    _, morphed = preprocess_gray(gray)
+    key = lambda o: (o["object_type"], o["x"], o["y"], o["width"], o["height"])
+
+    single = {key(o) for o in detect_contours(morphed) if o["object_type"] == "WALL"}
+    pyramid = {key(o) for o in detect_pyramid(gray, "contour", factor=4)}
+    assert single and single <= pyramid
+
+def test_blank_page_has_no_regions():
+    assert detect_pyramid(np.full((800, 800), 255, np.uint8), "line") == []
+
+def test_pyramid_uses_the_configured_preprocessing():
+    gray = sparse_plan()
+    params = {"blur_kernel": (3, 3), "block_size": 61, "kernel_size": 9}
+    _, morphed = preprocess_gray(gray, **params)
+    key = lambda o: (o["object_type"], o["x"], o["y"], o["width"], o["height"])
+
+    single = {key(o) for o in detect_contours(morphed) if o["object_type"] == "WALL"}
+    pyramid = {key(o) for o in detect_pyramid(gray, "contour", factor=4, params=params)}
+    assert single and single <= pyramid
+    assert coarse_params(params, 4) == {"blur_kernel": (5, 5), "block_size": 15, "kernel_size": 5}
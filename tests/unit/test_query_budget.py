@@ -0,0 +1,80 @@
+import re
+import pytest
+from sqlalchemy import event
+from backend.extensions import db
+from backend.database.repositories.object_repository import ObjectRepository
+from backend.database.repositories.ocr_repository import OCRRepository
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.database.repositories.room_repository import RoomRepository
+from backend.models.processing_job import ProcessingJob
+
+SCOPED_TABLES = {"detected_objects", "walls", "doors", "windows", "ocr_texts", "rooms",
+                 "processing_jobs", "exported_models", "blueprints", "detection_geometry"}
+
+# endpoint -> maximum SQL statements per request
+BUDGETS = {"": 2, "/detections": 2, "/ocr": 1, "/rooms": 1, "/jobs": 1,
+           "/detections?limit=5&cursor=3&fields=id,x1": 1, "/ocr?limit=2&cursor=1": 1,
+           "/detections?format=ndjson": 2, "/jobs/{job}": 1,
+           # The job, then its state and the "done" event's full job
+           "/jobs/{job}/events": 3}
+
+@pytest.fixture
+def populated(app):
+    # A second project so that a missing project filter would show up in the results
+    for name in ("Other", "Budget"):
+        project = ProjectRepository.create(name)
+        ObjectRepository.save_detected_objects(project.id, [
+            {"object_type": "WALL", "x1": i, "y1": 0, "x2": i, "y2": 50} for i in range(20)
+        ] + [{"object_type": "DOOR", "x": 5, "y": 5, "width": 10, "height": 10}])
+        OCRRepository.create_many(project.id, [
+            {"text": "KITCHEN", "normalized_text": "kitchen", "text_type": "ROOM_NAME",
+             "x": 1, "y": 1, "width": 5, "height": 5, "confidence": 0.9, "parsed_value": None}
+        ] * 5)
+        RoomRepository.replace_rooms(project.id, [
+            {"polygon": [[0, 0], [1, 0], [1, 1]], "center_x": 0.5, "center_y": 0.5,
+             "area_pixels": 1.0, "width": 1.0, "length": 1.0}
+        ] * 3)
+        db.session.add(ProcessingJob(project_id=project.id, job_type="DETECTION", status="COMPLETED"))
+        db.session.commit()
+    return project
+
+def capture(app, url):
+    statements = []
+    listener = lambda conn, cursor, statement, parameters, context, many: statements.append((statement, parameters))
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        response = app.test_client().get(url)
+        # Streamed bodies run their queries as they are read
+        response.get_data()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    return response, statements
+
+def full_scans(statement, parameters):
+    with db.engine.connect() as connection:
+        plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    details = [row[-1] for row in plan]
+    return [d for d in details if re.match(r"SCAN (\w+)", d) and re.match(r"SCAN (\w+)", d).group(1) in SCOPED_TABLES]
+
+@pytest.mark.parametrize("endpoint", sorted(BUDGETS))
+def test_project_endpoints_stay_within_budget_and_use_indexes(app, populated, endpoint):
+    job = ProcessingJob.query.filter_by(project_id=populated.id).one()
+    response, statements = capture(app, f"/api/v1/projects/{populated.public_id}{endpoint.format(job=job.id)}")
+    assert response.status_code == 200
+
+    assert len(statements) <= BUDGETS[endpoint], [s for s, _ in statements]
+    for statement, parameters in statements:
+        assert full_scans(statement, parameters) == [], statement
+
+def test_scoped_endpoints_return_only_the_projects_rows(app, populated):
+    client = app.test_client()
+    base = f"/api/v1/projects/{populated.public_id}"
+    assert len(client.get(base + "/detections").get_json()["data"]) == 21
+    assert len(client.get(base + "/ocr").get_json()["data"]) == 5
+    assert len(client.get(base + "/rooms").get_json()["data"]) == 3
+    assert [job["status"] for job in client.get(base + "/jobs").get_json()["data"]] == ["COMPLETED"]
+    assert client.get("/api/v1/projects/missing/ocr").status_code == 404
+    # Another project's job is not found through this one
+    other = ProcessingJob.query.filter(ProcessingJob.project_id != populated.id).one()
+    assert client.get(f"{base}/jobs/{other.id}").status_code == 404
+    assert client.get(f"{base}/jobs/{other.id}/events").status_code == 404
@@ -0,0 +1,66 @@
+from backend.ocr.room_name_parser import RoomNameParser
+from backend.ocr.room_vocabulary import RoomVocabulary, edit_distance
+
+def test_longest_name_wins():
+    assert RoomNameParser.parse("Master Bedroom")["normalized"] == "master bedroom"
+    assert RoomNameParser.parse("DINING ROOM 2")["normalized"] == "dining room"
+    assert RoomNameParser.parse("12x10") is None
+
+def test_ocr_misreads_within_edit_budget():
+    assert RoomNameParser.parse("KITCHFN")["normalized"] == "kitchen"
+    assert RoomNameParser.parse("MASTERBEDROOM")["normalized"] == "master bedroom"
+    assert RoomNameParser.parse("BALOCNY")["normalized"] == "balcony"
+    # Short tokens are never corrected
+    assert RoomNameParser.parse("HALF") is None
+    assert RoomNameParser.parse("NOTES:") is None
+
+def test_edit_distance_counts_transpositions():
+    assert edit_distance("balcony", "balocny", 2) == 1
+    assert edit_distance("kitchen", "kitchen", 2) == 0
+    assert edit_distance("garage", "office", 2) == 3
+
+SYLLABLES = ["ba", "ce", "di", "fo", "gu", "ha", "ke", "li", "mo", "nu", "pa", "re", "si"]
+
+def test_vocabulary_aliases_and_large_lists():
+    # 2000 names that differ in their letters, so each is its own key
+    words = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES][:2000]
+    names = {f"{word} suite": f"suite {i}" for i, word in enumerate(words)}
+    names.update({"küche": "kitchen", "salle de bain": "bathroom"})
+    vocabulary = RoomVocabulary(names)
+    assert len(vocabulary.exact) == len(names)
+
+    for i in range(0, 2000, 97):
+        assert vocabulary.match(f"{words[i].upper()} SUITE") == f"suite {i}"
+        assert vocabulary.match(f"Level 2 - {words[i]} suite (north)") == f"suite {i}"
+    assert vocabulary.match("KÜCHE") == "kitchen"
+    assert vocabulary.match("Salle de Bain 1") == "bathroom"
+    assert vocabulary.match("Salle de Bian") == "bathroom"
+    assert vocabulary.match("hallway") is None
+
+def test_parse_many_matches_parse():
+    texts = ["Bedroom", "12'x10'", "Bedroom", "Kitchen", "N"]
+    assert RoomNameParser.parse_many(texts) == [RoomNameParser.parse(t) for t in texts]
+
+def test_names_from_config(app):
+    from backend.extensions import room_vocabulary
+
+    app.config["ROOM_NAMES"] = "Pooja Room, Utility"
+    try:
+        room_vocabulary.init_app(app)
+        assert RoomNameParser.parse("POOJA ROOM")["normalized"] == "pooja room"
+        assert RoomNameParser.parse("Kitchen")["normalized"] == "kitchen"
+    finally:
+        app.config["ROOM_NAMES"] = ""
+        room_vocabulary.init_app(app)
+
+def test_lookups_are_cached_until_the_vocabulary_changes():
+    vocabulary = RoomVocabulary(["kitchen"])
+    assert vocabulary.match("KITCHFN") == vocabulary.match("KITCHFN") == "kitchen"
+    assert vocabulary._fuzzy_cache == {"kitchfn": (1, "kitchen")}
+    # Runs of short words are not worth a fuzzy search
+    assert vocabulary.match("KTCH 3 RM") is None
+    assert list(vocabulary._fuzzy_cache) == ["kitchfn"]
+
+    vocabulary.configure(["pantry"])
+    assert vocabulary.match("KITCHFN") is None
+    assert vocabulary.match("PANTRT") == "pantry"
@@ -0,0 +1,85 @@
+import cv2
+import numpy as np
+import pytest
+from backend.cv.preprocessing import preprocess_gray
+from backend.cv.room_segmenter import segment_rooms, name_rooms
+from backend.cv.detection_pipeline import DetectionPipeline
+from backend.database.repositories.object_repository import ObjectRepository
+from backend.database.repositories.room_repository import RoomRepository
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.services.processing_service import ProcessingService
+
+def two_room_plan():
+    image = np.full((600, 900), 255, np.uint8)
+    cv2.rectangle(image, (50, 50), (850, 550), 0, 8)
+    cv2.line(image, (450, 50), (450, 550), 0, 8)
+    # A doorway narrower than the gap close between the rooms
+    cv2.line(image, (450, 290), (450, 300), 255, 8)
+    cv2.putText(image, "KITCHEN", (150, 300), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    return image
+
+def test_segments_enclosed_rooms_and_skips_the_outside():
+    _, morphed = preprocess_gray(two_room_plan())
+    rooms, labels = segment_rooms(morphed)
+
+    assert len(rooms) == 2
+    left, right = sorted(rooms, key=lambda r: r["center_x"])
+    assert 200 < left["center_x"] < 300 and 270 < left["center_y"] < 330
+    assert 600 < right["center_x"] < 700
+    # Roughly 390 x 490 of free space, minus the label text in the left room
+    assert 170000 < right["area_pixels"] < 195000
+    assert 4 <= len(right["polygon"]) <= 8
+    assert labels[300, 650] == right["label"]
+    assert labels[10, 10] not in (left["label"], right["label"])
+
+def test_rooms_are_named_after_the_label_inside_them():
+    _, morphed = preprocess_gray(two_room_plan())
+    rooms, labels = segment_rooms(morphed)
+    texts = [
+        {"x": 150, "y": 280, "width": 130, "height": 22, "normalized_text": "kitchen"},
+        {"x": 600, "y": 20, "width": 60, "height": 20, "normalized_text": "hall"}  # outside
+    ]
+    left, right = sorted(name_rooms(rooms, labels, texts), key=lambda r: r["center_x"])
+    assert left["name"] == "kitchen"
+    assert "name" not in right
+
+def test_processing_fills_the_rooms_endpoint(app, tmp_path, upload):
+    project = ProjectRepository.create("Rooms")
+    upload(project, two_room_plan(), tmp_path / "plan.png")
+    result = ProcessingService.start_processing(project.public_id, {"detection_mode": "contour"})
+    assert result["rooms"] == 2
+
+    response = app.test_client().get(f"/api/v1/projects/{project.public_id}/rooms")
+    rooms = response.get_json()["data"]
+    assert len(rooms) == 2 and all(room["polygon"] for room in rooms)
+    assert app.test_client().get("/api/v1/projects/missing/rooms").status_code == 404
+
+def test_rooms_reuse_the_detection_mask(app, tmp_path, upload, monkeypatch):
+    calls = []
+    preprocess = DetectionPipeline.preprocess
+    monkeypatch.setattr(DetectionPipeline, "preprocess", lambda *a, **k: calls.append(1) or preprocess(*a, **k))
+
+    project = ProjectRepository.create("One preprocess")
+    upload(project, two_room_plan(), tmp_path / "plan.png")
+    assert ProcessingService.start_processing(project.public_id, {"detection_mode": "contour"})["rooms"] == 2
+    assert len(calls) == 1
+
+    # Coarse-to-fine pages never threshold the full page
+    monkeypatch.setitem(app.config, "PYRAMID_DETECTION_MIN_PIXELS", 1)
+    assert ProcessingService.start_processing(project.public_id, {"detection_mode": "contour"})["rooms"] == 2
+    assert len(calls) == 1
+
+def test_failed_run_keeps_the_previous_results(app, tmp_path, upload, monkeypatch):
+    project = ProjectRepository.create("Atomic")
+    upload(project, two_room_plan(), tmp_path / "plan.png")
+    first = ProcessingService.start_processing(project.public_id, {"detection_mode": "contour"})
+
+    def fail(project, app_config):
+        raise RuntimeError("link failed")
+    monkeypatch.setattr(ProcessingService, "_link_openings", fail)
+    with pytest.raises(RuntimeError):
+        ProcessingService.start_processing(project.public_id, {"detection_mode": "line"})
+
+    assert project.status == "FAILED"
+    assert len(ObjectRepository.get_by_project(project.id)) == first["detected_objects"]
+    assert len(RoomRepository.get_by_project(project.id)) == first["rooms"]
@@ -0,0 +1,84 @@
+import math
+import numpy as np
+import pytest
+from backend.cv.segment_merger import merge_collinear_segments, UnionFind, _bucket_pairs, _mergeable
+
+def segment(x1, y1, x2, y2):
+    return {
+        "object_type": "WALL",
+        "x1": x1, "y1": y1, "x2": x2, "y2": y2,
+        "x": min(x1, x2), "y": min(y1, y2),
+        "width": abs(x2 - x1), "height": abs(y2 - y1),
+        "angle": math.atan2(y2 - y1, x2 - x1),
+        "length": math.hypot(x2 - x1, y2 - y1),
+        "confidence": 0.9
+    }
+
+def test_fragments_merge_into_one_wall():
+    pieces = [segment(0, 100, 120, 100), segment(110, 101, 260, 101),
+              segment(268, 100, 400, 100), segment(400, 99, 150, 99)]
+    merged, stats = merge_collinear_segments(pieces)
+    assert len(merged) == 1
+    wall = merged[0]
+    assert min(wall["x1"], wall["x2"]) == 0 and max(wall["x1"], wall["x2"]) == 400
+    assert abs(wall["y1"] - 100) <= 1 and abs(wall["y2"] - 100) <= 1
+    assert stats == {"input_segments": 4, "output_segments": 1, "merged_groups": 1}
+
+def test_parallel_offset_gapped_and_crossing_segments_stay_apart():
+    pieces = [segment(0, 0, 200, 0),
+              segment(0, 20, 200, 20),     # parallel, 20 px away
+              segment(260, 0, 400, 0),     # collinear, 60 px gap
+              segment(100, -50, 100, 50)]  # perpendicular
+    merged, stats = merge_collinear_segments(pieces)
+    assert len(merged) == 4
+    assert stats["merged_groups"] == 0
+
+def test_merges_across_angle_wraparound():
+    # One piece points slightly below horizontal, the other slightly above
+    pieces = [segment(0, 500, 300, 499), segment(600, 499, 290, 500)]
+    merged, _ = merge_collinear_segments(pieces)
+    assert len(merged) == 1
+
+def test_long_walls_and_wide_offset_tolerances_merge():
+    # Pieces of a wall on a large sheet
+    merged, stats = merge_collinear_segments([segment(0, 100, 4000, 100), segment(4010, 100, 8000, 100)])
+    assert len(merged) == 1 and stats["merged_groups"] == 1
+    merged, _ = merge_collinear_segments([segment(6000, 7000, 9000, 7105), segment(3000, 6895, 5990, 6999)])
+    assert len(merged) == 1
+    # An offset tolerance wider than the offset buckets
+    pieces = [segment(0, 100, 200, 100), segment(210, 180, 400, 180)]
+    assert len(merge_collinear_segments(pieces, offset_tolerance=100)[0]) == 1
+    assert len(merge_collinear_segments(pieces, offset_tolerance=50)[0]) == 2
+
+def test_bucketing_finds_every_mergeable_pair():
+    # Long walls in two pieces each, the second slightly turned
+    rng = np.random.default_rng(7)
+    angle = rng.choice([0.0, np.pi / 2, np.pi - 0.005, 0.3], 150) + rng.normal(0, 0.003, 150)
+    turned = angle + rng.normal(0, 0.01, 150)
+    start = rng.uniform(0, 8000, (150, 2))
+    length = rng.uniform(2000, 8000, (150, 1))
+    cut = rng.uniform(0.2, 0.8, (150, 1)) * length
+    second = start + (cut + rng.uniform(0, 10, (150, 1))) * np.stack([np.cos(angle), np.sin(angle)], axis=1)
+    segments = np.vstack([
+        np.hstack([start, start + cut * np.stack([np.cos(angle), np.sin(angle)], axis=1)]),
+        np.hstack([second, second + (length - cut) * np.stack([np.cos(turned), np.sin(turned)], axis=1)])
+    ])
+    vec = segments[:, 2:4] - segments[:, 0:2]
+    theta = np.mod(np.arctan2(vec[:, 1], vec[:, 0]), np.pi)
+    tolerances = (math.radians(2.0), 100.0, 12.0)
+
+    everything = np.triu_indices(len(segments), 1)
+    expected = set(zip(*(p.tolist() for p in _mergeable(segments, theta, *everything, *tolerances))))
+    bucketed = _bucket_pairs(segments, theta, *tolerances)
+    found = set(zip(*(p.tolist() for p in _mergeable(segments, theta, *bucketed, *tolerances))))
+    assert expected and found == expected
+
+def test_angle_tolerance_must_be_positive():
+    with pytest.raises(ValueError):
+        merge_collinear_segments([segment(0, 0, 10, 0), segment(12, 0, 20, 0)], angle_tolerance_deg=0)
+
+def test_union_find_groups():
+    uf = UnionFind(5)
+    uf.union(0, 3)
+    uf.union(4, 3)
+    assert sorted(sorted(g) for g in uf.groups()) == [[0, 3, 4], [1], [2]]
@@ -0,0 +1,53 @@
+import numpy as np
+from backend.cv.spatial_index import SegmentGrid, assign_openings, point_segment_distance, wall_orientation
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.database.repositories.object_repository import ObjectRepository
+from backend.services.processing_service import ProcessingService
+
+def random_walls(count, size, rng):
+    x, y = rng.uniform(0, size, count), rng.uniform(0, size, count)
+    length = rng.uniform(20, 600, count)
+    angle = rng.choice([0.0, np.pi / 2, np.pi / 5], count)
+    return np.stack([x, y, x + length * np.cos(angle), y + length * np.sin(angle)], axis=1)
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(7)
+    walls = random_walls(800, 3000, rng)
+    points = rng.uniform(-100, 3100, (400, 2))
+
+    indices, distances = SegmentGrid(walls, cell_size=50).nearest(points, max_distance=80)
+
+    every = point_segment_distance(np.repeat(points, len(walls), axis=0), np.tile(walls, (len(points), 1)))
+    every = every.reshape(len(points), len(walls))
+    best = every.min(axis=1)
+    expected = np.where(best <= 80, every.argmin(axis=1), -1)
+    assert np.array_equal(indices, expected)
+    assert np.allclose(distances[expected >= 0], best[expected >= 0])
+    assert np.isinf(distances[expected < 0]).all()
+
+def test_query_box_and_orientation():
+    grid = SegmentGrid([(0, 0, 1000, 0), (500, 500, 500, 900), (2000, 2000, 2100, 2100)], cell_size=64)
+    assert grid.query_box((400, 600, 600, 700)).tolist() == [1]
+    assert set(grid.query_box((-50, -50, 2200, 2200)).tolist()) == {0, 1, 2}
+    assert [wall_orientation(a) for a in (0.0, np.pi / 2, np.pi / 4, -np.pi)] == \
+        ["HORIZONTAL", "VERTICAL", "DIAGONAL", "HORIZONTAL"]
+
+    indices, orientations = assign_openings(grid.segments, [(300, 20), (480, 700), (5000, 5000)])
+    assert indices.tolist() == [0, 1, -1]
+    assert orientations == ["HORIZONTAL", "VERTICAL", None]
+
+def test_processing_links_doors_to_walls(app):
+    project = ProjectRepository.create("Openings")
+    wall = lambda x1, y1, x2, y2: {"object_type": "WALL", "x1": x1, "y1": y1, "x2": x2, "y2": y2,
+                                   "x": min(x1, x2), "y": min(y1, y2), "width": abs(x2 - x1), "height": abs(y2 - y1)}
+    door = lambda x, y: {"object_type": "DOOR", "x": x, "y": y, "width": 40, "height": 40}
+    ObjectRepository.save_detected_objects(project.id, [
+        wall(0, 0, 1000, 0), wall(0, 0, 0, 800), door(480, -10), door(-15, 400), door(500, 500)
+    ])
+
+    assert ProcessingService._link_openings(project, {}) == 2
+    walls = ObjectRepository.get_walls(project.id)
+    doors, _ = ObjectRepository.get_openings(project.id)
+    assert [d.parent_wall_id for d in doors] == [walls[0].id, walls[1].id, None]
+    assert [d.orientation for d in doors] == ["HORIZONTAL", "VERTICAL", None]
+    assert [w.orientation for w in walls] == ["HORIZONTAL", "VERTICAL"]
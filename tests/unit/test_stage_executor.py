@@ -0,0 +1,78 @@
+import threading
+import time
+import numpy as np
+import pytest
+from backend.cv.detection_pipeline import DetectionPipeline
+from backend.database.repositories.project_repository import ProjectRepository
+from backend.ocr.ocr_pipeline import OCRPipeline
+from backend.ocr.tesseract_engine import TesseractEngine
+from backend.services.processing_service import ProcessingService
+from backend.utils.stage_executor import StageExecutor
+
+def test_inline_executor_runs_on_the_caller_thread():
+    executor = StageExecutor(max_workers=0)
+    assert executor.submit(threading.get_ident).result() == threading.get_ident()
+    with pytest.raises(ZeroDivisionError):
+        executor.submit(lambda: 1 / 0).result()
+
+def test_executor_caps_concurrent_stages():
+    executor = StageExecutor(max_workers=2)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def stage():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    for future in [executor.submit(stage) for _ in range(6)]:
+        future.result()
+    executor.shutdown()
+    assert peak[0] == 2
+
+def test_ocr_overlaps_detection(app, tmp_path, upload, monkeypatch):
+    run = DetectionPipeline.run
+    ocr_threads = []
+
+    def slow_run(*args, **kwargs):
+        time.sleep(0.3)
+        return run(*args, **kwargs)
+
+    def slow_recognize(image, app_config, windows=None, regions=None, binary=None):
+        ocr_threads.append(threading.get_ident())
+        time.sleep(0.3)
+        return [{"text": "KITCHEN", "x": 10, "y": 10, "width": 80, "height": 20, "confidence": 0.9}]
+
+    monkeypatch.setattr(DetectionPipeline, "run", slow_run)
+    monkeypatch.setattr(OCRPipeline, "recognize", slow_recognize)
+
+    project = ProjectRepository.create("Concurrent")
+    image = np.full((200, 200), 255, np.uint8)
+    image[50:150, 50:58] = 0
+    upload(project, image, tmp_path / "plan.png")
+
+    began = time.perf_counter()
+    result = ProcessingService.start_processing(project.public_id, {"detection_mode": "contour", "run_ocr": True})
+    elapsed = time.perf_counter() - began
+
+    assert result["ocr_records"] == 1
+    assert ocr_threads != [threading.get_ident()]
+    assert elapsed < 0.55
+
+def test_ocr_proposals_reuse_the_detection_mask(app, tmp_path, upload, monkeypatch):
+    calls, masks = [], []
+    preprocess = DetectionPipeline.preprocess
+    monkeypatch.setattr(DetectionPipeline, "preprocess", lambda *a, **k: calls.append(1) or preprocess(*a, **k))
+    monkeypatch.setattr(TesseractEngine, "extract_regions", lambda image, binary=None, **k: masks.append(binary) or [])
+
+    project = ProjectRepository.create("Shared mask")
+    image = np.full((200, 200), 255, np.uint8)
+    image[50:150, 50:58] = 0
+    upload(project, image, tmp_path / "plan.png")
+    ProcessingService.start_processing(project.public_id, {"detection_mode": "contour", "run_ocr": True})
+
+    assert len(calls) == 1
+    assert masks[0] is not None and masks[0][100, 54] > 0
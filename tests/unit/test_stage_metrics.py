@@ -0,0 +1,48 @@
+import time
+import tracemalloc
+import numpy as np
+from backend.utils.stage_executor import StageExecutor
+from backend.utils.stage_metrics import StageMetrics, stage, timed
+
+def test_stages_record_time_memory_and_counts():
+    metrics = StageMetrics(memory="tracemalloc")
+    with metrics.activate():
+        with stage("detect") as counts:
+            buffer = np.ones(4 * 1024 * 1024, np.uint8)
+            counts["objects"] = 3
+            with stage("preprocess"):
+                time.sleep(0.01)
+        del buffer
+        assert timed("ocr", lambda: [1, 2]) == [1, 2]
+        timed("ocr", list)
+    assert not tracemalloc.is_tracing()
+
+    stages = metrics.to_dict()["stages"]
+    assert stages["detect"]["objects"] == 3 and stages["detect"]["peak_kb"] >= 4096
+    assert stages["detect"]["wall_ms"] >= stages["preprocess"]["wall_ms"] >= 10
+    assert stages["ocr"]["calls"] == 2 and stages["ocr"]["items"] == 2
+
+def test_rss_peak_covers_the_stage():
+    metrics = StageMetrics(memory="rss")
+    with metrics.activate():
+        with stage("detect"):
+            buffer = np.ones(32 * 1024 * 1024, np.uint8)
+            time.sleep(0.02)
+            del buffer
+    entry = metrics.to_dict()["stages"]["detect"]
+    if metrics._sampler is not None:
+        assert entry["rss_peak_kb"] >= 32 * 1024
+
+def test_stages_outside_a_run_are_not_recorded():
+    metrics = StageMetrics(memory="off")
+    with stage("decode") as counts:
+        counts["pixels"] = 1
+    assert metrics.to_dict()["stages"] == {}
+
+def test_stage_threads_report_to_the_submitting_run():
+    executor = StageExecutor(max_workers=1)
+    metrics = StageMetrics(memory="off")
+    with metrics.activate():
+        executor.submit(timed, "ocr", lambda: [0] * 5).result()
+    executor.shutdown()
+    assert metrics.to_dict()["stages"]["ocr"]["items"] == 5
@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+from backend.cv.preprocessing import preprocess_gray
+from backend.ocr.text_regions import PSM_SPARSE_TEXT, propose_text_regions, ocr_regions
+
+def plan_with_labels():
+    gray = np.full((600, 800), 255, np.uint8)
+    cv2.rectangle(gray, (40, 40), (760, 560), 0, 12)
+    cv2.line(gray, (400, 40), (400, 560), 0, 12)
+    cv2.putText(gray, "KITCHEN", (100, 200), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    cv2.putText(gray, "12x10", (500, 400), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 0, 1)
+    return gray
+
+def contains(region, box):
+    x0, y0, x1, y1 = region[:4]
+    return x0 <= box[0] and y0 <= box[1] and x1 >= box[2] and y1 >= box[3]
+
+def test_proposals_cover_labels_and_skip_walls():
+    _, morphed = preprocess_gray(plan_with_labels())
+    regions = propose_text_regions(morphed)
+
+    assert any(contains(r, (100, 180, 230, 200)) for r in regions)
+    assert any(contains(r, (500, 390, 555, 400)) for r in regions)
+    # No region spans a wall
+    assert all(r[2] - r[0] < 300 and r[3] - r[1] < 60 for r in regions)
+
+class RecordingPool:
+    size = 2
+
+    def __init__(self):
+        self.calls = []
+
+    def image_to_data(self, gray, psm):
+        self.calls.append((gray.shape, psm))
+        return [{"text": "KITCHEN", "x": 10, "y": 8, "width": 64, "height": 32, "confidence": 0.9}]
+
+def test_ocr_regions_rescales_crops_and_maps_boxes_back():
+    pool = RecordingPool()
+    gray = np.full((400, 400), 255, np.uint8)
+    words = ocr_regions(gray, [(100, 50, 160, 70, 16.0)], pool, target_height=32)
+
+    assert pool.calls == [((40, 120), PSM_SPARSE_TEXT)]
+    assert words == [{"text": "KITCHEN", "x": 105, "y": 54, "width": 32, "height": 16, "confidence": 0.9}]
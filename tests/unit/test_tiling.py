@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+from backend.cv.preprocessing import preprocess_gray
+from backend.cv.contour_detector import detect_contours
+from backend.cv.line_detector import detect_lines
+from backend.cv.tiling import EDGE_MARGIN, detect_tiled, min_overlap, preprocess_tiled, tile_grid
+
+def synthetic_plan(width=1600, height=1200):
+    image = np.full((height, width), 255, np.uint8)
+    cv2.rectangle(image, (40, 40), (width - 40, height - 40), 0, 8)
+    for x in range(300, width - 100, 370):
+        cv2.line(image, (x, 40), (x, height - 40), 0, 6)
+    for y in range(350, height - 100, 410):
+        cv2.line(image, (40, y), (width - 40, y), 0, 6)
+    for i in range(12):
+        cv2.rectangle(image, (100 + i * 110, 120), (140 + i * 110, 170), 0, 3)
+    return image
+
+def coverage(objects, shape):
+    mask = np.zeros(shape, np.uint8)
+    for o in objects:
+        cv2.line(mask, (o["x1"], o["y1"]), (o["x2"], o["y2"]), 255, 3)
+    return mask > 0
+
+def test_tile_grid_covers_page():
+    tiles = tile_grid(1000, 700, 256, 32)
+    covered = np.zeros((700, 1000), int)
+    for (x0, y0, x1, y1), window in tiles:
+        covered[y0:y1, x0:x1] += 1
+        assert window[0] <= x0 and window[1] <= y0 and window[2] >= x1 and window[3] >= y1
+    assert (covered == 1).all()
+
+def test_tiled_contours_match_single_pass():
+    gray = synthetic_plan()
+    _, morphed = preprocess_gray(gray)
+    key = lambda o: (o["object_type"], o["x"], o["y"], o["width"], o["height"])
+
+    single = sorted(map(key, detect_contours(morphed)))
+    tiled = sorted(map(key, detect_tiled(gray, "contour", tile_size=256, overlap=64, workers=4)))
+    assert tiled == single
+
+def test_tiled_lines_cover_single_pass():
+    gray = synthetic_plan()
+    blurred, _ = preprocess_gray(gray)
+
+    single = coverage(detect_lines(blurred), gray.shape)
+    tiled = coverage(detect_tiled(gray, "line", tile_size=512, overlap=64, workers=4), gray.shape)
+
+    # Hough may pick either edge of a thick wall, so compare within a wall width
+    kernel = np.ones((25, 25), np.uint8)
+    near_single = cv2.dilate(single.astype(np.uint8), kernel) > 0
+    near_tiled = cv2.dilate(tiled.astype(np.uint8), kernel) > 0
+    assert (single & near_tiled).sum() / single.sum() > 0.95
+    assert (tiled & near_single).sum() / tiled.sum() > 0.95
+
+def test_small_overlaps_are_raised_to_the_preprocessing_reach():
+    gray = synthetic_plan(700, 500)
+    params = {"blur_kernel": (7, 7), "block_size": 31, "kernel_size": 9}
+    assert min_overlap(**params) == 3 + 15 + 8 + EDGE_MARGIN
+
+    single = preprocess_gray(gray, **params)
+    tiled = preprocess_tiled(gray, tile_size=128, overlap=2, workers=2, **params)
+    assert all(np.array_equal(a, b) for a, b in zip(tiled, single))